@@ -11,6 +11,7 @@ import time
 
 from pkt_kg.downloads import OntData, LinkedData
 from pkt_kg.edge_list import CreatesEdgeList
+from pkt_kg.executors import initializes_ray
 from pkt_kg.knowledge_graph import FullBuild, PartialBuild, PostClosureBuild
 
 
@@ -28,6 +29,17 @@ def main():
     parser.add_argument('-s', '--owl', help='yes/no - removing OWL Semantics from knowledge graph', required=True)
     parser.add_argument('-m', '--nde', help='yes/no - adding node metadata to knowledge graph', required=True)
     parser.add_argument('-o', '--out', help='name/path to directory where to write knowledge graph', required=True)
+    parser.add_argument('-x', '--exe', help='execution backend: "ray", "pool", or "serial"', default='ray')
+    parser.add_argument('-f', '--profile', help='write a Chrome trace file with the build profile', action='store_true')
+    parser.add_argument('-u', '--update', help='update a previous full build with the changed edge types',
+                        action='store_true')
+    parser.add_argument('-y', '--max-memory', help='memory budget (e.g. "64GB"); larger intermediates spill to disk',
+                        default=None)
+    parser.add_argument('-c', '--address', help='address of a Ray cluster to run on (e.g. "auto")', default=None)
+    parser.add_argument('-z', '--format', help='outputs: "text", "binary" (.npy triples and CSR graphs), or "both"',
+                        default='text')
+    parser.add_argument('-d', '--graph-store', help='graph store: "memory" or "sqlite" (disk-backed RDFLib graphs)',
+                        default='memory')
     args = parser.parse_args()
 
     ######################
@@ -63,14 +75,18 @@ def main():
     #####################
 
     # set-up environment
-    cpus = psutil.cpu_count(logical=True) if args.cpus is None else args.cpus; ray.init(ignore_reinit_error=True)
+    if args.exe == 'ray': initializes_ray(args.address)
+    if args.cpus is not None: cpus = int(args.cpus)
+    elif args.exe == 'ray' and args.address is not None: cpus = int(ray.cluster_resources().get('CPU', 1))
+    else: cpus = psutil.cpu_count(logical=True)
 
     print('\n' + '=' * 28 + '\nPKT: CONSTRUCT EDGE LISTS\n' + '=' * 28 + '\n')
     start = time.time()
     combined_edges = dict(ent.data_files, **ont.data_files)
     # master_edges = CreatesEdgeList(data_files=combined_edges, source_file='resources/resource_info.txt')
     master_edges = CreatesEdgeList(data_files=combined_edges, source_file=args.res)
-    master_edges.runs_creates_knowledge_graph_edges(source_file=args.res, data_files=combined_edges, cpus=cpus)
+    master_edges.runs_creates_knowledge_graph_edges(source_file=args.res, data_files=combined_edges, cpus=cpus,
+                                                    executor=args.exe, profile=args.profile)
     end = time.time(); timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print('\nPKT: TOTAL SECONDS TO BUILD THE MASTER EDGE LIST: {} @ {}'.format(end - start, timestamp))
 
@@ -89,21 +105,42 @@ def main():
                           inverse_relations=args.rel,
                           decode_owl=args.owl,
                           cpus=cpus,
-                          write_location=args.out)
+                          write_location=args.out,
+                          executor=args.exe,
+                          profile=args.profile,
+                          update=args.update,
+                          max_memory=args.max_memory,
+                          address=args.address,
+                          output_format=args.format,
+                          graph_store=args.graph_store)
     elif args.kg == 'post-closure':
         kg = PostClosureBuild(construction=args.app,
                               node_data=args.nde,
                               inverse_relations=args.rel,
                               decode_owl=args.owl,
                               cpus=cpus,
-                              write_location=args.out)
+                              write_location=args.out,
+                              executor=args.exe,
+                              profile=args.profile,
+                              update=args.update,
+                              max_memory=args.max_memory,
+                              address=args.address,
+                              output_format=args.format,
+                              graph_store=args.graph_store)
     else:
         kg = FullBuild(construction=args.app,
                        node_data=args.nde,
                        inverse_relations=args.rel,
                        decode_owl=args.owl,
                        cpus=cpus,
-                       write_location=args.out)
+                       write_location=args.out,
+                       executor=args.exe,
+                       profile=args.profile,
+                       update=args.update,
+                       max_memory=args.max_memory,
+                       address=args.address,
+                       output_format=args.format,
+                       graph_store=args.graph_store)
     kg.construct_knowledge_graph()
 
     # ray.shutdown()  # uncomment if running this independently of the CI/CD builds
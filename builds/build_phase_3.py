@@ -104,7 +104,8 @@ def main(app, rel, owl):
     log_str1 = 'STEP 2: CONSTRUCT KNOWLEDGE GRAPH'; log_str2 = 'KG Build: {} + {}.txt'.format(app, rel_type.lower())
     print('\n' + log_str1); logger.info(log_str1); print(log_str2); logger.info(log_str2)
     ray.init()  # start daemon to continuously upload logs while the pkt main knowledge graph function runs
-    background_task = PKTLogUploader.remote('pheknowlator', gcs_log_location, log_dir, 90)
+    background_task = PKTLogUploader.remote('pheknowlator', gcs_log_location, log_dir, 90,
+                                            './resources/knowledge_graphs')
     # run the pkt_kg main method
     command = 'python Main.py --onts resources/ontology_source_list.txt --edg resources/edge_source_list.txt ' \
               '--res resources/resource_info.txt --out ./resources/knowledge_graphs --nde yes --kg full ' \
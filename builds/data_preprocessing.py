@@ -832,10 +832,11 @@ class DataPreprocessing(object):
 
         f_name = 'pw_with_imports.owl'
         x = downloads_data_from_gcs_bucket(self.bucket, self.original_data, self.processed_data, f_name, self.temp_dir)
-        pw_graph = Graph().parse(x); dbxref_res = gets_ontology_class_dbxrefs(pw_graph)[0]
+        pw_graph = Graph().parse(x); pw_index = AnnotationIndex(pw_graph)
+        dbxref_res = gets_ontology_class_dbxrefs(pw_graph, pw_index)[0]
         dbxref_dict = {str(k).lower().split('/')[-1]: {str(i).split('/')[-1].replace('_', ':') for i in v}
                        for k, v in dbxref_res.items() if 'PW_' in str(v)}
-        syn_res = gets_ontology_class_synonyms(pw_graph)[0]
+        syn_res = gets_ontology_class_synonyms(pw_graph, pw_index)[0]
         synonym_dict = {str(k).lower().split('/')[-1]: {str(i).split('/')[-1].replace('_', ':') for i in v}
                         for k, v in syn_res.items() if 'PW_' in str(v)}
         id_mappings = {**dbxref_dict, **synonym_dict}
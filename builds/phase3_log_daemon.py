@@ -7,6 +7,8 @@ import ray
 import threading
 import time
 
+from typing import Optional
+
 from google.cloud import storage  # type: ignore
 
 from builds.build_utilities import uploads_data_to_gcs_bucket  # type: ignore
@@ -24,13 +26,16 @@ class PKTLogUploader(object):
             gcs_bucket_location: A string specifying the location of the original_data directory for a specific build.
             log_directory: A local directory where preprocessed data is stored.
             sleep_interval: An integer specifying how often logs should be pushed to the Google Cloud Storage Bucket.
+            metrics_directory: An optional local directory (i.e. the knowledge graph write_location) where the
+                Prometheus-formatted actor metrics file (pkt_metrics.prom) is written during a build.
     """
 
-    def __init__(self, bucket_name, gcs_bucket_location, log_directory, sleep_interval):
+    def __init__(self, bucket_name, gcs_bucket_location, log_directory, sleep_interval, metrics_directory=None):
         self.bucket: str = storage.Client().get_bucket(bucket_name)
         self.gcs_bucket_location: str = gcs_bucket_location
         self.log_directory: str = log_directory
         self.sleep: int = sleep_interval
+        self.metrics_directory: Optional[str] = metrics_directory
         self.kill_time: int = 172800  # 48 hours
 
         # START BACKGROUND PROCESS
@@ -40,7 +45,8 @@ class PKTLogUploader(object):
     def _run(self):
         """Method uploads any log files found in temp_directory from a local directory to a specific directory in a
         Google Cloud Storage Bucket every "n" minutes as specified by the input interval variable. This method runs
-        the program it is called with finishes. There is also a back-up timer that will kill the program
+        the program it is called with finishes. There is also a back-up timer that will kill the program. If a
+        metrics_directory was provided, any actor metrics files (*.prom) found in it are uploaded with the logs.
 
         Args:
             bucket: A storage Bucket object specifying a Google Cloud Storage bucket.
@@ -58,6 +64,10 @@ class PKTLogUploader(object):
 
         while runtime < self.kill_time:
             uploads_data_to_gcs_bucket(self.bucket, self.gcs_bucket_location, self.log_directory, log_file)
+            if self.metrics_directory is not None:
+                for metrics_file in glob.glob(self.metrics_directory + '/*.prom'):
+                    uploads_data_to_gcs_bucket(self.bucket, self.gcs_bucket_location, self.metrics_directory,
+                                               metrics_file.split('/')[-1])
             time.sleep(self.sleep)
             runtime += self.sleep
 
@@ -8,7 +8,6 @@ import json
 import logging.config
 import os
 import pandas as pd  # type: ignore
-import ray  # type: ignore
 import re
 
 from collections import ChainMap
@@ -16,6 +15,10 @@ from difflib import SequenceMatcher
 from tqdm import tqdm  # type: ignore
 from typing import Any, Dict, IO, List, Optional, TextIO, Tuple, Union
 
+from pkt_kg.executors import gets_executor
+from pkt_kg.metrics import MetricsCollector, MetricsPublisher
+from pkt_kg.profiler import BuildProfiler
+
 # logging
 log_dir, log, log_config = 'builds/logs', 'pkt_build_log.log', glob.glob('**/logging.ini', recursive=True)
 try:
@@ -49,6 +52,8 @@ class CreatesEdgeList(object):
         self.data_files = data_files
         self.source_file = source_file
         self.source_info: Dict[str, Dict[str, Any]] = dict()
+        self.profiler: BuildProfiler = BuildProfiler()
+        self.metrics: MetricsPublisher = MetricsPublisher('/'.join(source_file.split('/')[:-1]), 'CreatesEdgeList')
 
         with open(source_file, 'r') as source_file_data:
             for row in source_file_data.read().splitlines():
@@ -71,6 +76,10 @@ class CreatesEdgeList(object):
         """Getter method to return the source_info edge dict."""
         return self.source_info
 
+    def gets_profile_records(self) -> List[Dict]:
+        """Getter method to return the profiler records for each processed edge type."""
+        return self.profiler.gets_records()
+
     @staticmethod
     def identify_header(file_path: str, delimiter: str, skip_rows: List[int]) -> Optional[int]:
         """Compares the similarity of the first line of a Pandas DataFrame to the column headers when read in with and
@@ -363,7 +372,9 @@ class CreatesEdgeList(object):
         """
 
         # STEP 1: Apply filtering/evidence criteria, reduce columns, and remove duplicates
+        self.profiler.starts_step(x, 'edge_list')
         df = self.data_reader(self.data_files[x], self.source_info[x]['delimiter']); n1, n2 = x.split('-')
+        rows = len(df)
         df = self.filter_data(df, self.source_info[x]['filter_criteria'], self.source_info[x]['evidence_criteria'])
         df = self.data_reducer(self.source_info[x]['column_idx'], df)
 
@@ -380,12 +391,14 @@ class CreatesEdgeList(object):
         edges = self.source_info[x]['edge_list']
         e = [list(y) for y in set([tuple(x) for x in edges])]; s, o = set([x[0] for x in e]), set([x[1] for x in e])
         res = 'Finished Edge: {} ({} = {}, {} = {}); {} unique edges'.format(x, n1, len(s), n2, len(o), len(e))
-        print(res); logger.info(res)
+        print(res); logger.info(res); self.profiler.stops_step(x, len(e), rows)
+        self.metrics.increments(edges_processed=len(edges), edge_types_completed=1); self.metrics.publishes()
 
         return None
 
     @staticmethod
-    def runs_creates_knowledge_graph_edges(source_file: str, data_files: Dict, cpus: int = 1) -> None:
+    def runs_creates_knowledge_graph_edges(source_file: str, data_files: Dict, cpus: int = 1,
+                                           executor: str = 'ray', profile: bool = False) -> None:
         """Method facilitates the parallel processing, using whatever cpus are available, of the master edge list
         construction.
 
@@ -393,6 +406,9 @@ class CreatesEdgeList(object):
             data_files: A list that contains the full file path and name of each downloaded data source.
             source_file: A string containing the filepath to resource information.
             cpus: An integer specifying the number of cores to use when processing the edge data (default=1).
+            executor: A string containing the execution backend to use ("ray", "pool", or "serial"; default="ray").
+            profile: A bool indicating whether or not to write a Chrome trace file with the edge type profile written
+                to Master_Edge_List_Profile.json (default=False).
 
         Returns:
              None.
@@ -400,19 +416,20 @@ class CreatesEdgeList(object):
 
         logger.info('*' * 10 + 'PKT STEP: GENERATING KNOWLEDGE GRAPH MASTER EDGE LIST' + '*' * 10)
 
-        try: ray.init()
-        except RuntimeError: pass
-        actors = [ray.remote(CreatesEdgeList).remote(data_files, source_file) for _ in range(cpus)]  # type: ignore
+        metrics = MetricsCollector('/'.join(source_file.split('/')[:-1])); metrics.starts()
         edge_types = [x for x in data_files.keys() if '-' in x]
-        for i in range(0, len(edge_types)):
-            actors[i % cpus].creates_knowledge_graph_edges.remote(edge_types[i])  # type: ignore
-
+        tasks: List = [[] for _ in range(cpus)]
+        for i in range(0, len(edge_types)): tasks[i % cpus] += [('creates_knowledge_graph_edges', (edge_types[i],))]
         # extract results, aggregate actor dictionaries into single dictionary, and write data to json file
-        _ = ray.wait([x.gets_source_info.remote() for x in actors], num_returns=len(actors))  # type: ignore
-        results = ray.get([x.gets_source_info.remote() for x in actors]); del actors  # type: ignore
+        results, records = gets_executor(executor, cpus).runs_actors(CreatesEdgeList, (data_files, source_file),
+                                                                     [() for _ in range(cpus)], tasks,
+                                                                     ['gets_source_info', 'gets_profile_records'])
         actor_result_dicts = [{k: v for k, v in x.items() if len(v['edge_list']) > 0} for x in results]
         with open('/'.join(source_file.split('/')[:-1]) + '/Master_Edge_List_Dict.json', 'w') as filepath:
             json.dump(dict(ChainMap(*actor_result_dicts)), filepath)
         filepath.close()
+        profiler = BuildProfiler(trace=profile); profiler.adds_records([x for y in records for x in y])
+        profiler.writes_profile('/'.join(source_file.split('/')[:-1]) + '/Master_Edge_List_Profile.json')
+        metrics.stops()
 
         return None
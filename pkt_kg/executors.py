@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# import needed libraries
+import concurrent.futures
+import glob
+import logging.config
+import multiprocessing
+import os
+import ray  # type: ignore
+
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+# logging
+log_dir, log, log_config = 'builds/logs', 'pkt_build_log.log', glob.glob('**/logging.ini', recursive=True)
+try:
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+except FileNotFoundError:
+    log_dir, log_config = '../builds/logs', glob.glob('../builds/logging.ini', recursive=True)
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+logger = logging.getLogger(__name__)
+logging.config.fileConfig(log_config[0], disable_existing_loggers=False, defaults={'log_file': log_dir + '/' + log})
+
+# global state inherited by forked process pool workers (set once per pool by the worker initializer)
+_pool_state: Dict = {}
+
+
+def initializes_ray(address: Optional[str] = None) -> None:
+    """Connects the driver to a Ray cluster, or starts a local Ray instance if no address is given, unless Ray has
+    already been initialized. Workers on every node are started with the directory containing pkt_kg on their
+    PYTHONPATH, so that nodes can import the actor classes from a copy of the repository on a common path (e.g. an
+    NFS mount) as well as from an installed package. When running on more than one node, the write_location of the
+    build must also be on a path that is shared by all nodes, as actors write their outputs to it directly.
+
+    Args:
+        address: An optional string containing the address of a running Ray cluster (e.g. "auto", "10.0.0.1:6379",
+            or "ray://10.0.0.1:10001").
+
+    Returns:
+        None.
+    """
+
+    if not ray.is_initialized():
+        pkg_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        paths = [pkg_dir] + [x for x in os.environ.get('PYTHONPATH', '').split(os.pathsep) if x not in ['', pkg_dir]]
+        ray.init(address=address, runtime_env={'env_vars': {'PYTHONPATH': os.pathsep.join(paths)}},
+                 ignore_reinit_error=True)
+        nodes, cpus = len([x for x in ray.nodes() if x['Alive']]), int(ray.cluster_resources().get('CPU', 0))
+        log_str = 'Connected to Ray {} with {} node(s) and {} CPUs'.format(
+            'cluster at ' + address if address else 'local instance', nodes, cpus); print(log_str); logger.info(log_str)
+
+    return None
+
+
+class Executor(object):
+    """Class provides a common interface for running a set of stateful actors in parallel. An actor is an instance
+    of a class (e.g. CreatesEdgeList, KGBuilder.EdgeConstructor, or OwlNets) that is instantiated once per worker,
+    sent a sequence of method calls, and then queried with one or more getter methods. Each backend must return
+    identical results in the same (actor) order so that callers can aggregate them without knowing which backend
+    was used.
+
+    Attributes:
+        cpus: An integer indicating the number of workers to use.
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self, cpus: int = 1) -> None:
+
+        self.cpus: int = int(cpus)
+
+    @abstractmethod
+    def gets_backend_type(self) -> str:
+        """"A string representing the type of execution backend."""
+
+        pass
+
+    @abstractmethod
+    def runs_actors(self, actor: Any, shared_args: Tuple, actor_args: List[Tuple], tasks: List[List[Tuple]],
+                    getters: List[str]) -> List[List]:
+        """Instantiates one actor per item in actor_args, calls each actor's methods, and returns the getter results.
+
+        Args:
+            actor: A class to instantiate as an actor. Each actor is created as actor(*shared_args, *actor_args[i]).
+            shared_args: A tuple of arguments that are identical for all actors (e.g. ontology classes, graphs).
+            actor_args: A list of tuples, one per actor, containing the arguments specific to each actor.
+            tasks: A list (one per actor) of lists of tuples, where each tuple contains a method name and a tuple of
+                arguments for that method (e.g. [[('creates_new_edges', ('gene-gene',))], ...]).
+            getters: A list of method names that return the actor's results (e.g. ['graph_file_getter']).
+
+        Returns:
+            A list (one per getter) of lists (one per actor) containing the getter results.
+        """
+
+        pass
+
+
+class RayExecutor(Executor):
+    """Class runs actors as Ray actors on a local Ray instance or on a multi-node Ray cluster.
+
+    Attributes:
+        cpus: An integer indicating the number of workers to use.
+        address: An optional string containing the address of a running Ray cluster (see initializes_ray).
+    """
+
+    def __init__(self, cpus: int = 1, address: Optional[str] = None) -> None:
+
+        super().__init__(cpus)
+        self.address: Optional[str] = address
+
+    def gets_backend_type(self) -> str:
+        """"A string representing the type of execution backend."""
+
+        return 'ray'
+
+    def runs_actors(self, actor: Any, shared_args: Tuple, actor_args: List[Tuple], tasks: List[List[Tuple]],
+                    getters: List[str]) -> List[List]:
+        """Runs the actors as Ray actors. The shared arguments are put into the Ray object store once and passed to
+        every actor by reference, so each node of a cluster fetches them once. Actors are spread across the nodes of
+        the cluster. The getter results of an actor are gathered as soon as it finishes, after which the actor is
+        killed so that its worker memory is released while the remaining actors run.
+
+        Args:
+            actor: A class to instantiate as an actor. Each actor is created as actor(*shared_args, *actor_args[i]).
+            shared_args: A tuple of arguments that are identical for all actors (e.g. ontology classes, graphs).
+            actor_args: A list of tuples, one per actor, containing the arguments specific to each actor.
+            tasks: A list (one per actor) of lists of tuples, each containing a method name and its arguments.
+            getters: A list of method names that return the actor's results.
+
+        Returns:
+            A list (one per getter) of lists (one per actor) containing the getter results.
+        """
+
+        initializes_ray(self.address); shared = [ray.put(x) for x in shared_args]
+        remote = ray.remote(actor).options(scheduling_strategy='SPREAD')  # type: ignore
+        actors = [remote.remote(*shared, *x) for x in actor_args]
+        for i in range(0, len(actors)): [getattr(actors[i], m).remote(*a) for m, a in tasks[i]]
+        pending = {getattr(x, getters[0]).remote(): i for i, x in enumerate(actors)}; res: Dict = {}
+        while len(pending) > 0:
+            done, _ = ray.wait(list(pending.keys()), num_returns=1); i = pending.pop(done[0])
+            res[i] = [ray.get(done[0])] + ray.get([getattr(actors[i], g).remote() for g in getters[1:]])
+            ray.kill(actors[i])
+        results = [[res[i][j] for i in range(len(actors))] for j in range(len(getters))]; del actors
+
+        return results
+
+
+def _initializes_pool_worker(actor: Any, shared_args: Tuple) -> None:
+    """Stores the actor class and shared arguments in the global state of a process pool worker."""
+
+    _pool_state['actor'] = actor; _pool_state['shared_args'] = shared_args
+
+    return None
+
+
+def _runs_pool_actor(actor_args: Tuple, tasks: List[Tuple], getters: List[str]) -> List:
+    """Instantiates a single actor inside of a process pool worker, runs its tasks, and returns its getter results."""
+
+    obj = _pool_state['actor'](*_pool_state['shared_args'], *actor_args)
+    for m, a in tasks: getattr(obj, m)(*a)
+
+    return [getattr(obj, g)() for g in getters]
+
+
+class PoolExecutor(Executor):
+
+    def gets_backend_type(self) -> str:
+        """"A string representing the type of execution backend."""
+
+        return 'pool'
+
+    def runs_actors(self, actor: Any, shared_args: Tuple, actor_args: List[Tuple], tasks: List[List[Tuple]],
+                    getters: List[str]) -> List[List]:
+        """Runs the actors in a local concurrent.futures process pool. Workers are started with the fork start method
+        and receive the actor class and shared arguments through the pool initializer, so the shared arguments are
+        never serialized and are read from the parent's memory pages (copy-on-write) by every worker. Only the
+        actor-specific arguments and the getter results are pickled. On platforms without fork the initializer
+        arguments are pickled once per worker.
+
+        Args:
+            actor: A class to instantiate as an actor. Each actor is created as actor(*shared_args, *actor_args[i]).
+            shared_args: A tuple of arguments that are identical for all actors (e.g. ontology classes, graphs).
+            actor_args: A list of tuples, one per actor, containing the arguments specific to each actor.
+            tasks: A list (one per actor) of lists of tuples, each containing a method name and its arguments.
+            getters: A list of method names that return the actor's results.
+
+        Returns:
+            A list (one per getter) of lists (one per actor) containing the getter results.
+        """
+
+        if len(actor_args) == 0: return [[] for _ in getters]
+        ctx = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        workers = max(1, min(self.cpus, len(actor_args)))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                                    initializer=_initializes_pool_worker,
+                                                    initargs=(actor, shared_args)) as pool:
+            futures = [pool.submit(_runs_pool_actor, actor_args[i], tasks[i], getters) for i in range(len(tasks))]
+            res = [x.result() for x in futures]
+
+        return [[x[i] for x in res] for i in range(len(getters))]
+
+
+class SerialExecutor(Executor):
+
+    def gets_backend_type(self) -> str:
+        """"A string representing the type of execution backend."""
+
+        return 'serial'
+
+    def runs_actors(self, actor: Any, shared_args: Tuple, actor_args: List[Tuple], tasks: List[List[Tuple]],
+                    getters: List[str]) -> List[List]:
+        """Runs the actors one after the other in the current process, which is useful for debugging and testing.
+
+        Args:
+            actor: A class to instantiate as an actor. Each actor is created as actor(*shared_args, *actor_args[i]).
+            shared_args: A tuple of arguments that are identical for all actors (e.g. ontology classes, graphs).
+            actor_args: A list of tuples, one per actor, containing the arguments specific to each actor.
+            tasks: A list (one per actor) of lists of tuples, each containing a method name and its arguments.
+            getters: A list of method names that return the actor's results.
+
+        Returns:
+            A list (one per getter) of lists (one per actor) containing the getter results.
+        """
+
+        actors = [actor(*shared_args, *x) for x in actor_args]
+        for i in range(0, len(actors)): [getattr(actors[i], m)(*a) for m, a in tasks[i]]
+
+        return [[getattr(x, g)() for x in actors] for g in getters]
+
+
+def gets_executor(backend: Optional[str] = 'ray', cpus: int = 1, address: Optional[str] = None) -> Executor:
+    """Returns an Executor instance for the requested execution backend.
+
+    Args:
+        backend: A string containing the name of the execution backend ("ray", "pool", or "serial"; default="ray").
+        cpus: An integer indicating the number of workers to use.
+        address: An optional string containing the address of a Ray cluster, which is only used by the ray backend.
+
+    Returns:
+        An Executor instance.
+
+    Raises:
+        ValueError: If backend is not "ray", "pool", or "serial".
+    """
+
+    backends = {'ray': RayExecutor, 'pool': PoolExecutor, 'serial': SerialExecutor}
+    backend = 'ray' if backend is None else str(backend).lower()
+    if backend not in backends.keys():
+        log_str = 'executor not "ray", "pool", or "serial"'; logger.error('ValueError: ' + log_str)
+        raise ValueError(log_str)
+    else: logger.info('Using {} execution backend with {} workers'.format(backend, cpus))
+
+    return RayExecutor(cpus, address) if backend == 'ray' else backends[backend](cpus)
@@ -4,6 +4,7 @@
 # import needed libraries
 import copy
 import glob
+import hashlib
 import json
 import logging.config
 import networkx  # type: ignore
@@ -12,12 +13,12 @@ import os
 import os.path
 import pandas  # type: ignore
 import pickle
-import ray  # type: ignore
 import shutil
 import subprocess
+import uuid
 
 from abc import ABCMeta, abstractmethod
-from collections import ChainMap, Counter  # type: ignore
+from collections import Counter  # type: ignore
 from rdflib import Graph, Namespace, URIRef, BNode  # type: ignore
 from rdflib.namespace import RDF, RDFS, OWL  # type: ignore
 from tqdm import tqdm  # type: ignore
@@ -25,6 +26,10 @@ from typing import Any, Callable, Dict, IO, List, Optional, Set, Tuple, Union
 
 from pkt_kg.__version__ import __version__
 from pkt_kg.construction_approaches import KGConstructionApproach
+from pkt_kg.executors import Executor, gets_executor, initializes_ray
+from pkt_kg.memory import MemoryBudget, spill_dir
+from pkt_kg.metrics import MetricsCollector, MetricsPublisher
+from pkt_kg.profiler import BuildProfiler
 from pkt_kg.metadata import Metadata
 from pkt_kg.owlnets import OwlNets
 from pkt_kg.utils import *
@@ -56,6 +61,23 @@ class KGBuilder(object):
         decode_owl: A string containing "yes" or "no" indicating whether owl semantics should be removed.
         cpus: An integer indicating the number of workers to use.
         write_location: An optional string passed to specify the primary directory to write to.
+        executor: A string containing the execution backend to use ("ray", "pool", or "serial"; default="ray").
+        profile: A bool indicating whether or not to write a Chrome trace file with the build profile (default=False).
+        update: A bool indicating whether or not a full build should update the outputs of a previous build, only
+            constructing and decoding the edge types that were added to or changed in the master edge list since that
+            build. The build state needed for later updates is written by every build with update set (default=False).
+        max_memory: An optional integer number of bytes or string containing a size (e.g. "64GB") that the build
+            should stay within. Large intermediates that would exceed it are spilled to disk (default=None).
+        address: An optional string containing the address of a Ray cluster to run the ray executor on (e.g. "auto"
+            or "ray://10.0.0.1:10001"). The write_location must be on a path shared by all nodes of the cluster.
+        output_format: A string containing the triple list outputs to write: "text" (tab-delimited integer and
+            identifier triple lists and a JSON identifier-integer map), "binary" (a numpy integer triple array and a
+            memory-mappable identifier-integer map, see pkt_kg.utils.IdentifierMap), or "both" (default="text"). The
+            binary outputs also include a memory-mappable CSR graph (see pkt_kg.utils.CSRGraph) written alongside
+            each NetworkX MultiDiGraph.
+        graph_store: A string containing the store used for the merged ontology and OWL-NETS RDFLib Graphs: "memory"
+            or "sqlite" (default="memory"). The "sqlite" store keeps the graphs in SQLite databases (see
+            pkt_kg.utils.SQLiteStore) written to the write_location, so they are not held in memory.
 
     Raises:
         ValueError: If the formatting of kg_version is incorrect (i.e. not "v.#.#.#").
@@ -66,14 +88,25 @@ class KGBuilder(object):
         TypeError: If construction, inverse_relations, node_data, and decode_owl are not strings.
         ValueError: If relations_data, node_data and decode_owl_semantics do not contain "yes" or "no".
         ValueError: If construction does not contain "instance" or "subclass".
+        ValueError: If executor does not contain "ray", "pool", or "serial".
+        ValueError: If max_memory is not a positive size.
+        ValueError: If output_format does not contain "text", "binary", or "both".
+        ValueError: If graph_store does not contain "memory" or "sqlite".
     """
 
     __metaclass__ = ABCMeta
 
     def __init__(self, construction: str, node_data: str, inverse_relations: str, decode_owl: str, cpus: int = 1,
-                 write_location: str = os.path.abspath('./resources/knowledge_graphs')) -> None:
+                 write_location: str = os.path.abspath('./resources/knowledge_graphs'), executor: str = 'ray',
+                 profile: bool = False, update: bool = False, max_memory: Optional[Union[int, str]] = None,
+                 address: Optional[str] = None, output_format: str = 'text', graph_store: str = 'memory') -> None:
 
         self.cpus: int = cpus
+        self.executor: Executor = gets_executor(executor, cpus, address)
+        if address is not None and self.executor.gets_backend_type() == 'ray': initializes_ray(address)
+        self.profiler: BuildProfiler = BuildProfiler(trace=profile)
+        self.update: bool = update
+        self.edge_records: Dict = dict()
         self.build: str = self.gets_build_type().lower().split()[0]
         self.graph: Graph = Graph()
         self.kg_version: str = 'v' + __version__
@@ -82,9 +115,21 @@ class KGBuilder(object):
         self.owl_tools: str = './pkt_kg/libs/owltools'
         self.relations_dict: Dict = dict()
         self.write_location: str = write_location
+        self.budget: MemoryBudget = MemoryBudget(write_location, max_memory)
         self.res_dir: str = os.path.abspath('/'.join(self.write_location.split('/')[:-1]))
         self.merged_ont_kg: str = self.write_location + '/PheKnowLator_MergedOntologies.owl'
 
+        # OUTPUT FORMAT
+        if output_format not in ['text', 'binary', 'both']:
+            log = 'output_format not "text", "binary", or "both"'; logger.error('ValueError: ' + log)
+            raise ValueError(log)
+        else: self.output_format: str = output_format
+
+        # GRAPH STORE
+        if graph_store not in ['memory', 'sqlite']:
+            log = 'graph_store not "memory" or "sqlite"'; logger.error('ValueError: ' + log); raise ValueError(log)
+        else: self.graph_store: str = graph_store
+
         # CONSTRUCTION APPROACH
         const = construction.lower() if isinstance(construction, str) else str(construction).lower()
         if const not in ['subclass', 'instance']:
@@ -172,6 +217,223 @@ class KGBuilder(object):
 
         pass
 
+    def runs_edge_constructors(self, args: Dict, edge_types: Optional[List] = None) -> Tuple[List, List, Dict]:
+        """Constructs the edges in the master edge list in parallel using EdgeConstructor actors run by the selected
+        execution backend. The inputs that every actor needs (i.e. ontology classes, object properties, relations,
+        and the node metadata method) are shared once (e.g. put into the Ray object store) and each actor only
+        receives the edges that creates_edge_batches assigned to it. Edge types that are larger than the average actor
+        load are split into batches that are processed by different actors; the statistics of these edge types are
+        merged from the batches once all actors have finished. Subclass construction errors are written to the
+        construction_approach directory. If args['records'] is True, the triples created for each edge type are
+        merged from the actors and stored in self.edge_records. Each actor writes its graphs to N-Triples files under
+        the write_location (see EdgeConstructor.writes_graphs), so only the paths of the files are sent back to the
+        driver; the files are removed with the spilled files of the build (see MemoryBudget.removes_spills).
+
+        Args:
+            args: A dictionary of EdgeConstructor parameters shared by all actors (see KGBuilder.EdgeConstructor).
+            edge_types: An optional list of the edge types to construct (default=all edge types in self.edge_dict).
+
+        Returns:
+            graphs: A list of tuples (one per actor) containing the path to an N-Triples file of pkt-namespaced
+                triples and the number of triples in the file.
+            clean_graphs: A list of tuples (one per actor) containing the path to an N-Triples file of triples with
+                the pkt-namespacing removed and the number of triples in the file.
+            error_dicts: A dictionary keyed by edge type of the entities that could not be mapped.
+        """
+
+        edge_types = list(self.edge_dict.keys()) if edge_types is None else edge_types; self.edge_records = dict()
+        counts = {k: len(self.edge_dict[k]['edge_list']) for k in edge_types}; rel_dict = args.get('rel_dict')
+        if len(counts) == 0: return [], [], dict()
+        batches = [x for x in creates_edge_batches(counts, self.cpus) if len(x) > 0]; actor_args: List = []
+        split = set(k for k, v in Counter(x[0] for y in batches for x in y).items() if v > 1); symmetric = dict()
+        for k in split:  # interaction edge types need the full edge list to determine if they are symmetric
+            if rel_dict is not None and 'interact' in rel_dict.get(self.edge_dict[k]['edge_relation'], ''):
+                edges = set(tuple(x) for x in self.edge_dict[k]['edge_list'])
+                symmetric[k] = len([x for x in edges if x[-1::-1] not in edges]) == 0; del edges
+        for batch in batches:
+            edge_dict = dict()
+            for k, start, stop in batch:
+                edge_dict[k] = {key: val for key, val in self.edge_dict[k].items() if key != 'edge_list'}
+                edge_dict[k]['edge_list'] = self.edge_dict[k]['edge_list'][start:stop]
+                if k in split: edge_dict[k]['batch'] = {'start': start, 'stop': stop, 'symmetric': symmetric.get(k)}
+            actor_args += [(edge_dict,)]
+        tasks = [[('creates_new_edges', (x[0],)) for x in y] + [('writes_graphs', ())] for y in batches]
+        res, errors, stats, records = self.executor.runs_actors(
+            self.EdgeConstructor, (args,), actor_args, tasks,
+            ['graph_file_getter', 'error_dict_getter', 'edge_stats_getter', 'edge_records_getter'])
+        for d in [x for x in records if x is not None]:  # merge the records of batched edge types
+            for k, v in d.items():
+                if k not in self.edge_records.keys(): self.edge_records[k] = v
+                else: self.edge_records[k] = {i: self.edge_records[k][i] | v[i] for i in v.keys()}
+        # merge the statistics of batched edge types and aggregate actor error dictionaries into a single dictionary
+        for k in sorted(split):
+            parts = [x[k] for x in stats if k in x.keys()]; s, o = self.edge_dict[k]['data_type'].split('-')
+            counts_ = [len(np.unique(np.concatenate([x['owl_edges'] for x in parts]))), sum(x['rels'] for x in parts),
+                       len(np.unique(np.concatenate([x['owl_nodes'] for x in parts]))),
+                       len(set(i for x in parts for i in x['n1'])), len(set(i for x in parts for i in x['n2']))]
+            stat = self.EdgeConstructor.formats_edge_statistics(k, counts_)
+            p = 'Created {} ({}-{}) Edges: {}'.format(k.upper(), s, o, stat); print('\n' + p); logger.info(p)
+        g1 = [x[0] for x in res]; g2 = [x[1] for x in res]; error_dicts: Dict = dict()
+        for d in errors:
+            for k, v in d.items(): error_dicts[k] = list(dict.fromkeys(error_dicts.get(k, []) + v))
+        if len(error_dicts.keys()) > 0:  # output error logs
+            log_file = glob.glob(self.res_dir + '/construction*')[0] + '/subclass_map_log.json'
+            logger.info('See log: {}'.format(log_file)); outputs_dictionary_data(error_dicts, log_file)
+
+        return g1, g2, error_dicts
+
+    def merges_edge_graphs(self, step: str, files: List[Tuple[str, int]],
+                           graphs: List) -> Union[IntegerTripleStore, str]:
+        """Merges the graphs that the EdgeConstructor actors wrote to disk (see runs_edge_constructors) with the
+        graphs that are already held in memory (e.g. the logic subset of the merged ontologies), so the results of the
+        actors are never held in memory as RDFLib Graphs. If the union of the graphs fits within the memory budget, it
+        is loaded into a single IntegerTripleStore. Otherwise, the graphs are spilled to one sorted and deduplicated
+        N-Triples file that is returned without being loaded, so the consumers of the merged graph (e.g.
+        convert_to_networkx and writes_csr_graph) stream its triples from disk and the merged graph is only loaded
+        into an IntegerTripleStore once it is needed to write the outputs of the build.
+
+        Args:
+            step: A string containing the name of the build step (e.g. "STEP 6: DECODE OWL SEMANTICS").
+            files: A list of tuples containing the path to an N-Triples file and the number of triples in the file.
+            graphs: A list of RDFLib Graphs or sets of triples.
+
+        Returns:
+            An IntegerTripleStore containing the union of the triples of the files and graphs or, if the memory budget
+            is exceeded, a string containing the path to an N-Triples file of the union of the triples.
+        """
+
+        paths = [x[0] for x in files if x[1] > 0]
+        if self.budget.exceeds_budget(sum(len(x) for x in graphs) + sum(x[1] for x in files)):
+            return self.budget.spills_triples(step, 'Full Logic', graphs + paths)
+        store = IntegerTripleStore()
+        for graph in graphs: store.adds_triples(graph)
+        for x in paths: store.loads_ntriples(x, bnode_labels=True)
+
+        return store
+
+    @staticmethod
+    def counts_triples(graph: Union[IntegerTripleStore, str]) -> int:
+        """Returns the number of triples in an IntegerTripleStore or in a deduplicated N-Triples file (e.g. a graph
+        returned by merges_edge_graphs)."""
+
+        if not isinstance(graph, str): return len(graph)
+        with open(graph, 'rb') as f: return sum(1 for line in f if line.strip())
+
+    def writes_graph_outputs(self, graphs: List, meta: Metadata, kg_owl: str,
+                             store: Optional[IntegerTripleStore] = None) -> List[str]:
+        """Writes the integer triple list, identifier triple list, identifier-integer map (as text and/or binary files,
+        see output_format), and node label files of the OWL, OWL-NETS, and purified OWL-NETS knowledge graphs in
+        parallel using GraphOutputWriter actors run by the selected execution backend. The graphs are encoded into a
+        single IntegerTripleStore and one identifier-integer map is built for all of them, both are shared once by all
+        actors, and each actor only receives the rows of its own graph. As a result, a node or relation has the same
+        integer in the output of every graph.
+
+        Args:
+            graphs: A list of the OWL, OWL-NETS, and purified OWL-NETS graphs, where each graph is an RDFLib Graph, a
+                set of triples, a numpy array of rows of store, or None if the graph was not built.
+            meta: An instance of the Metadata class.
+            kg_owl: A string containing the filename of the OWL knowledge graph (e.g. '/PheKnowLator_v3_OWL.owl').
+            store: An optional IntegerTripleStore, which is required when any graph is a numpy array of rows.
+
+        Returns:
+            A list of the integer triple list filenames that were written.
+        """
+
+        store = IntegerTripleStore() if store is None else store; actor_args: List = []
+        f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.construct_approach.upper() + '_purified']
+        for x in [i for i in range(0, len(graphs)) if graphs[i] is not None]:
+            rows = graphs[x] if isinstance(graphs[x], np.ndarray) else store.encodes_triples(graphs[x])
+            triple_list_file = kg_owl[:-8] + f_prefix[x] + '_Triples_Integers.txt'
+            actor_args += [(rows, triple_list_file, triple_list_file[:-5] + '_Identifier_Map.json',
+                            kg_owl[:-8] + f_prefix[x] + '.owl')]
+        if self.node_data: meta.saves_node_metadata()  # written once, before the actors write their node labels
+        rows = [x[0] for x in actor_args]; entity_map = store.gets_entity_map(np.concatenate(rows)) if rows else {}
+        params = {'store': store, 'entity_map': entity_map, 'meta': meta, 'write_loc': self.write_location,
+                  'node_data': self.node_data, 'output_format': self.output_format}
+        tasks = [[('writes_outputs', ())] for _ in actor_args]
+        files = self.executor.runs_actors(self.GraphOutputWriter, (params,), actor_args, tasks, ['file_getter'])[0]
+
+        return files
+
+    def gets_build_signature(self) -> str:
+        """Returns a hash of the build settings and of the inputs that every edge type depends on (i.e. the merged
+        ontologies, relations data, node metadata, and subclass construction maps). A previous build can only be
+        updated if it has the same signature. The signature of a build is computed once the build has finished, after
+        the node metadata file has been rewritten (see Metadata.saves_node_metadata). As the node_data files are
+        hashed as a whole, any change to the node metadata (e.g. a new label or synonym for a single node) changes the
+        signature, so an update run after it falls back to a full rebuild of every edge type.
+
+        Returns:
+            A string containing an md5 hash.
+        """
+
+        files = [self.merged_ont_kg] + sorted(glob.glob(self.res_dir + '/relations_data/*.txt'))
+        files += sorted(self.node_data) if self.node_data else []
+        files += sorted(glob.glob(self.res_dir + '/construction_approach/*.pkl'))
+        settings = [self.full_kg, self.construct_approach, str(self.decode_owl), str(self.node_data is not None)]
+
+        return hashlib.md5(' '.join(settings + [gets_file_hash(x) for x in files]).encode('utf-8')).hexdigest()
+
+    def gets_edge_type_hashes(self) -> Dict:
+        """Returns a dictionary keyed by edge type with a hash of the edge type's master edge list entry (i.e. its
+        edges, relation, data types, and uris) stored as the value."""
+
+        return {k: hashlib.md5(json.dumps(v, sort_keys=True).encode('utf-8')).hexdigest()
+                for k, v in self.edge_dict.items()}
+
+    def loads_build_state(self, signature: str) -> Optional[Dict]:
+        """Loads the build state written by a previous build (see writes_build_state) if it exists and the previous
+        build has the same signature (see gets_build_signature).
+
+        Args:
+            signature: A string containing the signature of the current build.
+
+        Returns:
+            state: A dictionary containing the build state or None if there is no previous build that can be updated.
+        """
+
+        filepath = self.write_location + self.full_kg[:-4] + '_BuildState.pkl'; state = None
+        if not os.path.exists(filepath): log_str = 'No Previous Build State Found: Running Full Build'
+        else:
+            with open(filepath, 'rb') as f: state = pickle.load(f)
+            if state['signature'] == signature: log_str = 'Loaded Previous Build State: {}'.format(filepath)
+            else: state = None; log_str = 'Build Inputs or Settings Changed Since Previous Build: Running Full Build'
+        print(log_str); logger.info(log_str)
+
+        return state
+
+    def writes_build_state(self, previous: Dict, error_dicts: Dict, decoded: Optional[List[Dict]] = None) -> None:
+        """Writes the state needed to update the build to a pickle file ending in "_BuildState.pkl". The state is a
+        dictionary containing the build signature, the OWL-NETS decoding results of the merged ontologies, and the
+        following record for each edge type in self.edge_dict:
+            {'hash': an md5 hash of the master edge list entry, 'logic': edge triples, 'properties': object property
+             triples, 'annotations': node metadata triples, 'errors': a list of the edges that could not be mapped,
+             'decoded': OWL-NETS decoding results (see OwlNets.runs_owlnets)}
+
+        Args:
+            previous: A dictionary of the records of the edge types that were reused from a previous build.
+            error_dicts: A dictionary keyed by edge type of the entities that could not be mapped.
+            decoded: An optional list of OWL-NETS decoding results for the merged ontologies, followed by one for
+                each edge type in self.edge_dict.
+
+        Returns:
+            None.
+        """
+
+        filepath = self.write_location + self.full_kg[:-4] + '_BuildState.pkl'; hashes = self.gets_edge_type_hashes()
+        state: Dict = {'signature': self.gets_build_signature(), 'edge_types': {},
+                       'ontology': None if decoded is None else decoded[0]}
+        for i, k in enumerate(hashes.keys()):
+            rec = previous[k] if k not in self.edge_records.keys() else self.edge_records[k]
+            state['edge_types'][k] = {'hash': hashes[k], 'logic': rec['logic'], 'properties': rec['properties'],
+                                      'annotations': rec['annotations'], 'errors': error_dicts.get(k, []),
+                                      'decoded': None if decoded is None else decoded[i + 1]}
+        with open(filepath + '.' + str(os.getpid()) + '.tmp', 'wb') as f: pickle.dump(state, f, protocol=4)
+        os.replace(filepath + '.' + str(os.getpid()) + '.tmp', filepath)
+        log_str = 'Wrote Build State: {}'.format(filepath); print(log_str); logger.info(log_str)
+
+        return None
+
     @abstractmethod
     def gets_build_type(self) -> str:
         """"A string representing the type of knowledge graph build."""
@@ -179,11 +441,13 @@ class KGBuilder(object):
         pass
 
     class EdgeConstructor(object):
-        """Inner class object used to facilitate ray parallelization.
+        """Inner class object used to facilitate parallelization (see pkt_kg.executors).
 
         Attributes:
             construction: A string indicating the construction approach (i.e. instance or subclass).
             edge_data: A nested dictionary keyed by edge type that contains all information needed to construct an edge.
+                It is read from params['edge_dict'] unless the edge_dict argument is passed, which allows the shared
+                params to be put into the Ray object store once while each actor receives only its own edge types.
             kg_owl: A string containing a filename.
             rel_dict: A dictionary keyed by URI containing all relations for constructing an edge set.
             inverse_dict: A dictionary keyed by URI containing all relations and their inverse relation.
@@ -192,15 +456,23 @@ class KGBuilder(object):
             ont_cls: A set of RDFLib URIRef terms representing all classes in the core merged ontologies.
             obj_props: A set of RDFLib URIRef terms representing all object properties in the core merged ontologies.
             write_loc: A string passed specifying the primary directory to write to.
+            metrics: A MetricsPublisher used to publish edges processed and triples emitted to a MetricsCollector.
+            edge_records: A dictionary keyed by edge type of the triples created for each edge type, which is only
+                kept if params['records'] is True (i.e. for KGBuilder updates, see KGBuilder.writes_build_state).
+            graph_files: A list of tuples, one for graph and one for clean_graph, containing the N-Triples file that
+                the graph was written to by writes_graphs and the number of triples written to it.
         """
 
-        def __init__(self, params) -> None:
+        def __init__(self, params: Dict, edge_dict: Optional[Dict] = None) -> None:
 
             self.clean_graph: Graph = Graph()
             self.construction: str = params.get('construction')
-            self.edge_dict: dict = params.get('edge_dict')
+            self.edge_dict: dict = params.get('edge_dict') if edge_dict is None else edge_dict
+            self.edge_records: Optional[Dict] = dict() if params.get('records') else None
+            self.edge_stats: Dict = dict()
             self.error_dict: Dict = dict()
             self.graph: Graph = Graph()
+            self.graph_files: List[Tuple[str, int]] = []
             self.kg_owl = params.get('kg_owl')
             self.inverse_relations_dict: Optional[Dict] = params.get('inverse_dict')
             self.node_data: Optional[str] = 'yes' if params.get('node_data') is not None else None
@@ -210,6 +482,7 @@ class KGBuilder(object):
             self.relations_dict: Optional[Dict] = params.get('rel_dict')
             self.res_dir: str = os.path.abspath('/'.join(params.get('write_loc').split('/')[:-1]))
             self.write_location: str = params.get('write_loc')
+            self.metrics: MetricsPublisher = MetricsPublisher(self.write_location, 'EdgeConstructor')
 
         def graph_getter(self) -> Tuple[Graph, Graph]:
             """Methods returns two inner class RDFLib Graph objects the first contains pkt-namespaces and the second
@@ -217,11 +490,45 @@ class KGBuilder(object):
 
             return self.graph, self.clean_graph
 
+        def graph_file_getter(self) -> List[Tuple[str, int]]:
+            """Methods returns the inner class list of N-Triples files (and their triple counts) that graph and
+            clean_graph were written to by writes_graphs."""
+
+            return self.graph_files
+
+        def writes_graphs(self) -> None:
+            """Writes graph and clean_graph to N-Triples files in the spill directory of the write_location (see
+            pkt_kg.memory.MemoryBudget) and releases them, so that only the paths and triple counts of the files are
+            returned to the driver. The BNode labels of the graphs are kept in the files.
+
+            Returns:
+                None.
+            """
+
+            loc = self.write_location + spill_dir; os.makedirs(loc, exist_ok=True); name = uuid.uuid4().hex
+            for graph, subset in [(self.graph, 'Logic'), (self.clean_graph, 'Clean')]:
+                filepath = loc + '/EdgeConstructor_{}_{}.nt'.format(name, subset)
+                with NTriplesWriter(filepath) as writer: writer.writes_triples(graph)
+                self.graph_files += [(filepath, len(graph))]
+            self.graph, self.clean_graph = Graph(), Graph()
+
+            return None
+
         def error_dict_getter(self) -> Dict:
             """Methods returns inner class subclass error dict object."""
 
             return self.error_dict
 
+        def edge_stats_getter(self) -> Dict:
+            """Methods returns inner class dictionary of partial statistics for batches of split edge types."""
+
+            return self.edge_stats
+
+        def edge_records_getter(self) -> Optional[Dict]:
+            """Methods returns inner class dictionary of the triples created for each edge type."""
+
+            return self.edge_records
+
         def verifies_object_property(self, object_property: URIRef) -> None:
             """Adds an object property to a knowledge graph.
 
@@ -265,7 +572,8 @@ class KGBuilder(object):
                 return n1 in self.ont_classes and n2 in self.ont_classes
             else: return URIRef(finds_node_type(edge_info)['cls1']) in self.ont_classes
 
-        def checks_relations(self, relation: str, edge_list: Union[List, Set]) -> Optional[str]:
+        def checks_relations(self, relation: str, edge_list: Union[List, Set],
+                             symmetric: Optional[bool] = None) -> Optional[str]:
             """Determines whether or not an inverse relation should be created and added to the graph and verifies
             that a
             relation and its inverse (if it exists) are both an existing owl:ObjectProperty in the graph.
@@ -273,6 +581,8 @@ class KGBuilder(object):
             Args:
                 relation: A string that contains the relation assigned to edge in resource_info.txt (e.g. 'RO_0000056').
                 edge_list: A list or set of knowledge graph edges. For example: {["8837", "4283"], ["8837", "839"]}
+                symmetric: An optional bool indicating whether or not the complete edge list is symmetric, which is
+                    used instead of edge_list when edge_list is only a batch of an edge type's edges.
 
             Returns:
                 A string containing an ontology identifier (e.g. "RO_0000056) or None. Value depends on:
@@ -281,13 +591,15 @@ class KGBuilder(object):
                     - None, assuming the prior listed conditions are not met
             """
 
-            edge_list = set(tuple(x) for x in edge_list) if isinstance(edge_list, List) else edge_list
+            if symmetric is None:
+                edge_list = set(tuple(x) for x in edge_list) if isinstance(edge_list, List) else edge_list
+                symmetric = len([x for x in edge_list if x[-1::-1] not in edge_list]) == 0
             if self.inverse_relations_dict is not None and relation in self.inverse_relations_dict.keys():
                 self.verifies_object_property(URIRef(obo + self.inverse_relations_dict[relation]))
                 return self.inverse_relations_dict[relation]
             elif self.relations_dict is not None:
                 if relation in self.relations_dict.keys() and 'interact' in self.relations_dict[relation]:
-                    return None if len([x for x in edge_list if x[-1::-1] not in edge_list]) == 0 else relation
+                    return None if symmetric else relation
                 else: return None
             else: return None
 
@@ -304,14 +616,46 @@ class KGBuilder(object):
                 formatted_str: A string containing edge statistics.
             """
 
-            n1, n2 = edge_type.split('-')[0], edge_type.split('-')[1]
             owl_nodes = set(i for j in [x[0::2] for x in results] for i in j)
-            stats = [len(results), entity_info[2], len(owl_nodes), len(entity_info[0]), n1, len(entity_info[1]), n2]
+            counts = [len(results), entity_info[2], len(owl_nodes), len(entity_info[0]), len(entity_info[1])]
+
+            return KGBuilder.EdgeConstructor.formats_edge_statistics(edge_type, counts)
+
+        @staticmethod
+        def formats_edge_statistics(edge_type: str, counts: List[int]) -> str:
+            """Formats the node and edge counts of an edge type.
+
+            Args:
+                edge_type: A string point to a specific edge type (e.g. 'chemical-disease).
+                counts: A list of 5 integers: OWL edges, original edges, OWL nodes, and the original nodes of each type.
+
+            Returns:
+                formatted_str: A string containing edge statistics.
+            """
+
+            n1, n2 = edge_type.split('-')[0], edge_type.split('-')[1]
             stats_str = '{} OWL Edges, {} Original Edges; {} OWL Nodes, Original Nodes: {} {}(s), {} {}(s)'
-            formatted_str = stats_str.format(stats[0], stats[1], stats[2], stats[3], stats[4], stats[5], stats[6])
+            formatted_str = stats_str.format(counts[0], counts[1], counts[2], counts[3], n1, counts[4], n2)
 
             return formatted_str
 
+        @staticmethod
+        def hashes_terms(terms: Any) -> np.ndarray:
+            """Converts an iterable of strings into a sorted array of unique 64-bit hashes, which allows the OWL edges
+            and nodes of the batches of a split edge type to be counted without sending the triples between actors.
+
+            Args:
+                terms: An iterable of strings (e.g. the n3 representation of triples).
+
+            Returns:
+                A sorted numpy array of unique int64 hashes.
+            """
+
+            hashes = (int.from_bytes(hashlib.blake2b(x.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+                      for x in terms)
+
+            return np.unique(np.fromiter(hashes, dtype=np.int64))
+
         def creates_new_edges(self, edge_type: str) -> Graph:
             """Takes a dictionary of information needed to construct and edge creates the associated triples.
 
@@ -327,10 +671,15 @@ class KGBuilder(object):
             anot = f_name + '_AnnotationsOnly.nt'; logic = f_name + '_LogicOnly.nt'
             edge_list = self.edge_dict[edge_type]['edge_list']; s, o = self.edge_dict[edge_type]['data_type'].split('-')
             rel, uri = self.edge_dict[edge_type]['edge_relation'], self.edge_dict[edge_type]['uri']
-            invrel = self.checks_relations(rel, edge_list) if self.inverse_relations_dict is not None else None
+            batch = self.edge_dict[edge_type].get('batch'); sym = None if batch is None else batch['symmetric']
+            invrel = self.checks_relations(rel, edge_list, sym) if self.inverse_relations_dict is not None else None
             n1, n2, rels = set(), set(), 0; res: Set = set()  # ; pbar = tqdm(total=len(edge_list))
-            while len(edge_list) > 0:
-                edge = edge_list.pop(0)  # ; pbar.update(1)
+            rec = None if self.edge_records is None else self.edge_records.setdefault(
+                edge_type, {'logic': set(), 'properties': set(), 'annotations': set(), 'clean': set()})
+            if rec is not None and self.inverse_relations_dict is not None and rel in self.inverse_relations_dict:
+                rec['properties'] |= {(URIRef(obo + self.inverse_relations_dict[rel]), RDF.type, OWL.ObjectProperty)}
+            for edge in edge_list:
+                self.metrics.increments(edges_processed=1)  # ; pbar.update(1)
                 edge_info = {'n1': s, 'n2': o, 'rel': rel, 'inv_rel': invrel, 'uri': uri, 'edges': edge}
                 meta = self.node_metadata_func(ent=[''.join(x) for x in list(zip(uri, edge))], e_type=[s, o])
                 meta_logic = [True if (self.node_data is None and meta is None) or [s, o] == ['class', 'class']
@@ -339,13 +688,79 @@ class KGBuilder(object):
                     if self.construction == 'subclass': edges = set(kg_bld.subclass_constructor(edge_info, edge_type))
                     else: edges = set(kg_bld.instance_constructor(edge_info, edge_type))
                     res |= edges; n1 |= {edge[0]}; n2 |= {edge[1]}; rels = rels + 1 if invrel is None else rels + 2
+                    self.metrics.increments(triples_emitted=len(edges))
                     self.graph = adds_edges_to_graph(self.graph, edges, False); appends_to_existing_file(edges, logic)
                     if meta is not None: appends_to_existing_file(meta, anot)
                     cleaned_graph = updates_pkt_namespace_identifiers(edges, self.construction, False)
                     self.clean_graph = adds_edges_to_graph(self.clean_graph, cleaned_graph, False)
-            stat = self.gets_edge_statistics(edge_type, res, [n1, n2, rels]); del [n1, n2, rels], res  # ; pbar.close()
-            p = 'Created {} ({}-{}) Edges: {}'.format(edge_type.upper(), s, o, stat); print('\n' + p); logger.info(p)
-            if len(kg_bld.subclass_error.keys()) > 0: self.error_dict = kg_bld.subclass_error
+                    if rec is not None:
+                        rec['logic'] |= edges; rec['clean'] |= set(cleaned_graph)
+                        if meta is not None: rec['annotations'] |= set(meta)
+            if batch is None:
+                stat = self.gets_edge_statistics(edge_type, res, [n1, n2, rels])  # ; pbar.close()
+                p = 'Created {} ({}-{}) Edges: {}'.format(edge_type.upper(), s, o, stat)
+                print('\n' + p); logger.info(p)
+            else:  # partial statistics are merged by KGBuilder.runs_edge_constructors
+                self.edge_stats[edge_type] = {'owl_edges': self.hashes_terms(' '.join(i.n3() for i in x) for x in res),
+                                              'owl_nodes': self.hashes_terms(i.n3() for x in res for i in x[0::2]),
+                                              'n1': n1, 'n2': n2, 'rels': rels}
+                p = 'Created {} ({}-{}) Edges Batch: {}-{}'.format(edge_type.upper(), s, o, batch['start'],
+                                                                     batch['stop']); logger.info(p)
+            for k, v in kg_bld.subclass_error.items():
+                self.error_dict[k] = list(dict.fromkeys(self.error_dict.get(k, []) + v))
+            del n1, n2, rels, res
+            self.metrics.increments(edge_types_completed=1); self.metrics.publishes()
+
+            return None
+
+    class GraphOutputWriter(object):
+        """Inner class object used to write the outputs of a knowledge graph in parallel (see pkt_kg.executors).
+
+        Attributes:
+            store: An IntegerTripleStore containing the term table of the graphs.
+            entity_map: A dictionary where keys are the identifiers of all graphs and values are integers.
+            meta: An instance of the Metadata class used to write node labels.
+            write_loc: A string passed specifying the primary directory to write to.
+            node_data: A string ("yes" or "no") indicating whether or not to write the node labels.
+            output_format: A string containing the triple list outputs to write ("text", "binary", or "both").
+            triples: A numpy array of the rows of store that make up the graph.
+            triple_list_file: A string containing the filename of the integer triple list.
+            triple_map: A string containing the filename of the identifier-integer map.
+            full_kg: A string containing the filename of the knowledge graph.
+        """
+
+        def __init__(self, params: Dict, triples: np.ndarray, triple_list_file: str, triple_map: str,
+                     full_kg: str) -> None:
+
+            self.store: IntegerTripleStore = params.get('store')
+            self.entity_map: Dict = params.get('entity_map')
+            self.meta: Metadata = params.get('meta')
+            self.write_location: str = params.get('write_loc')
+            self.node_data: Optional[str] = params.get('node_data')
+            self.output_format: str = params.get('output_format', 'text')
+            self.triples: np.ndarray = triples
+            self.triple_list_file: str = triple_list_file
+            self.triple_map: str = triple_map
+            self.full_kg: str = full_kg
+
+        def file_getter(self) -> str:
+            """Methods returns the filename of the inner class integer triple list."""
+
+            return self.triple_list_file
+
+        def writes_outputs(self) -> None:
+            """Writes the integer triple list, identifier triple list, identifier-integer map, and node label files.
+
+            Returns:
+                None.
+            """
+
+            log_str = '*** Processing {} Graph ***'.format(self.full_kg); print(log_str); logger.info(log_str)
+            self.store.maps_ids_to_integers(self.write_location, self.triple_list_file, self.triple_map,
+                                            self.triples, self.entity_map, self.output_format)
+            if self.node_data:  # STEP 8: EXTRACT AND WRITE NODE METADATA
+                self.meta.full_kg = self.full_kg
+                self.meta.writes_node_labels(self.entity_map, self.store.iterates_triples(self.triples))
 
             return None
 
@@ -374,61 +789,61 @@ class PartialBuild(KGBuilder):
         logger.info('*' * 10 + 'PKT STEP: CONSTRUCTING KNOWLEDGE GRAPH' + '*' * 10 + '\n' + log_str)
 
         # STEP 1: PROCESS RELATION AND INVERSE RELATION DATA
+        prof = self.profiler; prof.starts_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
+        metrics = MetricsCollector(self.write_location); metrics.starts()
         log_str = '*** Loading Relations Data ***'; print(log_str); logger.info(log_str)
-        self.reverse_relation_processor()
+        self.reverse_relation_processor(); prof.stops_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
 
         # STEP 2: MERGE ONTOLOGIES
+        prof.starts_step('STEP 2: MERGE ONTOLOGIES')
         if self.merged_ont_kg in glob.glob(self.write_location + '/*.owl'):
             log_str = '*** Loading Merged Ontologies ***'; print(log_str); logger.info(log_str)
-            self.graph = Graph().parse(self.merged_ont_kg, format='xml')
+            self.graph = loads_graph_snapshot(self.merged_ont_kg, graph_store=self.graph_store)
         else:
             log_str = '*** Merging Ontology Data ***'; print(log_str); logger.info(log_str)
-            merges_ontologies(self.ontologies, self.merged_ont_kg.split('/')[-1], self.owl_tools)
-            self.graph.parse(self.merged_ont_kg, format='xml')
+            merged_ont = '/' + self.merged_ont_kg.split('/')[-1]
+            merges_ontologies(self.ontologies, self.write_location, merged_ont, self.owl_tools, self.cpus)
+            self.graph = loads_graph_snapshot(self.merged_ont_kg, graph_store=self.graph_store)
         stats = 'Merged Ontologies {}'.format(derives_graph_statistics(self.graph)); print(stats); logger.info(stats)
+        prof.stops_step('STEP 2: MERGE ONTOLOGIES', len(self.graph))
 
         # STEP 3: PROCESS NODE METADATA
+        prof.starts_step('STEP 3: PROCESS NODE METADATA', triples_in=len(self.graph))
         log_str = '*** Loading Node Metadata Data ***'; print(log_str); logger.info(log_str)
         meta = Metadata(self.kg_version, self.write_location, self.full_kg, self.node_data, self.node_dict)
         if self.node_data: meta.metadata_processor(); meta.extract_metadata(self.graph)
+        prof.stops_step('STEP 3: PROCESS NODE METADATA')
 
         # STEP 4: CREATE GRAPH SUBSETS
+        prof.starts_step('STEP 4: CREATE GRAPH SUBSETS', triples_in=len(self.graph))
         log_str = '*** Splitting Graph ***'; print(log_str); logger.info(log_str)
-        f = self.write_location; self.graph, annotation_triples = splits_knowledge_graph(self.graph)
-        s = 'Merged Ontologies - Logic Subset {}'.format(derives_graph_statistics(self.graph)); print(s); logger.info(s)
-        kg_owl = '_'.join(self.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        f, kg_owl = self.write_location, '_'.join(self.full_kg.split('_')[0:-1]) + '_OWL.owl'
         annot, logic, full = kg_owl[:-4] + '_AnnotationsOnly.nt', kg_owl[:-4] + '_LogicOnly.nt', kg_owl[:-4] + '.nt'
-        appends_to_existing_file(annotation_triples, f + annot); appends_to_existing_file(self.graph, f + logic)
-        del annotation_triples
+        self.graph, n = loads_split_snapshot(self.merged_ont_kg, self.graph, self.graph_store, f + annot)
+        s = 'Merged Ontologies - Logic Subset {}'.format(derives_graph_statistics(self.graph)); print(s); logger.info(s)
+        appends_to_existing_file(self.graph, f + logic)
+        prof.stops_step('STEP 4: CREATE GRAPH SUBSETS', len(self.graph) + n)
 
         # STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA
+        prof.starts_step('STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA', triples_in=len(self.graph))
         log_str = '*** Building Knowledge Graph Edges ***'; print(log_str); logger.info(log_str)
         self.ont_classes = gets_ontology_classes(self.graph); self.obj_properties = gets_object_properties(self.graph)
-        # instantiate inner class to construct edge sets
-        try: ray.init()
-        except RuntimeError: pass
-        args = {'construction': self.construct_approach, 'edge_dict': self.edge_dict, 'write_loc': self.write_location,
-                'rel_dict': self.relations_dict, 'inverse_dict': self.inverse_relations_dict, 'kg_owl': kg_owl,
-                'node_data': self.node_data, 'ont_cls': self.ont_classes, 'metadata': meta.creates_node_metadata,
-                'obj_props': self.obj_properties}
-        edges = sublist_creator({k: len(v['edge_list']) for k, v in self.edge_dict.items()}, self.cpus)
-        actors = [ray.remote(self.EdgeConstructor).remote(args) for _ in range(self.cpus)]  # type: ignore
-        for i in range(0, len(edges)): [actors[i].creates_new_edges.remote(j) for j in edges[i]]  # type: ignore
-        # extract results, aggregate actor dictionaries into single dictionary, and write data to json file
-        _ = ray.wait([x.graph_getter.remote() for x in actors], num_returns=len(actors))
-        graph_res = ray.get([x.graph_getter.remote() for x in actors])
-        graphs = [self.graph] + [x[0] for x in graph_res]  # ; clean_graphs = [x[1] for x in graph_res]
-        error_dicts = dict(ChainMap(*ray.get([x.error_dict_getter.remote() for x in actors]))); del actors
-        if len(error_dicts.keys()) > 0:  # output error logs
-            log_file = glob.glob(self.res_dir + '/construction*')[0] + '/subclass_map_log.json'
-            logger.info('See log: {}'.format(log_file)); outputs_dictionary_data(error_dicts, log_file)
-        results = set(x for y in [set(x) for x in graphs] for x in y)
-        stats = 'Full Logic {}'.format(derives_graph_statistics(results)); print(stats); logger.info(stats)
+        args = {'construction': self.construct_approach, 'write_loc': self.write_location, 'kg_owl': kg_owl,
+                'rel_dict': self.relations_dict, 'inverse_dict': self.inverse_relations_dict,
+                'node_data': self.node_data, 'ont_cls': self.ont_classes, 'obj_props': self.obj_properties,
+                'metadata': meta.creates_node_metadata}
+        g1, _, error_dicts = self.runs_edge_constructors(args)
+        logic_kg = self.merges_edge_graphs('STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA', g1, [self.graph])
+        stats = 'Full Logic {}'.format(derives_graph_statistics(logic_kg) if isinstance(logic_kg, str)
+                                       else logic_kg.derives_graph_statistics()); print(stats); logger.info(stats)
+        prof.stops_step('STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA', self.counts_triples(logic_kg)); del logic_kg
 
         # deduplicate logic and annotation files, merge them, and print final stats
+        prof.starts_step('MERGE LOGIC AND ANNOTATION FILES')
         deduplicates_file(f + annot); deduplicates_file(f + logic); merges_files(f + annot, f + logic, f + full)
-        graph = Graph().parse(f + full, format='nt')
-        s = 'Full (Logic + Annotation) {}'.format(derives_graph_statistics(graph)); print('\n' + s); logger.info(s)
+        s = 'Full (Logic + Annotation) {}'.format(derives_graph_statistics(f + full)); print('\n' + s); logger.info(s)
+        prof.stops_step('MERGE LOGIC AND ANNOTATION FILES'); self.budget.logs_spills(); self.budget.removes_spills()
+        prof.writes_profile(self.write_location + self.full_kg[:-4] + '_Profile.json'); metrics.stops()
 
         return None
 
@@ -445,6 +860,12 @@ class PostClosureBuild(KGBuilder):
         "partial" knowledge graph build and then ran a reasoner over it. This build type inputs the closed partially
         built knowledge graph and completes the build process.
 
+        The closed knowledge graph is never loaded into an RDFLib Graph. It is converted to N-Triples once (the
+        conversion is reused while the closed file is unchanged) and streamed into an IntegerTripleStore, which is
+        used to split, derive statistics for, and write out the graph. Only the logic subset is loaded into an RDFLib
+        Graph and only when OWL semantics are decoded; node metadata is extracted from a subgraph of the metadata
+        predicates.
+
         The post-closure build utilizes the following steps: (1) Process relation and inverse relation data; (2)
         Load closed knowledge graph; (3) Process node metadata; (4) Create graph subsets; (5) Decode OWL-encoded
         classes; (6) Output knowledge graph files and create edge lists; and (7) Extract and write node metadata.
@@ -461,10 +882,13 @@ class PostClosureBuild(KGBuilder):
         logger.info('*' * 10 + 'PKT STEP: CONSTRUCTING KNOWLEDGE GRAPH' + '*' * 10 + '\n' + log_str)
 
         # STEP 1: PROCESS RELATION AND INVERSE RELATION DATA
+        prof = self.profiler; prof.starts_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
+        metrics = MetricsCollector(self.write_location); metrics.starts()
         log_str = '*** Loading Relations Data ***'; print(log_str); logger.info(log_str)
-        self.reverse_relation_processor()
+        self.reverse_relation_processor(); prof.stops_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
 
         # STEP 2: LOAD CLOSED KNOWLEDGE GRAPH
+        prof.starts_step('STEP 2: LOAD CLOSED KNOWLEDGE GRAPH')
         closed_kg = glob.glob(self.write_location + '/*.owl')
         if len(closed_kg) == 0: logs = 'KG file does not exist!'; logger.error('OSError: ' + logs); raise OSError(logs)
         elif os.stat(closed_kg[0]).st_size == 0:
@@ -472,51 +896,65 @@ class PostClosureBuild(KGBuilder):
         else:
             log_str = '*** Loading Closed Knowledge Graph ***'; print(log_str); logger.info(log_str)
             os.rename(closed_kg[0], self.write_location + self.full_kg)  # rename closed kg file
-            self.graph = Graph().parse(self.write_location + self.full_kg, format='xml')
-        stats = 'Input {}'.format(derives_graph_statistics(self.graph)); print(stats); logger.info(stats)
+            store = IntegerTripleStore(); store.loads_ntriples(converts_rdf_to_ntriples(self.write_location +
+                                                                                        self.full_kg))
+        stats = 'Input {}'.format(store.derives_graph_statistics()); print(stats); logger.info(stats)
+        prof.stops_step('STEP 2: LOAD CLOSED KNOWLEDGE GRAPH', len(store))
 
         # STEP 3: PROCESS NODE METADATA
+        prof.starts_step('STEP 3: PROCESS NODE METADATA', triples_in=len(store))
         log_str = '*** Loading Node Metadata Data ***'; print(log_str); logger.info(log_str)
         meta = Metadata(self.kg_version, self.write_location, self.full_kg, self.node_data, self.node_dict)
-        if self.node_data: meta.metadata_processor(); meta.extract_metadata(self.graph)
+        if self.node_data:  # metadata only needs the type, label, definition, and synonym triples
+            preds = [x for x in store.gets_predicates()
+                     if x in [RDF.type, RDFS.label, obo.IAO_0000115] or 'synonym' in str(x).lower()]
+            meta.metadata_processor(); meta.extract_metadata(store.gets_graph(predicates=preds))
+        prof.stops_step('STEP 3: PROCESS NODE METADATA')
 
         # STEP 4: CREATE GRAPH SUBSETS
+        prof.starts_step('STEP 4: CREATE GRAPH SUBSETS', triples_in=len(store))
         log_str = '*** Splitting Graph ***'; print(log_str); logger.info(log_str)
-        _ = self.write_location; self.graph, annotation_triples = splits_knowledge_graph(self.graph)
-        stats = 'Merged Logic Subset {}'.format(derives_graph_statistics(self.graph)); print(stats); logger.info(stats)
+        _ = self.write_location; logic_triples, annotation_triples = store.splits_knowledge_graph()
+        stats = 'Merged Logic Subset {}'.format(store.derives_graph_statistics(logic_triples))
+        print(stats); logger.info(stats)
         kg_owl = '_'.join(self.full_kg.split('_')[0:-1]) + '_OWL.owl'; kg_owl_main = kg_owl[:-8] + '.owl'
         annot, logic, full = kg_owl[:-4] + '_AnnotationsOnly.nt', kg_owl[:-4] + '_LogicOnly.nt', kg_owl[:-4] + '.nt'
-        appends_to_existing_file(annotation_triples, _ + annot); appends_to_existing_file(self.graph, _ + logic)
+        store.writes_ntriples(_ + annot, annotation_triples); store.writes_ntriples(_ + logic, logic_triples)
+        prof.stops_step('STEP 4: CREATE GRAPH SUBSETS', len(logic_triples) + len(annotation_triples))
         del annotation_triples
 
         # STEP 5: DECODE OWL SEMANTICS
-        results = [set(self.graph), None, None]
-        stats = 'Full Logic {}'.format(derives_graph_statistics(results[0])); print(stats); logger.info(stats)
+        prof.starts_step('STEP 5: DECODE OWL SEMANTICS', triples_in=len(logic_triples))
+        results = [logic_triples, None, None]
+        stats = 'Full Logic {}'.format(store.derives_graph_statistics(logic_triples)); print(stats); logger.info(stats)
         logger.info('*** Converting Knowledge Graph to Networkx MultiDiGraph ***')
-        s = convert_to_networkx(self.write_location, kg_owl[:-4], results[0], True)
+        s = convert_to_networkx(self.write_location, kg_owl[:-4], store.iterates_triples(logic_triples), True)
+        if self.output_format in ['binary', 'both']:
+            writes_csr_graph(self.write_location, kg_owl[:-4], store.iterates_triples(logic_triples))
         if s is not None: log_stats = 'Full Logic Subset (OWL) {}'.format(s); logger.info(log_stats); print(log_stats)
         if self.decode_owl:
-            self.graph = updates_pkt_namespace_identifiers(self.graph, self.construct_approach)
-            owlnets = OwlNets(self.graph, self.write_location, kg_owl_main, self.construct_approach, self.owl_tools)
-            results = [results[0]] + list(owlnets.runs_owlnets(self.cpus))
+            print('Post-processing pkt-kg-Namespaced Anonymous Nodes')
+            clean_triples = store.updates_pkt_namespace_identifiers(self.construct_approach, logic_triples)
+            graph = creates_graph(self.graph_store, self.write_location)
+            self.graph = store.gets_graph(clean_triples, graph=graph)
+            owlnets = OwlNets(self.graph, self.write_location, kg_owl_main, self.construct_approach, self.owl_tools,
+                              profiler=prof, output_format=self.output_format, graph_store=self.graph_store)
+            results = [results[0]] + list(owlnets.runs_owlnets(self.cpus, self.executor.gets_backend_type()))
+        prof.stops_step('STEP 5: DECODE OWL SEMANTICS', sum(len(x) for x in results if x is not None))
 
         # STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS
+        prof.starts_step('STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS',
+                         triples_in=sum(len(x) for x in results if x is not None))
         log_str = '*** Writing Knowledge Graph Edge Lists ***'; print('\n' + log_str); logger.info(log_str)
-        f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.construct_approach.upper() + '_purified']
-        for x in range(0, len(results)):
-            graph = results[x]; p_str = 'OWL' if x == 0 else 'OWL-NETS' if x == 1 else 'Purified OWL-NETS'
-            if graph is not None:
-                log_str = '*** Processing {} Graph ***'.format(p_str); print(log_str); logger.info(log_str)
-                triple_list_file = kg_owl[:-8] + f_prefix[x] + '_Triples_Integers.txt'
-                triple_map = triple_list_file[:-5] + '_Identifier_Map.json'
-                node_int_map = maps_ids_to_integers(graph, self.write_location, triple_list_file, triple_map)
-
-                # STEP 8: EXTRACT AND WRITE NODE METADATA
-                meta.full_kg = kg_owl[:-8] + f_prefix[x] + '.owl'
-                if self.node_data: meta.output_metadata(node_int_map, graph)
+        self.writes_graph_outputs(results, meta, kg_owl, store)  # STEP 8 (node metadata) is run by the same actors
+        prof.stops_step('STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS')
+        del store, results
 
         # deduplicate logic and annotation files and then merge them
+        prof.starts_step('MERGE LOGIC AND ANNOTATION FILES')
         deduplicates_file(_ + annot); deduplicates_file(_ + logic); merges_files(_ + annot, _ + logic, _ + full)
+        prof.stops_step('MERGE LOGIC AND ANNOTATION FILES'); self.budget.logs_spills(); self.budget.removes_spills()
+        prof.writes_profile(self.write_location + self.full_kg[:-4] + '_Profile.json'); metrics.stops()
 
         return None
 
@@ -533,7 +971,10 @@ class FullBuild(KGBuilder):
         does not include running a reasoner. The full build includes the following steps: (1) Process relation/inverse
         relations; (2) Merge ontologies; (3) Process node metadata; (4) Create graph subsets; (5) Add master edge
         list to merged ontologies; (6) Decode OWL-encoded classes; (7) Output knowledge graphs and create edge lists
-        and (8) Extract and write node metadata.
+        and (8) Extract and write node metadata. If self.update is True and the build state of a previous build with
+        the same inputs and settings exists, only the edge types that were added to or changed in the master edge list
+        are constructed and decoded in step (5) and (6), the edge types that were removed are dropped, and the
+        results of the unchanged edge types are reused from the build state. Steps (7) and (8) are run in full.
 
         Returns:
             None.
@@ -543,82 +984,131 @@ class FullBuild(KGBuilder):
         logger.info('*' * 10 + 'PKT STEP: CONSTRUCTING KNOWLEDGE GRAPH' + '*' * 10 + '\n' + log_str)
 
         # STEP 1: PROCESS RELATION AND INVERSE RELATION DATA
+        prof = self.profiler; prof.starts_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
+        metrics = MetricsCollector(self.write_location); metrics.starts()
         log_str = '*** Loading Relations Data ***'; print(log_str); logger.info(log_str)
-        self.reverse_relation_processor()
+        self.reverse_relation_processor(); prof.stops_step('STEP 1: PROCESS RELATION AND INVERSE RELATION DATA')
 
         # STEP 2: MERGE ONTOLOGIES
+        prof.starts_step('STEP 2: MERGE ONTOLOGIES')
         if self.merged_ont_kg in glob.glob(self.write_location + '/*.owl'):
             log_str = '*** Loading Merged Ontologies ***'; print(log_str); logger.info(log_str)
-            self.graph = Graph().parse(self.merged_ont_kg, format='xml')
+            self.graph = loads_graph_snapshot(self.merged_ont_kg, graph_store=self.graph_store)
         else:
             log_str = '*** Merging Ontology Data ***'; print(log_str); logger.info(log_str)
-            merges_ontologies(self.ontologies, self.merged_ont_kg.split('/')[-1], self.owl_tools)
-            self.graph.parse(self.merged_ont_kg, format='xml')
+            merged_ont = '/' + self.merged_ont_kg.split('/')[-1]
+            merges_ontologies(self.ontologies, self.write_location, merged_ont, self.owl_tools, self.cpus)
+            self.graph = loads_graph_snapshot(self.merged_ont_kg, graph_store=self.graph_store)
         stats = 'Merged Ontologies {}'.format(derives_graph_statistics(self.graph)); print(stats); logger.info(stats)
+        state = self.loads_build_state(self.gets_build_signature()) if self.update else None
+        prof.stops_step('STEP 2: MERGE ONTOLOGIES', len(self.graph))
 
         # STEP 3: PROCESS NODE METADATA
+        prof.starts_step('STEP 3: PROCESS NODE METADATA', triples_in=len(self.graph))
         log_str = '*** Loading Node Metadata Data ***'; print(log_str); logger.info(log_str)
         meta = Metadata(self.kg_version, self.write_location, self.full_kg, self.node_data, self.node_dict)
         if self.node_data: meta.metadata_processor(); meta.extract_metadata(self.graph)
+        prof.stops_step('STEP 3: PROCESS NODE METADATA')
 
         # STEP 4: CREATE GRAPH SUBSETS
+        prof.starts_step('STEP 4: CREATE GRAPH SUBSETS', triples_in=len(self.graph))
         log_str = '*** Splitting Graph ***'; print(log_str); logger.info(log_str)
-        f = self.write_location; self.graph, annotation_triples = splits_knowledge_graph(self.graph)
-        s = 'Merged Ontologies - Logic Subset {}'.format(derives_graph_statistics(self.graph)); print(s); logger.info(s)
-        kg_owl = '_'.join(self.full_kg.split('_')[0:-1]) + '_OWL.owl'; kg_owl_main = kg_owl[:-8] + '.owl'
+        f, kg_owl = self.write_location, '_'.join(self.full_kg.split('_')[0:-1]) + '_OWL.owl'
         annot, logic, full = kg_owl[:-4] + '_AnnotationsOnly.nt', kg_owl[:-4] + '_LogicOnly.nt', kg_owl[:-4] + '.nt'
-        appends_to_existing_file(annotation_triples, f + annot); appends_to_existing_file(self.graph, f + logic)
-        del annotation_triples
+        kg_owl_main = kg_owl[:-8] + '.owl'
+        if self.update:  # the n-triples files of a previous build are rewritten instead of appended to
+            old = [f + annot, f + logic, f + full] + glob.glob(f + kg_owl_main[:-4] + '_OWLNETS*.nt')
+            for x in [x for x in old if os.path.exists(x)]: os.remove(x)
+        self.graph, n = loads_split_snapshot(self.merged_ont_kg, self.graph, self.graph_store, f + annot)
+        s = 'Merged Ontologies - Logic Subset {}'.format(derives_graph_statistics(self.graph)); print(s); logger.info(s)
+        appends_to_existing_file(self.graph, f + logic)
+        prof.stops_step('STEP 4: CREATE GRAPH SUBSETS', len(self.graph) + n)
 
         # STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA
+        prof.starts_step('STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA', triples_in=len(self.graph))
         log_str = '*** Building Knowledge Graph Edges ***'; print('\n' + log_str); logger.info(log_str)
         self.ont_classes = gets_ontology_classes(self.graph); self.obj_properties = gets_object_properties(self.graph)
-        try: ray.init()
-        except RuntimeError: pass
-        args = {'construction': self.construct_approach, 'edge_dict': self.edge_dict, 'node_data': self.node_data,
-                'rel_dict': self.relations_dict, 'inverse_dict': self.inverse_relations_dict, 'kg_owl': kg_owl,
-                'ont_cls': self.ont_classes, 'obj_props': self.obj_properties, 'metadata': meta.creates_node_metadata,
-                'write_loc': self.write_location}
-        edges = sublist_creator({k: len(v['edge_list']) for k, v in self.edge_dict.items()}, self.cpus)
-        actors = [ray.remote(self.EdgeConstructor).remote(args) for _ in range(self.cpus)]  # type: ignore
-        for i in range(0, len(edges)): [actors[i].creates_new_edges.remote(j) for j in edges[i]]  # type: ignore
-        _ = ray.wait([x.graph_getter.remote() for x in actors], num_returns=len(actors))
-        res = ray.get([x.graph_getter.remote() for x in actors]); g1 = [x[0] for x in res]; g2 = [x[1] for x in res]
-        error_dicts = dict(ChainMap(*ray.get([x.error_dict_getter.remote() for x in actors]))); del actors
-        if len(error_dicts.keys()) > 0:  # output error logs
+        args = {'construction': self.construct_approach, 'write_loc': self.write_location, 'kg_owl': kg_owl,
+                'rel_dict': self.relations_dict, 'inverse_dict': self.inverse_relations_dict,
+                'node_data': self.node_data, 'ont_cls': self.ont_classes, 'obj_props': self.obj_properties,
+                'metadata': meta.creates_node_metadata, 'records': self.update}
+        hashes = self.gets_edge_type_hashes(); prev = dict() if state is None else state['edge_types']
+        reused = [k for k in hashes.keys() if k in prev.keys() and prev[k]['hash'] == hashes[k]]
+        if state is not None:
+            log_str = 'Updating Previous Build: {} added or changed, {} removed, and {} unchanged edge types'.format(
+                len(hashes) - len(reused), len([k for k in prev.keys() if k not in hashes.keys()]), len(reused))
+            print(log_str); logger.info(log_str)
+        g1, g2, error_dicts = self.runs_edge_constructors(args, [k for k in hashes.keys() if k not in reused])
+        graphs = [self.graph]
+        for k in reused:  # add the triples and errors of the unchanged edge types
+            appends_to_existing_file(prev[k]['logic'], f + logic)
+            appends_to_existing_file(prev[k]['annotations'], f + annot)
+            graphs += [prev[k]['logic'] | prev[k]['properties']]
+            if len(prev[k]['errors']) > 0: error_dicts[k] = prev[k]['errors']
+        if len(reused) > 0 and len(error_dicts.keys()) > 0:
             log_file = glob.glob(self.res_dir + '/construction*')[0] + '/subclass_map_log.json'
-            logger.info('See log: {}'.format(log_file)); outputs_dictionary_data(error_dicts, log_file)
+            outputs_dictionary_data(error_dicts, log_file)
+        prof.stops_step('STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA',
+                        sum(len(x) for x in graphs) + sum(x[1] for x in g1))
 
         # STEP 6: DECODE OWL SEMANTICS
-        results = [set(x for y in [set(x) for x in [self.graph] + g1] for x in y), None, None]
-        stats = 'Full Logic {}'.format(derives_graph_statistics(results[0])); print(stats); logger.info(stats)
-        s1 = convert_to_networkx(self.write_location, kg_owl[:-4], results[0], True)
+        step = 'STEP 6: DECODE OWL SEMANTICS'
+        prof.starts_step(step, triples_in=sum(len(x) for x in graphs) + sum(x[1] for x in g1))
+        logic_kg = self.merges_edge_graphs(step, g1, graphs); results: List = [None, None, None]; del graphs
+        spilled = isinstance(logic_kg, str)  # a spilled graph is streamed from disk and only loaded in STEP 7
+        triples = (lambda: iterates_ntriples(logic_kg)) if spilled else (lambda: logic_kg.iterates_triples())
+        stats = 'Full Logic {}'.format(derives_graph_statistics(logic_kg) if spilled
+                                       else logic_kg.derives_graph_statistics()); print(stats); logger.info(stats)
+        s1 = convert_to_networkx(self.write_location, kg_owl[:-4], triples(), True)
+        if self.output_format in ['binary', 'both']: writes_csr_graph(self.write_location, kg_owl[:-4], triples())
         if s1 is not None: log_stats = 'Full Logic Subset (OWL) {}'.format(s1); logger.info(log_stats); print(log_stats)
         # aggregates processed owl-nets output derived when constructing non-ontology edges
+        decoded: Optional[Dict] = None if not self.update else dict(); owlnets = None
         if self.decode_owl is not None:
-            graphs = [updates_pkt_namespace_identifiers(self.graph, self.construct_approach)] + g2
-            owlnets = OwlNets(graphs, self.write_location, kg_owl_main, self.construct_approach, self.owl_tools)
-            results = [results[0]] + list(owlnets.runs_owlnets(self.cpus))
+            if not self.update:  # the files written by the actors are only loaded by OwlNets when they are decoded
+                graphs = [updates_pkt_namespace_identifiers(self.graph, self.construct_approach)]
+                edges: List = [x[0] for x in g2]; sizes = [x[1] for x in g2]
+            else:  # edge types are decoded one at a time so that the results of unchanged edge types can be reused
+                if state is not None and state['ontology'] is not None: decoded[0] = state['ontology']
+                decoded.update({i + 1: prev[k]['decoded'] for i, k in enumerate(hashes.keys())
+                                if k in reused and prev[k]['decoded'] is not None})
+                graphs = [Graph() if 0 in decoded.keys() else
+                          updates_pkt_namespace_identifiers(self.graph, self.construct_approach)]
+                edges = [Graph() if i + 1 in decoded.keys() else self.edge_records[k].pop('clean')
+                         for i, k in enumerate(hashes.keys())]; sizes = [len(x) for x in edges]
+            spill = self.budget.exceeds_budget(len(graphs[0]) + sum(sizes)); g2 = []
+            if spill and len(graphs[0]) > 0:  # the merged logic graph already holds the ontologies, so both are freed
+                graphs = [self.budget.spills_triples(step, 'OWLNETS', graphs)]; self.graph = Graph()
+            for i in range(len(edges)):  # spilled graphs are only loaded by OwlNets when they are decoded
+                if isinstance(edges[i], str): graphs += [edges[i]]
+                elif spill and len(edges[i]) > 0: graphs += [self.budget.spills_triples(step, 'OWLNETS', [edges[i]])]
+                elif isinstance(edges[i], Graph): graphs += [edges[i]]
+                else: graphs += [adds_edges_to_graph(Graph(), edges[i], False)]
+                edges[i] = None
+            del edges
+            owlnets = OwlNets(graphs, self.write_location, kg_owl_main, self.construct_approach, self.owl_tools,
+                              profiler=prof, output_format=self.output_format,
+                              graph_store='sqlite' if spill else self.graph_store)
+            results = [results[0]] + list(owlnets.runs_owlnets(self.cpus, self.executor.gets_backend_type(), decoded))
+        n = self.counts_triples(logic_kg) + sum(len(x) for x in results if x is not None); prof.stops_step(step, n)
 
         # STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS
+        prof.starts_step('STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS', triples_in=n)
         log_str = '*** Writing Knowledge Graph Edge Lists ***'; print('\n' + log_str); logger.info(log_str)
-        f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.construct_approach.upper() + '_purified']
-        for x in range(0, len(results)):
-            graph = results[x]; p_str = 'OWL' if x == 0 else 'OWL-NETS' if x == 1 else 'Purified OWL-NETS'
-            if graph is not None:
-                log_str = '*** Processing {} Graph ***'.format(p_str); print('\n' + log_str); logger.info(log_str)
-                triple_list_file = kg_owl[:-8] + f_prefix[x] + '_Triples_Integers.txt'
-                triple_map = triple_list_file[:-5] + '_Identifier_Map.json'
-                node_int_map = maps_ids_to_integers(graph, self.write_location, triple_list_file, triple_map)
-
-                # STEP 8: EXTRACT AND WRITE NODE METADATA
-                meta.full_kg = kg_owl[:-8] + f_prefix[x] + '.owl'
-                if self.node_data: meta.output_metadata(node_int_map, graph)
+        store = IntegerTripleStore() if spilled else logic_kg
+        if spilled: store.loads_ntriples(logic_kg, bnode_labels=True)
+        results[0] = store.triples; del logic_kg
+        self.writes_graph_outputs(results, meta, kg_owl, store)  # STEP 8 (node metadata) is run by the same actors
+        prof.stops_step('STEP 7: WRITE OUT KNOWLEDGE GRAPH METADATA AND CREATE EDGE LISTS')
 
         # deduplicate logic and annotation files, merge them, and print final stats
+        prof.starts_step('MERGE LOGIC AND ANNOTATION FILES')
         deduplicates_file(f + annot); deduplicates_file(f + logic); merges_files(f + annot, f + logic, f + full)
-        str1 = '\nLoading Full (Logic + Annotation) Graph'; print('\n' + str1); logger.info(str1)
-        graph = Graph().parse(f + full, format='nt'); str2 = 'Deriving Stats'; print('\n' + str2); logger.info(str2)
-        s = 'Full (Logic + Annotation) {}'.format(derives_graph_statistics(graph)); print('\n' + s); logger.info(s)
+        str1 = 'Deriving Full (Logic + Annotation) Graph Stats'; print('\n' + str1); logger.info(str1)
+        s = 'Full (Logic + Annotation) {}'.format(derives_graph_statistics(f + full)); print('\n' + s); logger.info(s)
+        prof.stops_step('MERGE LOGIC AND ANNOTATION FILES'); self.budget.logs_spills(); self.budget.removes_spills()
+        if self.update:
+            self.writes_build_state(prev, error_dicts, None if owlnets is None else owlnets.decoded_graphs)
+        prof.writes_profile(self.write_location + self.full_kg[:-4] + '_Profile.json'); metrics.stops()
 
         return None
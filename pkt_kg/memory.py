@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# import needed libraries
+import glob
+import logging.config
+import os
+import psutil  # type: ignore
+import re
+import shutil
+
+from typing import Dict, Iterable, List, Optional, Union
+
+from pkt_kg.utils import appends_to_existing_file, deduplicates_file, merges_sorted_files
+
+# logging
+log_dir, log, log_config = 'builds/logs', 'pkt_build_log.log', glob.glob('**/logging.ini', recursive=True)
+try:
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+except FileNotFoundError:
+    log_dir, log_config = '../builds/logs', glob.glob('../builds/logging.ini', recursive=True)
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+logger = logging.getLogger(__name__)
+logging.config.fileConfig(log_config[0], disable_existing_loggers=False, defaults={'log_file': log_dir + '/' + log})
+
+# set global attributes
+spill_dir = '/.pkt_spill'
+size_units = {'': 1, 'B': 1, 'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30, 'T': 2 ** 40}
+
+
+class MemoryBudget(object):
+    """Class keeps the intermediate results of a knowledge graph build (e.g. the merged logic graph and the OWL-NETS
+    input graphs) within a maximum amount of memory. Before a large intermediate is held in memory, the build asks the
+    budget whether the resident set size of the process plus the estimated size of the intermediate exceeds
+    max_memory. If it does, the intermediate is spilled to disk as a sorted and deduplicated N-Triples file, which is
+    built from sorted runs (see deduplicates_file and merges_sorted_files) so that the spill itself never needs more
+    memory than the size of a run. Each spill is recorded and logged with the build step that spilled and the number
+    of triples and bytes that were written. An intermediate that is already in memory only frees memory when it is
+    spilled if the build drops its own references to it afterwards (e.g. the OWL-NETS input graphs). A spilled
+    intermediate is streamed from disk by the steps that read it, is loaded one graph at a time into a disk-backed
+    store by OWL-NETS (see OwlNets.runs_owlnets), and is only loaded into memory once it is needed in full (e.g. by
+    the IntegerTripleStore used to write the outputs of the build).
+
+    Attributes:
+        write_location: A string pointing to the directory where spilled files are written.
+        max_memory: An optional integer number of bytes or a string containing a size with a unit (e.g. "64GB",
+            "512M"). If None, nothing is ever spilled (default=None).
+        triple_size: An integer containing the estimated number of bytes needed to hold one triple of RDFLib terms
+            in memory (default=512).
+
+    Raises:
+        ValueError: If max_memory is not a positive size.
+    """
+
+    def __init__(self, write_location: str, max_memory: Optional[Union[int, str]] = None,
+                 triple_size: int = 512) -> None:
+
+        self.write_location: str = write_location
+        self.spill_location: str = write_location + spill_dir
+        self.max_memory: Optional[int] = self.parses_memory_size(max_memory)
+        self.triple_size: int = triple_size
+        self.spills: List[Dict] = []
+
+    @staticmethod
+    def parses_memory_size(size: Optional[Union[int, str]]) -> Optional[int]:
+        """Converts a memory size into a number of bytes.
+
+        Args:
+            size: An integer number of bytes, a string containing a size with an optional unit (i.e. B, K, M, G, or T
+                with or without a trailing "B", e.g. "64GB", "1.5G", "512mb"), or None.
+
+        Returns:
+            An integer number of bytes or None if size is None.
+
+        Raises:
+            ValueError: If size is not a positive size.
+        """
+
+        if size is None: return None
+        match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([BKMGT]?)B?\s*$', str(size).upper())
+        if match is None or float(match.group(1)) <= 0:
+            log_str = 'max_memory must be a positive size (e.g. "64GB")'; logger.error('ValueError: ' + log_str)
+            raise ValueError(log_str)
+
+        return int(float(match.group(1)) * size_units[match.group(2)])
+
+    @staticmethod
+    def gets_memory_usage() -> int:
+        """Returns the resident set size of the process in bytes."""
+
+        return psutil.Process(os.getpid()).memory_info().rss
+
+    def exceeds_budget(self, triples: int = 0) -> bool:
+        """Checks whether holding an intermediate in memory would exceed the memory budget.
+
+        Args:
+            triples: An integer containing the number of triples in the intermediate (default=0).
+
+        Returns:
+            True if max_memory is set and the resident set size of the process plus the estimated size of the
+            intermediate is larger than max_memory, otherwise False.
+        """
+
+        if self.max_memory is None: return False
+
+        return self.gets_memory_usage() + triples * self.triple_size > self.max_memory
+
+    def spills_triples(self, step: str, name: str, graphs: List[Iterable], filepath: Optional[str] = None) -> str:
+        """Spills one or more collections of triples to a single sorted and deduplicated N-Triples file. Each
+        collection is written and sorted as its own run, and the runs are then merged with a k-way merge. Runs are
+        sorted in chunks of at most one sixteenth of max_memory. Collections that are already on disk (i.e. N-Triples
+        files, such as the graphs written by the EdgeConstructor actors) are copied into a run without being loaded.
+
+        Args:
+            step: A string containing the name of the build step that is spilling (e.g. "STEP 5").
+            name: A string describing the intermediate being spilled (e.g. "Full Logic").
+            graphs: A list of RDFLib Graphs, sets of triples, or strings containing paths to N-Triples files.
+            filepath: An optional string containing the file to write. The triples of an existing file are kept and
+                merged with the spilled triples (default=a file in the spill directory named after name).
+
+        Returns:
+            filepath: A string containing the path to the spilled N-Triples file.
+        """
+
+        if not os.path.exists(self.spill_location): os.mkdir(self.spill_location)
+        name_ = name.replace(' ', '_') + '_' + str(len(self.spills))
+        filepath = self.spill_location + '/' + name_ + '.nt' if filepath is None else filepath
+        run_size = min(2 ** 27, max(2 ** 20, (self.max_memory or 2 ** 31) // 16)); runs: List[str] = []; triples = 0
+        for i, graph in enumerate(graphs):
+            runs += [self.spill_location + '/' + name_ + '_run_{}.nt'.format(i)]
+            if isinstance(graph, str):
+                shutil.copyfile(graph, runs[-1])
+                with open(runs[-1], 'rb') as f: triples += sum(1 for _ in f)
+            else:
+                open(runs[-1], 'w').close(); appends_to_existing_file(graph, runs[-1]); triples += len(graph)
+            deduplicates_file(runs[-1], run_size, self.spill_location)
+        if os.path.exists(filepath): deduplicates_file(filepath, run_size, self.spill_location); runs += [filepath]
+        merges_sorted_files(runs, filepath)
+        for x in [x for x in runs if x != filepath]: os.remove(x)
+        record = {'step': step, 'name': name, 'file': filepath, 'triples': triples, 'bytes': os.stat(filepath).st_size}
+        self.spills.append(record)
+        log_str = 'Memory Budget Exceeded in {}: Spilled {} {} Triples ({:.1f} MB) to {}'.format(
+            step, triples, name, record['bytes'] / 1048576, filepath); print(log_str); logger.info(log_str)
+
+        return filepath
+
+    def gets_spills(self) -> List[Dict]:
+        """Returns the list of spill records (i.e. dictionaries with the step, name, file, triples, and bytes)."""
+
+        return self.spills
+
+    def logs_spills(self) -> None:
+        """Logs a summary of the spills made by each build step.
+
+        Returns:
+            None.
+        """
+
+        if self.max_memory is not None:
+            log_str = 'Memory Budget ({:.1f} MB): {} Spills'.format(self.max_memory / 1048576, len(self.spills))
+            for step in list(dict.fromkeys(x['step'] for x in self.spills)):
+                spills = [x for x in self.spills if x['step'] == step]
+                log_str += '\n  - {}: {} Triples ({:.1f} MB) from {}'.format(
+                    step, sum(x['triples'] for x in spills), sum(x['bytes'] for x in spills) / 1048576,
+                    ', '.join(list(dict.fromkeys(x['name'] for x in spills))))
+            print(log_str); logger.info(log_str)
+
+        return None
+
+    def removes_spills(self) -> None:
+        """Removes the spill directory and all of the spilled files it contains.
+
+        Returns:
+            None.
+        """
+
+        shutil.rmtree(self.spill_location, ignore_errors=True)
+
+        return None
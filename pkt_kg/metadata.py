@@ -16,7 +16,7 @@ from datetime import datetime
 from rdflib import Graph, Literal, Namespace, URIRef   # type: ignore
 from rdflib.namespace import RDF, RDFS, OWL  # type: ignore
 from tqdm import tqdm  # type: ignore
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from pkt_kg.utils import *
 
@@ -98,7 +98,7 @@ class Metadata(object):
 
         return None
 
-    def extract_metadata(self, graph: Graph) -> None:
+    def extract_metadata(self, graph: Graph, index: Optional[AnnotationIndex] = None) -> None:
         """Functions queries the knowledge graph to obtain labels, definitions/descriptions, and synonyms for all
         owl:Class, owl:NamedIndividual, and owl:ObjectProperty objects. This information is then added to the existing
         self.node_dict dictionary under the key of "nodes" (for owl:Class and owl:NamedIndividual) or "relations" (for
@@ -108,6 +108,7 @@ class Metadata(object):
 
         Args:
             graph: An rdflib graph object.
+            index: An optional AnnotationIndex of graph (default=None, which builds a new index).
 
         Returns:
             None.
@@ -116,6 +117,7 @@ class Metadata(object):
         log_str = 'Extracting Class and Relation Metadata'; print('\n' + log_str); logger.info(log_str)
 
         if self.node_dict:
+            index = AnnotationIndex(graph) if index is None else index
             domains = [
                 ('nodes', [i[0] for i in list(graph.triples((None, RDF.type, None)))
                            if isinstance(i[0], URIRef)
@@ -127,16 +129,13 @@ class Metadata(object):
             for key, entities in domains:
                 temp_dict = dict()
                 for i in tqdm(entities):
-                    labels = [x for x in graph.triples((i, RDFS.label, None))
-                              if '@' not in n3(x[2]) or '@en' in n3(x[2])]
-                    descriptions = [x for x in graph.triples((i, obo.IAO_0000115, None))
-                                    if '@' not in n3(x[2]) or '@en' in n3(x[2])]
-                    synonyms = [x for x in graph.triples((i, None, None)) if 'synonym' in str(x[1]).lower()]
+                    labels = index.gets_labels(i); descriptions = index.gets_definitions(i)
+                    synonyms = index.gets_synonyms(i)
                     if len(labels) != 0:
                         temp_dict[str(i)] = {
-                            'Label': str(labels[0][2]) if len(labels) > 0 else None,
-                            'Description': str(descriptions[0][2]) if len(descriptions) > 0 else None,
-                            'Synonym': '|'.join([str(c[2]) for c in synonyms]) if len(synonyms) > 0 else None
+                            'Label': str(labels[0]) if len(labels) > 0 else None,
+                            'Description': str(descriptions[0]) if len(descriptions) > 0 else None,
+                            'Synonym': '|'.join([str(c[1]) for c in synonyms]) if len(synonyms) > 0 else None
                         }
                 self.node_dict[key] = {**self.node_dict[key], **temp_dict}
 
@@ -249,11 +248,37 @@ class Metadata(object):
         """
 
         if self.node_dict is not None and self.node_data is not None:
-            log_str = 'Writing Class Metadata'; print(log_str); logger.info(log_str)
+            self.saves_node_metadata(); self.writes_node_labels(node_integer_map, graph)
+
+        return None
 
-            # make sure that the metadata dict contains valid entries
+    def saves_node_metadata(self) -> None:
+        """Tidies the self.node_dict dictionary (see _tidy_metadata) and pickles it to the node_data file.
+
+        Returns:
+            None.
+        """
+
+        if self.node_dict is not None and self.node_data is not None:
+            log_str = 'Writing Class Metadata'; print(log_str); logger.info(log_str)
             self._tidy_metadata(); pickle.dump(self.node_dict, open(self.node_data[0], 'wb'))
-            # write metadata in flat-file
+
+        return None
+
+    def writes_node_labels(self, node_integer_map: Dict, graph: Union[Set, Graph, Iterable]) -> None:
+        """Writes the node metadata of every node and relation in graph to the '_NodeLabels.txt' file of the
+        knowledge graph in self.full_kg (see output_metadata). Unlike output_metadata, the node_data file is not
+        rewritten, so several knowledge graphs can be written at the same time (e.g. by parallel actors).
+
+        Args:
+            node_integer_map: A dictionary where keys are integers and values are node and relation identifiers.
+            graph: A set of RDFLib Graph object triples, an RDFLib Graph, or an iterable of triples.
+
+        Returns:
+            None.
+        """
+
+        if self.node_dict is not None and self.node_data is not None:
             entities = set([i for j in tqdm(graph) for i in j]); filename = self.full_kg[:-4] + '_NodeLabels.txt'
             with open(self.write_location + filename, 'w', encoding='utf-8') as out:
                 out.write('entity_type' + '\t' + 'integer_id' + '\t' + 'entity_uri' + '\t' + 'label' + '\t' +
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# import needed libraries
+import glob
+import json
+import logging.config
+import os
+import shutil
+import socket
+import threading
+import time
+
+from typing import Dict, Optional
+
+# logging
+log_dir, log, log_config = 'builds/logs', 'pkt_build_log.log', glob.glob('**/logging.ini', recursive=True)
+try:
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+except FileNotFoundError:
+    log_dir, log_config = '../builds/logs', glob.glob('../builds/logging.ini', recursive=True)
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+logger = logging.getLogger(__name__)
+logging.config.fileConfig(log_config[0], disable_existing_loggers=False, defaults={'log_file': log_dir + '/' + log})
+
+# set global attributes
+spool_dir, metrics_file = '/.pkt_metrics', '/pkt_metrics.prom'
+metric_help = {'edges_processed': 'Number of master edge list edges processed by an actor.',
+               'triples_emitted': 'Number of triples emitted by an actor.',
+               'entities_decoded': 'Number of OWL-encoded classes and axioms decoded by an actor.',
+               'edge_types_completed': 'Number of edge types completed by an actor.'}
+
+
+class MetricsPublisher(object):
+    """Class used by parallel actors (e.g. KGBuilder.EdgeConstructor, OwlNets, and CreatesEdgeList) to publish
+    cumulative counters to a MetricsCollector. Counters are kept in memory and are written, at most once every
+    interval seconds, as a small JSON snapshot to the collector's spool directory within write_location. Nothing is
+    written unless a MetricsCollector has been started for write_location, so actors can always publish.
+
+    Attributes:
+        write_location: A string pointing to the directory monitored by a MetricsCollector.
+        actor: A string containing the name of the actor type (e.g. "EdgeConstructor").
+        interval: A float specifying the minimum number of seconds between snapshots (default=5.0).
+    """
+
+    def __init__(self, write_location: str, actor: str, interval: float = 5.0) -> None:
+
+        self.spool: str = write_location + spool_dir
+        self.host: str = socket.gethostname()
+        self.actor: str = '{}_{}_{}'.format(actor, os.getpid(), id(self))
+        self.interval: float = interval
+        self.counters: Dict[str, int] = dict()
+        self.last_publish: float = 0.0
+
+    def increments(self, **counters: int) -> None:
+        """Increments one or more counters and publishes them if more than interval seconds have passed since the
+        last snapshot.
+
+        Args:
+            counters: Keyword arguments of counter names and increments (e.g. edges_processed=1).
+
+        Returns:
+            None.
+        """
+
+        for k, v in counters.items(): self.counters[k] = self.counters.get(k, 0) + v
+        if time.time() - self.last_publish >= self.interval: self.publishes()
+
+        return None
+
+    def publishes(self) -> None:
+        """Writes a snapshot of the counters to the spool directory, if a MetricsCollector is running.
+
+        Returns:
+            None.
+        """
+
+        self.last_publish = time.time()
+        if os.path.isdir(self.spool):
+            snapshot = {'actor': self.actor, 'host': self.host, 'timestamp': self.last_publish,
+                        'counters': self.counters}
+            try:
+                with open(self.spool + '/' + self.actor + '.tmp', 'w') as out: json.dump(snapshot, out)
+                os.replace(self.spool + '/' + self.actor + '.tmp', self.spool + '/' + self.actor + '.json')
+            except OSError: pass  # collector was stopped while publishing
+
+        return None
+
+
+class MetricsCollector(object):
+    """Class collects the counters published by MetricsPublisher actors and periodically writes them, in the
+    Prometheus text exposition format, to pkt_metrics.prom in write_location. The file can be scraped by a
+    Prometheus node exporter textfile collector or shipped with the build logs (e.g. by PKTLogUploader).
+
+    Attributes:
+        write_location: A string pointing to the directory where the metrics file should be written.
+        interval: A float specifying how often, in seconds, the metrics file is refreshed (default=15.0).
+    """
+
+    def __init__(self, write_location: str, interval: float = 15.0) -> None:
+
+        self.write_location: str = write_location
+        self.spool: str = write_location + spool_dir
+        self.interval: float = interval
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def starts(self) -> None:
+        """Creates the spool directory and starts a background thread that refreshes the metrics file.
+
+        Returns:
+            None.
+        """
+
+        if os.path.exists(self.spool): shutil.rmtree(self.spool, ignore_errors=True)
+        os.makedirs(self.spool); self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True); self._thread.start()
+        logger.info('Writing live actor metrics to {}'.format(self.write_location + metrics_file))
+
+        return None
+
+    def _run(self) -> None:
+        """Refreshes the metrics file every interval seconds until the collector is stopped."""
+
+        while not self._stop.wait(self.interval): self.writes_metrics()
+
+        return None
+
+    def stops(self) -> None:
+        """Stops the background thread, writes the final metrics file, and removes the spool directory.
+
+        Returns:
+            None.
+        """
+
+        self._stop.set()
+        if self._thread is not None: self._thread.join(); self._thread = None
+        self.writes_metrics(); shutil.rmtree(self.spool, ignore_errors=True)
+
+        return None
+
+    def collects_metrics(self) -> Dict:
+        """Reads the most recent snapshot published by each actor.
+
+        Returns:
+            metrics: A dictionary keyed by actor containing each actor's snapshot, for example:
+                {'EdgeConstructor_11_1404': {'actor': 'EdgeConstructor_11_1404', 'host': 'pkt', 'timestamp': 1.0,
+                                             'counters': {'edges_processed': 10, 'triples_emitted': 30}}}
+        """
+
+        metrics = dict()
+        for f in sorted(glob.glob(self.spool + '/*.json')):
+            try:
+                with open(f, 'r') as snapshot: data = json.load(snapshot)
+                metrics[data['actor']] = data
+            except (OSError, ValueError, KeyError): pass  # snapshot removed or replaced while reading
+
+        return metrics
+
+    @staticmethod
+    def formats_metrics(metrics: Dict) -> str:
+        """Formats actor snapshots using the Prometheus text exposition format.
+
+        Args:
+            metrics: A dictionary keyed by actor containing each actor's snapshot (see collects_metrics).
+
+        Returns:
+            A string containing the formatted metrics.
+        """
+
+        lines, counters = [], sorted(set(x for y in metrics.values() for x in y['counters'].keys()))
+        for c in counters:
+            name = 'pkt_' + c + '_total'; desc = metric_help.get(c, 'Number of {} by an actor.'.format(c))
+            lines += ['# HELP {} {}'.format(name, desc), '# TYPE {} counter'.format(name)]
+            for k, v in sorted(metrics.items()):
+                if c in v['counters']:
+                    lines += ['{}{{actor="{}",host="{}"}} {}'.format(name, k, v['host'], v['counters'][c])]
+        if len(metrics) > 0:
+            name = 'pkt_actor_last_update_timestamp_seconds'
+            lines += ['# HELP {} Time of the most recent update from an actor.'.format(name),
+                      '# TYPE {} gauge'.format(name)]
+            lines += ['{}{{actor="{}",host="{}"}} {}'.format(name, k, v['host'], round(v['timestamp'], 3))
+                      for k, v in sorted(metrics.items())]
+
+        return '\n'.join(lines) + '\n'
+
+    def writes_metrics(self) -> None:
+        """Collects the actor snapshots and atomically rewrites the metrics file.
+
+        Returns:
+            None.
+        """
+
+        filepath = self.write_location + metrics_file
+        with open(filepath + '.tmp', 'w') as out: out.write(self.formats_metrics(self.collects_metrics()))
+        os.replace(filepath + '.tmp', filepath)
+
+        return None
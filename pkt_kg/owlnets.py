@@ -8,7 +8,7 @@ import networkx  # type: ignore
 import os
 import os.path
 import pickle
-import ray  # type: ignore
+import uuid
 # import re
 
 from collections import ChainMap  # type: ignore
@@ -19,6 +19,10 @@ from statistics import mode, StatisticsError
 from tqdm import tqdm  # type: ignore
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+from pkt_kg.executors import gets_executor
+from pkt_kg.memory import spill_dir
+from pkt_kg.metrics import MetricsPublisher
+from pkt_kg.profiler import BuildProfiler
 from pkt_kg.utils import *
 
 # add global variables
@@ -61,7 +65,9 @@ class OwlNets(object):
     Notebook Ex: https://github.com/callahantiff/PheKnowLator/blob/master/notebooks/OWLNETS_Example_Application.ipynb
 
     Attributes:
-        graph: An RDFLib object or a list of RDFLib Graph objects.
+        graph: An RDFLib object or a list of RDFLib Graph objects. Graphs in a list can also be passed as paths to
+            N-Triples files (e.g. graphs spilled to disk by a KGBuilder MemoryBudget), which are only loaded when they
+            are decoded by runs_owlnets.
         write_location: A file path used for writing knowledge graph data (e.g. "resources/".
         filename: A string containing the filename for the full knowledge graph (e.g. "/hpo_owlnets").
         kg_construct_approach: A string containing the type of construction approach used to build the knowledge graph.
@@ -72,6 +78,13 @@ class OwlNets(object):
         graph (default list: ['IAO', 'SWO', 'OBI', 'UBPROP']).
         relations: A list of ontology namespaces that should not appear in any subject or object in the clean graph (
         default list ['RO']).
+        profiler: An optional BuildProfiler used to record resource usage for each OWL-NETS stage.
+        output_format: A string indicating whether the NetworkX MultiDiGraph of each OWL-NETS graph is only pickled
+            ("text") or also written as a memory-mappable CSR graph ("binary" or "both", see pkt_kg.utils.CSRGraph).
+        metrics: A MetricsPublisher used to publish entities decoded and triples emitted to a MetricsCollector.
+        graph_store: A string containing the store used for the graphs that OWL-NETS creates (i.e. the filtered and
+            combined graphs and graphs loaded from files): "memory" or "sqlite" (default="memory"). The "sqlite" store
+            writes the graphs to temporary SQLite databases in the write_location (see pkt_kg.utils.SQLiteStore).
 
     Raises:
         TypeError: If graph is not an rdflib.graph object.
@@ -83,11 +96,16 @@ class OwlNets(object):
     def __init__(self, graph: Union[Graph, List, str], write_location: str, filename: str,
                  kg_construct_approach: Optional[str] = None, owl_tools: str = './pkt_kg/libs/owltools',
                  top_level: Optional[List] = None, support: Optional[List] = None,
-                 relations: Optional[List] = None) -> None:
+                 relations: Optional[List] = None, profiler: Optional[BuildProfiler] = None,
+                 output_format: str = 'text', graph_store: str = 'memory') -> None:
 
         self.owl_tools = owl_tools
+        self.profiler: BuildProfiler = BuildProfiler() if profiler is None else profiler
+        self.output_format: str = output_format
+        self.graph_store: str = graph_store
         self.kg_construct_approach = kg_construct_approach
         self.write_location = write_location
+        self.metrics: MetricsPublisher = MetricsPublisher(self.write_location, 'OwlNets')
         self.res_dir = os.path.relpath('/'.join(self.write_location.split('/')[:-1]))
         self.filename = filename
         self.top_level: List = ['ISO', 'SUMO', 'BFO'] if top_level is None else top_level  # can only be in predicates
@@ -102,14 +120,24 @@ class OwlNets(object):
         elif isinstance(graph, str) and not os.path.exists(graph):
             logs = "Can't find graph file"; logger.error("OSError: " + logs); raise OSError(logs)
         else:
-            graph = graph if isinstance(graph, Graph) or isinstance(graph, List) else Graph().parse(graph)
+            graph = graph if isinstance(graph, Graph) or isinstance(graph, List) else self.creates_graph().parse(graph)
             self.graph_list: List = [graph] if not isinstance(graph, List) else graph
-        self.graph: Graph = self.graph_list[0]
+        self.graph: Graph = self.graph_list[0] if not isinstance(self.graph_list[0], str) else Graph()
 
         # OWL-NETS CLEANING DICTIONARY
+        self.decoded_graphs: Optional[List[Dict]] = None
+        self.graph_file: Optional[Tuple[str, int]] = None
         self.owl_nets_dict: Dict = {'decoded_entities': {}, 'cardinality': {}, 'misc': {}, 'complementOf': {},
                                     'negation': {}, 'disjointWith': set(), 'filtered_triples': set()}
 
+        # ANCESTOR INDEX -- shared by makes_graph_connected and purifies_graph_build
+        self.ancestor_index: Optional[AncestorIndex] = None
+
+    def creates_graph(self) -> Graph:
+        """Returns an empty RDFLib Graph using the graph_store (see pkt_kg.utils.creates_graph)."""
+
+        return creates_graph(self.graph_store, self.write_location)
+
     def gets_owlnets_dict(self) -> Dict:
         """Returns the owl_nets_dict dictionary."""
 
@@ -120,6 +148,45 @@ class OwlNets(object):
 
         return self.graph
 
+    def gets_owlnets_graph_file(self) -> Optional[Tuple[str, int]]:
+        """Returns the N-Triples file (and its triple count) that graph was written to by writes_owlnets_graph."""
+
+        return self.graph_file
+
+    def writes_owlnets_graph(self) -> None:
+        """Writes graph (e.g. the triples decoded by cleans_owl_encoded_entities) to an N-Triples file in the spill
+        directory of the write_location (see pkt_kg.memory.MemoryBudget) and releases it, so that only the path and
+        triple count of the file are returned to the driver. The BNode labels of the graph are kept in the file.
+
+        Returns:
+            None.
+        """
+
+        loc = self.write_location + spill_dir; os.makedirs(loc, exist_ok=True)
+        filepath = loc + '/OwlNets_{}.nt'.format(uuid.uuid4().hex)
+        with NTriplesWriter(filepath) as writer: writer.writes_triples(self.graph)
+        self.graph_file = (filepath, len(self.graph)); self.graph = Graph()
+
+        return None
+
+    def gets_ancestor_index(self, graph: Graph) -> AncestorIndex:
+        """Returns the rdfs:subClassOf AncestorIndex for graph, reusing the index built by an earlier OWL-NETS stage
+        when it was built for the same graph object. Stages that add or remove rdfs:subClassOf triples from the graph
+        keep the index current through its adds_edge and removes_edge methods.
+
+        Args:
+            graph: An RDFLib Graph object.
+
+        Returns:
+            An AncestorIndex object for graph.
+        """
+
+        if self.ancestor_index is None or self.ancestor_index.graph is not graph:
+            log_str = 'Indexing Ancestor Hierarchy'; print(log_str); logger.info(log_str)
+            self.ancestor_index = AncestorIndex(graph, RDFS.subClassOf)
+
+        return self.ancestor_index
+
     def removes_disjoint_with_axioms(self) -> None:
         """Removes owl:disjointWith axioms from an RDFLib Graph object.
 
@@ -185,7 +252,7 @@ class OwlNets(object):
                 else: filtered |= {x}
             else: filtered |= {x}
         if verbose: pbar.close()
-        filtered_graph = adds_edges_to_graph(Graph(), list(keep), False)
+        filtered_graph = adds_edges_to_graph(self.creates_graph(), list(keep), False)
 
         self.owl_nets_dict['filtered_triples'] |= filtered
 
@@ -220,7 +287,7 @@ class OwlNets(object):
                 else: filtered_triples |= {x}
             else: filtered_triples |= {x}
 
-        filtered_graph = adds_edges_to_graph(Graph(), list(keep_predicates), False)  # create a new graph from filtered
+        filtered_graph = adds_edges_to_graph(self.creates_graph(), list(keep_predicates), False)  # new filtered graph
         self.owl_nets_dict['filtered_triples'] |= filtered_triples
 
         return filtered_graph
@@ -613,6 +680,7 @@ class OwlNets(object):
         while node_list:
             # pbar.update(1)
             node = node_list.pop(0); node_info = self.creates_edge_dictionary(node)
+            self.metrics.increments(entities_decoded=1)
             if node_info is not None and len(node_info[1]) != 0:
                 self.captures_cardinality_axioms(node_info[2], node)
                 neg = True if self.detects_negation_axioms(node_info[1], node) is True else False
@@ -642,6 +710,7 @@ class OwlNets(object):
                     decoded_graph = adds_edges_to_graph(decoded_graph, list(cleaned_classes), False)
                     self.owl_nets_dict['decoded_entities'][n3(node)] = cleaned_classes
         self.graph = decoded_graph; self.graph = self.cleans_decoded_graph(verbose)  # ; pbar.close()
+        self.metrics.increments(triples_emitted=len(self.graph)); self.metrics.publishes()
 
         return None
 
@@ -668,12 +737,12 @@ class OwlNets(object):
             anc_node, roots = common_ancestor if isinstance(common_ancestor, URIRef) else URIRef(common_ancestor), set()
             nodes = set([x for x in tqdm(list(graph.subjects()) + list(graph.objects())) if isinstance(x, URIRef)])
 
-            print('Identifying root nodes')
+            print('Identifying root nodes'); index = self.gets_ancestor_index(graph)
             for x in tqdm(nodes):
-                ancs = gets_entity_ancestors(graph, [x], RDFS.subClassOf)
+                ancs = index.gets_ancestors(x)
                 if len(ancs) == 0:
-                    nbhd = set(graph.objects(x))
-                    ancs = [x for y in [gets_entity_ancestors(graph, [i], RDFS.subClassOf) for i in nbhd] for x in y]
+                    nbhd = sorted(set(graph.objects(x)))  # sorted so that ties are broken the same way every build
+                    ancs = [x for y in [index.gets_ancestors(i) for i in nbhd] for x in y]
                     if len(ancs) == 0: ancs = [x]
                     else:
                         try: ancs = [mode(ancs)]
@@ -684,6 +753,8 @@ class OwlNets(object):
             rel = RDF.type if self.kg_construct_approach == 'instance' else RDFS.subClassOf
             needed_triples = set((URIRef(x), rel, anc_node) for x in roots if x != anc_node)
             graph = adds_edges_to_graph(graph, needed_triples, False)
+            if rel == RDFS.subClassOf:
+                for s, p, o in needed_triples: index.adds_edge(s, o)
 
             logs = '{} triples added to make connected'.format(len(needed_triples)); logger.info(logs); print(logs)
 
@@ -706,14 +777,19 @@ class OwlNets(object):
         pure_rel = RDFS.subClassOf if org_rel == RDF.type else RDF.type
 
         log_str = 'Determining what triples need purification'; print(log_str); logger.info(log_str)
-        triples = list(graph.triples((None, org_rel, None)))
+        triples = sorted(graph.triples((None, org_rel, None)))  # sorted so that every build adds the same ancestors
 
         log_str = 'Processing {} {} triples'.format(len(triples), org_rel); print(log_str); logger.info(log_str)
+        index = self.gets_ancestor_index(graph)  # updated as subClassOf triples are added (subclass) or removed
         for edge in tqdm(triples):
             graph.add((edge[0], pure_rel, edge[2])); graph.remove(edge)
-            o_ancs = gets_entity_ancestors(graph, [edge[2]], RDFS.subClassOf, [edge[2]])
+            if pure_rel == RDFS.subClassOf: index.adds_edge(edge[0], edge[2])
+            else: index.removes_edge(edge[0], edge[2])
+            o_ancs = index.gets_ancestors(edge[2], include_self=True)
             ancs_filter = tuple([x for x in o_ancs if x.startswith('http') and URIRef(x) != edge[2]])
-            for node in ancs_filter: graph.add((edge[0], pure_rel, URIRef(node)))
+            for node in ancs_filter:
+                graph.add((edge[0], pure_rel, URIRef(node)))
+                if pure_rel == RDFS.subClassOf: index.adds_edge(edge[0], URIRef(node))
 
         return graph
 
@@ -748,28 +824,56 @@ class OwlNets(object):
         with open(self.write_location + f_name.strip('.nt') + '_decoding_dict.pkl', 'wb') as out:
             pickle.dump(self.owl_nets_dict, out)
         s = convert_to_networkx(self.write_location, f_name.strip('.nt'), graph, True)
+        if self.output_format in ['binary', 'both']: writes_csr_graph(self.write_location, f_name.strip('.nt'), graph)
         if s is not None: log_stats = '{}OWL-NETS {}'.format(personalize, s); logger.info(log_stats); print(log_stats)
 
         return None
 
-    def runs_owlnets(self, cpus: int = 1) -> Tuple:
-        """Method facilitates the parallel processing of OWL-NETS over a list of n RDFLib Graph objects.
+    def runs_owlnets(self, cpus: int = 1, executor: str = 'ray', decoded: Optional[Dict[int, Dict]] = None) -> Tuple:
+        """Method facilitates the parallel processing of OWL-NETS over a list of n RDFLib Graph objects. Each graph in
+        the list is decoded independently before the results are combined, made connected, and purified, so the
+        decoding results of a graph can be reused by a later run (e.g. by a KGBuilder update that only changed some of
+        the graphs in the list).
 
         Args:
             cpus: An integer representing the number of workers (default=1).
+            executor: A string containing the execution backend to use ("ray", "pool", or "serial"; default="ray").
+            decoded: An optional dictionary keyed by the position of a graph in the graph list containing the decoding
+                results of that graph from a previous run (see self.decoded_graphs). These graphs are not decoded
+                again and can be passed as empty placeholder graphs. When passed (even if empty), the decoding results
+                of every graph are kept in self.decoded_graphs.
 
         Return:
-            graph 1: A set of rdflib.Graph object triples.
-            graph 2: A set of rdflib.Graph object triples purified according to the kg_construct_approach.
+            graph 1: A set of rdflib.Graph object triples or, when the graph_store is not "memory", an RDFLib Graph
+                using the graph_store.
+            graph 2: A set of rdflib.Graph object triples purified according to the kg_construct_approach or, when
+                the graph_store is not "memory", an RDFLib Graph using the graph_store.
         """
 
         log_str = '*** Running OWL-NETS ***'; print('\n' + log_str); logger.info(log_str)
 
-        full_graph = Graph(); res2 = []
+        full_graph = self.creates_graph(); res2 = []; exe = gets_executor(executor, cpus); prof = self.profiler
         loc, f, cons, ot = self.write_location, self.filename, self.kg_construct_approach, self.owl_tools
-        for g in tqdm(self.graph_list):
+        decoded_graphs: List = []
+        for pos, g in enumerate(tqdm(self.graph_list)):
+            if decoded is not None and pos in decoded.keys():
+                res = decoded[pos]; full_graph = adds_edges_to_graph(full_graph, res['graph'], False)
+                self.owl_nets_dict['disjointWith'] |= res['disjointWith']; res2 += res['dicts']
+                self.owl_nets_dict['filtered_triples'] |= res['filtered_triples']
+                decoded_graphs += [res]; continue
+            g = loads_ntriples_graph(g, self.creates_graph()) if isinstance(g, str) else g  # loads spills one by one
+            disjoint, filtered = self.owl_nets_dict['disjointWith'], self.owl_nets_dict['filtered_triples']
+            self.owl_nets_dict['disjointWith'], self.owl_nets_dict['filtered_triples'] = set(), set()
+            res = {'graph': set(), 'dicts': []}; start = len(res2)
+            prof.starts_step('OWL-NETS: REMOVE DISJOINT WITH AXIOMS', 'owlnets', len(g))
             self.graph = g; self.removes_disjoint_with_axioms()
-            full_graph = adds_edges_to_graph(full_graph, self.removes_edges_with_owl_semantics(), False)
+            prof.stops_step('OWL-NETS: REMOVE DISJOINT WITH AXIOMS', len(self.graph))
+            prof.starts_step('OWL-NETS: REMOVE EDGES WITH OWL SEMANTICS', 'owlnets', len(self.graph))
+            filtered_graph = self.removes_edges_with_owl_semantics()
+            full_graph = adds_edges_to_graph(full_graph, filtered_graph, False)
+            if decoded is not None: res['graph'] |= set(filtered_graph)
+            prof.stops_step('OWL-NETS: REMOVE EDGES WITH OWL SEMANTICS', len(filtered_graph))
+            prof.starts_step('OWL-NETS: DECODE OWL-ENCODED CLASSES AND AXIOMS', 'owlnets', len(self.graph))
             owl_classes = list(gets_ontology_classes(self.graph)); owl_axioms = []
             for x in set(self.graph.subjects(RDF.type, OWL.Axiom)):
                 src = set(self.graph.objects(list(self.graph.objects(x, OWL.annotatedSource))[0], RDF.type))
@@ -780,19 +884,37 @@ class OwlNets(object):
             ents_to_decode = list(set(owl_classes) | set(owl_axioms)); shuffle(ents_to_decode)
             if len(ents_to_decode) > 0:
                 entities = [ents_to_decode[i::cpus] for i in range(cpus)]
-                try: ray.init()
-                except RuntimeError: pass
-                acts = [ray.remote(OwlNets).remote(self.graph, loc, f, cons, ot) for _ in range(cpus)]  # type: ignore
-                for i in range(0, cpus): acts[i % cpus].cleans_owl_encoded_entities.remote(entities[i])  # type: ignore
-                _ = ray.wait([x.gets_owlnets_graph.remote() for x in acts], num_returns=len(acts))
-                graph_res = ray.get([x.gets_owlnets_graph.remote() for x in acts])  # type: ignore
-                full_graph = adds_edges_to_graph(full_graph, set(x for y in set(graph_res) for x in y), False)
-                res2 += ray.get([x.gets_owlnets_dict.remote() for x in acts]); del acts  # type: ignore
-        conn_graph = self.makes_graph_connected(full_graph); graph1 = set(conn_graph).copy(); graph2 = None
+                tasks = [[('cleans_owl_encoded_entities', (entities[i],)), ('writes_owlnets_graph', ())]
+                         for i in range(cpus)]
+                graph_files, dicts = exe.runs_actors(OwlNets, (self.graph, loc, f, cons, ot),
+                                                     [() for _ in range(cpus)], tasks,
+                                                     ['gets_owlnets_graph_file', 'gets_owlnets_dict'])
+                for filepath, _ in graph_files:  # the decoded triples are streamed from the files the actors wrote
+                    full_graph = loads_ntriples_graph(filepath, full_graph)
+                    if decoded is not None: res['graph'] |= set(iterates_ntriples(filepath))
+                    os.remove(filepath)
+                res2 += dicts
+            prof.stops_step('OWL-NETS: DECODE OWL-ENCODED CLASSES AND AXIOMS', len(full_graph))
+            res['disjointWith'] = self.owl_nets_dict['disjointWith']; disjoint |= res['disjointWith']
+            res['filtered_triples'] = self.owl_nets_dict['filtered_triples']; filtered |= res['filtered_triples']
+            self.owl_nets_dict['disjointWith'], self.owl_nets_dict['filtered_triples'] = disjoint, filtered
+            if decoded is not None: res['dicts'] = res2[start:]; decoded_graphs += [res]
+        if os.path.isdir(loc + spill_dir) and len(os.listdir(loc + spill_dir)) == 0: os.rmdir(loc + spill_dir)
+        self.decoded_graphs = None if decoded is None else decoded_graphs
+        prof.starts_step('OWL-NETS: MAKE GRAPH CONNECTED', 'owlnets', len(full_graph))
+        conn_graph = self.makes_graph_connected(full_graph); in_memory = self.graph_store == 'memory'
+        graph1 = set(conn_graph) if in_memory else conn_graph; graph2 = None
+        prof.stops_step('OWL-NETS: MAKE GRAPH CONNECTED', len(graph1))
+        prof.starts_step('OWL-NETS: WRITE RESULTS', 'owlnets', len(graph1))
         g1 = derives_graph_statistics(graph1); g2 = 'None'; self.write_out_results(graph1)
+        prof.stops_step('OWL-NETS: WRITE RESULTS', len(graph1))
         if self.kg_construct_approach is not None:
-            graph2 = set(self.purifies_graph_build(conn_graph)); g2 = derives_graph_statistics(graph2)
+            prof.starts_step('OWL-NETS: PURIFY GRAPH', 'owlnets', len(conn_graph))
+            graph = conn_graph if in_memory else adds_edges_to_graph(self.creates_graph(), conn_graph, False)
+            graph2 = set(self.purifies_graph_build(graph)) if in_memory else self.purifies_graph_build(graph)
+            g2 = derives_graph_statistics(graph2); del graph, conn_graph
             self.write_out_results(graph2, self.kg_construct_approach)
+            prof.stops_step('OWL-NETS: PURIFY GRAPH', len(graph2))
         stats = '\n\nOWL-NETS {};\nPurified OWL-NETS {}'.format(g1, g2); print(stats); logger.info(stats)
 
         # process owl decoding results
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# import needed libraries
+import glob
+import json
+import logging.config
+import os
+import psutil  # type: ignore
+import sys
+import time
+import weakref
+
+from typing import Dict, List, Optional
+
+try: import resource
+except ImportError: resource = None  # type: ignore
+
+# logging
+log_dir, log, log_config = 'builds/logs', 'pkt_build_log.log', glob.glob('**/logging.ini', recursive=True)
+try:
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+except FileNotFoundError:
+    log_dir, log_config = '../builds/logs', glob.glob('../builds/logging.ini', recursive=True)
+    if not os.path.exists(log_dir): os.mkdir(log_dir)
+logger = logging.getLogger(__name__)
+logging.config.fileConfig(log_config[0], disable_existing_loggers=False, defaults={'log_file': log_dir + '/' + log})
+
+
+class BuildProfiler(object):
+    """Class records resource usage for the steps of a knowledge graph build (i.e. each numbered KGBuilder build
+    step, each OWL-NETS stage, and each CreatesEdgeList edge type). For each step the profiler records the wall time,
+    CPU time (including that of reaped child processes, e.g. owltools and process pool workers), resident set size
+    at the start and end of the step, the peak resident set size reached during the step, and optional input and
+    output triple counts. Records are written as JSON and optionally as a Chrome trace file, which can be opened with
+    chrome://tracing or https://ui.perfetto.dev.
+
+    On linux, the peak resident set size of each step is measured by resetting the kernel's high-water mark (VmHWM)
+    each time a step starts or stops and folding the mark read at that moment into the peak of every active step, so
+    nested steps each get the peak reached while they ran. Marks are folded into the active steps of every profiler in
+    the process, so profilers that run at the same time (e.g. a KGBuilder's and a CreatesEdgeList's) do not reset each
+    other's peaks. Where the mark cannot be reset (e.g. macOS), a step's peak is the process peak if it rose during the
+    step, otherwise the larger of the step's start and end resident set size.
+
+    Attributes:
+        trace: A bool indicating whether or not a Chrome trace file should be written with the JSON output.
+        resettable: A bool indicating whether or not the process's peak resident set size can be reset.
+    """
+
+    _profilers: weakref.WeakSet = weakref.WeakSet()
+
+    def __init__(self, trace: bool = False) -> None:
+
+        self.trace: bool = trace
+        self.records: List[Dict] = []
+        self.active: Dict[str, Dict] = dict()
+        self.resettable: bool = self.resets_peak_rss()
+
+    @staticmethod
+    def gets_resource_usage() -> Dict:
+        """Returns the current wall time, CPU time, resident set size, and peak resident set size of the process. On
+        linux, the peak is the kernel's high-water mark (VmHWM), which covers the time since it was last reset with
+        resets_peak_rss.
+
+        Returns:
+            A dictionary of resource usage, for example: {'wall': 1612311242.1, 'cpu': 12.2, 'rss': 1048576,
+                'peak_rss': 2097152}. Memory values are in bytes and times are in seconds.
+        """
+
+        t = os.times(); rss = psutil.Process(os.getpid()).memory_info().rss; peak = None
+        try:
+            with open('/proc/self/status') as status: hwm = [x.split()[1] for x in status if x.startswith('VmHWM:')]
+            if len(hwm) > 0: peak = int(hwm[0]) * 1024
+        except OSError: pass
+        if peak is None and resource is not None:  # ru_maxrss is reported in kilobytes on linux and bytes on macOS
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+        return {'wall': time.time(), 'cpu': t[0] + t[1] + t[2] + t[3], 'rss': rss, 'peak_rss': max(rss, peak or 0)}
+
+    @staticmethod
+    def resets_peak_rss() -> bool:
+        """Resets the kernel's high-water mark of the process's resident set size (VmHWM) to the current resident set
+        size by writing "5" to /proc/self/clear_refs.
+
+        Returns:
+            A bool indicating whether or not the high-water mark was reset (i.e. False when not running on linux).
+        """
+
+        try:
+            with open('/proc/self/clear_refs', 'w') as clear_refs: clear_refs.write('5')
+            return True
+        except OSError: return False
+
+    def _updates_peaks(self) -> Dict:
+        """Reads the current resource usage, folds the process peak resident set size into the peak of every active
+        step of every profiler in the process, and then resets the process peak so that the next read only covers the
+        memory used from now on.
+
+        Returns:
+            A dictionary of resource usage (see gets_resource_usage) that also contains the peak resident set size of
+            the largest reaped child process ('child_peak_rss').
+        """
+
+        usage = self.gets_resource_usage(); usage['child_peak_rss'] = 0
+        if resource is not None:  # the largest reaped child process (e.g. owltools) over the life of the process
+            scale = 1 if sys.platform == 'darwin' else 1024
+            usage['child_peak_rss'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+        if self.resettable:
+            BuildProfiler._profilers.add(self)
+            for step in [x for y in BuildProfiler._profilers for x in y.active.values()]:
+                step['peak_rss'] = max(step['peak_rss'], usage['peak_rss'])
+            self.resettable = self.resets_peak_rss()
+
+        return usage
+
+    def starts_step(self, name: str, category: str = 'build', triples_in: Optional[int] = None) -> None:
+        """Starts recording a build step.
+
+        Args:
+            name: A string containing the name of the step (e.g. "STEP 2: MERGE ONTOLOGIES").
+            category: A string containing the type of step (e.g. "build", "owlnets", or "edge_list").
+            triples_in: An optional integer containing the number of triples input to the step.
+
+        Returns:
+            None.
+        """
+
+        usage = self._updates_peaks()
+        self.active[name] = {'name': name, 'category': category, 'pid': os.getpid(), 'triples_in': triples_in,
+                             'start': usage, 'peak_rss': usage['rss']}
+
+        return None
+
+    def stops_step(self, name: str, triples_out: Optional[int] = None,
+                   triples_in: Optional[int] = None) -> Optional[Dict]:
+        """Stops recording a build step and stores the step's resource usage.
+
+        Args:
+            name: A string containing the name of a step that was started with starts_step.
+            triples_out: An optional integer containing the number of triples output by the step.
+            triples_in: An optional integer containing the number of triples input to the step, which is used when
+                the input size is not known when the step is started (e.g. rows of a file read by the step).
+
+        Returns:
+            record: A dictionary containing the resource usage of the step or None if the step was never started.
+        """
+
+        if name not in self.active.keys(): logger.warning('Profiled step "{}" was never started'.format(name))
+        else:
+            end = self._updates_peaks(); step = self.active.pop(name); start = step['start']
+            if self.resettable: peak = step['peak_rss']
+            elif end['peak_rss'] > start['peak_rss']: peak = end['peak_rss']
+            else: peak = max(start['rss'], end['rss'])
+            if end['child_peak_rss'] > start['child_peak_rss']: peak = max(peak, end['child_peak_rss'])
+            record = {'name': name, 'category': step['category'], 'pid': step['pid'], 'start_time': start['wall'],
+                      'wall_time': end['wall'] - start['wall'], 'cpu_time': end['cpu'] - start['cpu'],
+                      'rss_start': start['rss'], 'rss_end': end['rss'], 'peak_rss': peak,
+                      'triples_in': step['triples_in'] if triples_in is None else triples_in,
+                      'triples_out': triples_out}
+            self.records.append(record)
+            logger.info('PROFILE - {}: {:.2f}s wall, {:.2f}s cpu, {:.1f} MB peak RSS'.format(
+                name, record['wall_time'], record['cpu_time'], record['peak_rss'] / 1048576))
+
+            return record
+
+        return None
+
+    def gets_records(self) -> List[Dict]:
+        """Returns the list of recorded steps."""
+
+        return self.records
+
+    def adds_records(self, records: List[Dict]) -> None:
+        """Adds records from another profiler (e.g. one held by a parallel actor) to the profiler's records.
+
+        Args:
+            records: A list of record dictionaries.
+
+        Returns:
+            None.
+        """
+
+        self.records += records
+
+        return None
+
+    def writes_profile(self, filepath: str) -> None:
+        """Writes the recorded steps to a JSON file and, if trace is True, writes a Chrome trace file with the same
+        name as the JSON file ending in "_Trace.json".
+
+        Args:
+            filepath: A string containing the path to write the JSON profile to.
+
+        Returns:
+            None.
+        """
+
+        records = sorted(self.records, key=lambda x: x['start_time'])
+        with open(filepath, 'w') as out: json.dump({'steps': records}, out, indent=2)
+        logger.info('Wrote build profile to {}'.format(filepath))
+        if self.trace:
+            events = [{'name': x['name'], 'cat': x['category'], 'ph': 'X', 'pid': x['pid'], 'tid': 0,
+                       'ts': int(x['start_time'] * 1e6), 'dur': int(x['wall_time'] * 1e6),
+                       'args': {k: v for k, v in x.items() if k not in ['name', 'category', 'pid', 'start_time']}}
+                      for x in records]
+            trace_file = filepath[:-5] + '_Trace.json' if filepath.endswith('.json') else filepath + '_Trace.json'
+            with open(trace_file, 'w') as out: json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, out)
+            logger.info('Wrote build profile trace to {}'.format(trace_file))
+
+        return None
@@ -4,6 +4,10 @@
 
 from .data_utils import *
 from .kg_utils import *
+from .graph_store import copies_graph_store, creates_graph, SQLiteStore
+from .ntriples import encodes_term, NTriplesReader, NTriplesWriter
+from .triple_store import (converts_rdf_to_ntriples, CSRGraph, IdentifierMap, IntegerTripleStore, iterates_ntriples,
+                           loads_ntriples_graph, rewrites_ntriples_bnodes, writes_csr_graph, writes_identifier_map)
 
 
 __all__ = ['url_download', 'ftp_url_download', 'gzipped_ftp_url_download', 'zipped_url_download',
@@ -15,4 +19,12 @@ __all__ = ['url_download', 'ftp_url_download', 'gzipped_ftp_url_download', 'zipp
            'connected_components', 'removes_self_loops', 'derives_graph_statistics', 'splits_knowledge_graph',
            'adds_namespace_to_bnodes', 'removes_namespace_from_bnodes', 'updates_pkt_namespace_identifiers',
            'finds_node_type', 'updates_graph_namespace', 'maps_ids_to_integers', 'n3', 'appends_to_existing_file',
-           'deduplicates_file', 'merges_files', 'convert_to_networkx', 'sublist_creator', 'gets_ontology_definitions']
+           'deduplicates_file', 'merges_files', 'convert_to_networkx', 'sublist_creator', 'gets_ontology_definitions',
+           'gets_file_hash', 'loads_graph_snapshot', 'derives_ntriples_statistics', 'merges_sorted_files',
+           'creates_edge_batches', 'converts_rdf_to_ntriples', 'IntegerTripleStore',
+           'loads_split_snapshot', 'loads_ntriples_graph', 'finds_annotation_assertions',
+           'rewrites_bnode_namespace', 'iterates_ntriples', 'rewrites_ntriples_bnodes',
+           'writes_identifier_map', 'IdentifierMap', 'writes_csr_graph', 'CSRGraph',
+           'finds_connected_components', 'walks_entity_ancestors', 'AncestorIndex',
+           'encodes_term', 'NTriplesReader', 'NTriplesWriter', 'remaps_pkt_namespace_identifiers',
+           'AnnotationIndex', 'SQLiteStore', 'creates_graph', 'copies_graph_store']
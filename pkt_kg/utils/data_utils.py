@@ -20,9 +20,11 @@ Generates Metadata
 Miscellaneous data Processing Methods
 * explodes_data
 * genomic_id_mapper
+* merges_sorted_files
 * deduplicates_file
 * merges_files
 * sublist_creator
+* creates_edge_batches
 
 Outputs data
 * outputs_dictionary_data
@@ -39,6 +41,7 @@ import pandas as pd  # type: ignore
 import re
 import requests
 import shutil
+import tempfile
 import urllib3  # type: ignore
 
 from contextlib import closing
@@ -408,30 +411,70 @@ def outputs_dictionary_data(dict_object: Optional[Dict], filename: str) -> None:
     return None
 
 
-def deduplicates_file(src_filepath: str) -> None:
-    """Removes duplicates from a file.
+def merges_sorted_files(filepaths: List[str], merged_filepath: str) -> None:
+    """Merges several sorted files into a single sorted file with a k-way merge, keeping only one copy of each line.
+    Only one line per input file is held in memory at a time. Lines that do not end in a newline (e.g. the last line
+    of a file) are normalized to end in one and blank lines are removed. If the input files are not sorted, all of
+    their unique lines are still written, but the output is only guaranteed to be duplicate-free and sorted when the
+    inputs are sorted.
 
     Args:
-        src_filepath: A string specifying a path to an existing file.
+        filepaths: A list of strings specifying paths to existing sorted files.
+        merged_filepath: A string specifying the file name for the merged files (can be one of the input files).
 
     Returns:
          None.
     """
 
-    print('Depduplicating File: {}'.format(src_filepath))
+    files = [open(x, 'r') for x in filepaths]; last = None
+    try:
+        with open(merged_filepath + '.tmp', 'w') as out:
+            lines = [(x if x.endswith('\n') else x + '\n' for x in f if x.strip() != '') for f in files]
+            for line in heapq.merge(*lines):
+                if line != last: out.write(line); last = line
+    finally:
+        for f in files: f.close()
+    os.replace(merged_filepath + '.tmp', merged_filepath)
+
+    return None
+
+
+def deduplicates_file(src_filepath: str, run_size: int = 2 ** 27, temp_directory: Optional[str] = None) -> None:
+    """Removes duplicates from a file using an external merge sort, so that memory use is bounded by run_size and
+    not by the size of the file. The file is read in runs of approximately run_size bytes, each run is sorted,
+    deduplicated, and written to a temporary file, and the runs are then merged with merges_sorted_files. The
+    deduplicated file is sorted, which makes the output deterministic.
+
+    Args:
+        src_filepath: A string specifying a path to an existing file.
+        run_size: An integer specifying the approximate number of bytes to sort in memory at a time (default=128MB).
+        temp_directory: A string specifying where to write the sorted runs (default is the directory of the file).
+
+    Returns:
+         None.
+    """
 
-    lines = list(set(open(src_filepath, 'r').readlines())); pbar = tqdm(total=len(lines))
-    with open(src_filepath, 'w') as f:
-        while len(lines) > 0:
-            x = lines.pop(); pbar.update()
-            f.write(x) if x.endswith('\n') else f.write(x + '\n')
-        pbar.close()
+    print('Deduplicating File: {}'.format(src_filepath))
+
+    temp_directory = os.path.dirname(os.path.abspath(src_filepath)) if temp_directory is None else temp_directory
+    run_dir = tempfile.mkdtemp(prefix='.pkt_sort_', dir=temp_directory); runs: List = []
+    try:
+        with open(src_filepath, 'r') as f:
+            lines = f.readlines(run_size)
+            while lines:
+                runs += [run_dir + '/run_{}.txt'.format(len(runs))]
+                with open(runs[-1], 'w') as out:
+                    out.writelines(sorted(set(x if x.endswith('\n') else x + '\n' for x in lines)))
+                lines = f.readlines(run_size)
+        merges_sorted_files(runs, src_filepath)
+    finally: shutil.rmtree(run_dir, ignore_errors=True)
 
     return None
 
 
 def merges_files(filepath1: str, filepath2: str, merged_filepath: str) -> None:
-    """Merges two files together.
+    """Merges two files together. The files are merged with merges_sorted_files, so if both files are sorted (e.g.
+    after deduplicates_file) the merged file is sorted and contains no duplicates.
 
     Args:
         filepath1: A string specifying a path to an existing file.
@@ -444,7 +487,7 @@ def merges_files(filepath1: str, filepath2: str, merged_filepath: str) -> None:
 
     print('Merging Files: {} and {}'.format(filepath1, filepath2))
 
-    os.system('( cat {} ; echo ''; cat {} ) > {}'.format(filepath1, filepath2, merged_filepath))
+    merges_sorted_files([filepath1, filepath2], merged_filepath)
 
     return None
 
@@ -473,8 +516,43 @@ def sublist_creator(actors: Union[Dict, List], chunk_size: int) -> List:
     if isinstance(actors, Dict):
         updated_lists = []; used_ids = set()
         for sub in lists:
-            sub_list = [[k for k, v in actors.items() if v == x and k not in used_ids][0] for x in sub]
-            updated_lists += [sub_list]; used_ids |= set(x for y in sub_list for x in y)
+            sub_list = []
+            for x in sub:
+                key = [k for k, v in actors.items() if v == x and k not in used_ids][0]
+                sub_list += [key]; used_ids |= {key}
+            updated_lists += [sub_list]
     else: updated_lists = lists
 
     return updated_lists
+
+
+def creates_edge_batches(edge_counts: Dict, chunk_size: int) -> List:
+    """Balances edge types across chunk_size sublists by edge count. Unlike sublist_creator, an edge type with more
+    edges than the average load of a sublist is split into contiguous batches of its edge list (at most one batch per
+    sublist), so that a single very large edge type (e.g. gene-gene) can be processed by several workers at once.
+    Batches of the same edge type are never placed in the same sublist.
+
+    Args:
+        edge_counts: A dictionary keyed by edge type with the length of each associated edge list stored as values.
+        chunk_size: An integer specifying the number of sublists that should be returned.
+
+    Returns:
+         lists: A list of chunk_size lists, each containing tuples of an edge type and the start and stop indices of
+            the batch of its edge list, for example: [[('gene-gene', 0, 5000)], [('gene-gene', 5000, 9000), ...]].
+    """
+
+    total = sum(edge_counts.values()); target = max(1, -(-total // chunk_size)); tasks: List = []
+    for k, v in edge_counts.items():
+        if v <= target: tasks += [(k, 0, v)]
+        else:
+            size = -(-v // min(chunk_size, -(-v // target)))
+            tasks += [(k, i, min(i + size, v)) for i in range(0, v, size)]
+    lists: List = [[] for _ in range(chunk_size)]; totals = [(0, i) for i in range(chunk_size)]; heapq.heapify(totals)
+    for task in sorted(tasks, key=lambda x: (-(x[2] - x[1]), x[0], x[1])):
+        total, index = heapq.heappop(totals); skipped = []
+        while any(x[0] == task[0] for x in lists[index]):  # never put two batches of an edge type in the same list
+            skipped += [(total, index)]; total, index = heapq.heappop(totals)
+        lists[index] += [task]; heapq.heappush(totals, (total + task[2] - task[1], index))
+        for x in skipped: heapq.heappush(totals, x)
+
+    return lists
@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Disk-Backed Graph Store Utility Functions.
+
+Stores RDFLib Graphs in SQLite
+* SQLiteStore
+
+Creates RDFLib Graphs
+* creates_graph
+* copies_graph_store
+"""
+
+# import needed libraries
+import os
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import weakref
+
+from rdflib import BNode, Graph, Literal, URIRef  # type: ignore
+from rdflib.plugin import register  # type: ignore
+from rdflib.store import Store, VALID_STORE  # type: ignore
+from typing import Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+# set global attributes
+graph_stores = ['memory', 'sqlite']
+_sep = '\x1f'  # separates the language, datatype, and lexical form of an encoded Literal
+
+
+def _removes_database(connection: sqlite3.Connection, filepath: Optional[str]) -> None:
+    """Closes a database connection and removes the database file when filepath is not None."""
+
+    connection.close()
+    if filepath is not None and os.path.exists(filepath): os.remove(filepath)
+
+    return None
+
+
+class SQLiteStore(Store):
+    """Class implements an RDFLib Store that keeps the triples of a Graph in an embedded SQLite database instead of in
+    memory, so that Graph(store=SQLiteStore(filepath)) can be used anywhere an in-memory Graph is used. Each distinct
+    term is stored once in a terms table and the triples table holds the integer ids of the subject, predicate, and
+    object of each triple. The triples table is keyed by (s, p, o) and has two covering indexes on (p, o, s) and (o,
+    s, p), so every triple pattern is answered from an index without reading the triples themselves. Recently used
+    term ids are cached and the SQLite page cache is capped at cache_size, so the memory used by the store does not
+    grow with the size of the graph.
+
+    The store is not context-aware (i.e. it holds a single graph, like the default RDFLib Memory store). Changes are
+    committed by commit, close, and when the store is pickled. A pickled store is reopened from the same database file
+    (e.g. by the OWL-NETS actors), so a store should only be written to by a single process at a time.
+
+    Attributes:
+        filepath: A string containing the path to the SQLite database file.
+        temporary: A bool indicating whether the database file is removed when the store is closed or freed.
+        cache_size: An integer containing the number of term ids to cache and the size of the SQLite page cache in
+            kibibytes (default=2 ** 16).
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier: Optional[str] = None,
+                 temporary: bool = False, cache_size: int = 2 ** 16) -> None:
+
+        self.filepath: Optional[str] = None; self.temporary: bool = temporary; self.cache_size: int = cache_size
+        self._connection: Optional[sqlite3.Connection] = None; self._finalizer: Optional[weakref.finalize] = None
+        self._ids: Dict = dict(); self._terms: Dict = dict(); self._length: int = 0
+        self._namespaces: Dict = dict(); self._prefixes: Dict = dict()
+        super(SQLiteStore, self).__init__(configuration, identifier)
+
+    def __reduce__(self) -> Tuple:
+
+        self.commit()
+
+        return self.__class__, (self.filepath, None, False, self.cache_size)
+
+    def open(self, configuration: str, create: bool = True) -> int:
+        """Opens the SQLite database at configuration, creating the database when it does not exist.
+
+        Args:
+            configuration: A string containing the path to a SQLite database file.
+            create: A bool indicating whether the tables should be created if they do not exist (default=True).
+
+        Returns:
+            VALID_STORE.
+        """
+
+        self.filepath = configuration; self._connection = sqlite3.connect(configuration)
+        self._finalizer = weakref.finalize(self, _removes_database, self._connection,
+                                           configuration if self.temporary else None)
+        cur = self._connection.cursor()
+        for x in ['PRAGMA journal_mode=MEMORY', 'PRAGMA synchronous=OFF', 'PRAGMA temp_store=FILE',
+                  'PRAGMA cache_size=-{}'.format(self.cache_size)]: cur.execute(x)
+        if create:
+            cur.execute('CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE)')
+            cur.execute('CREATE TABLE IF NOT EXISTS triples (s INTEGER NOT NULL, p INTEGER NOT NULL, '
+                        'o INTEGER NOT NULL, PRIMARY KEY (s, p, o)) WITHOUT ROWID')
+            cur.execute('CREATE INDEX IF NOT EXISTS pos ON triples (p, o, s)')
+            cur.execute('CREATE INDEX IF NOT EXISTS osp ON triples (o, s, p)')
+            cur.execute('CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, namespace TEXT NOT NULL)')
+            self._connection.commit()
+        self._length = cur.execute('SELECT COUNT(*) FROM triples').fetchone()[0]
+        for prefix, namespace in cur.execute('SELECT prefix, namespace FROM namespaces'):
+            self._namespaces[prefix] = URIRef(namespace); self._prefixes[URIRef(namespace)] = prefix
+
+        return VALID_STORE
+
+    def commit(self) -> None:
+        """Commits the pending changes to the database."""
+
+        if self._connection is not None: self._connection.commit()
+
+        return None
+
+    def rollback(self) -> None:
+        """Discards the changes made since the last commit."""
+
+        if self._connection is not None:
+            self._connection.rollback(); self._ids.clear(); self._terms.clear()
+            self._length = self._connection.execute('SELECT COUNT(*) FROM triples').fetchone()[0]
+
+        return None
+
+    def close(self, commit_pending_transaction: bool = True) -> None:
+        """Closes the database, removing the database file if the store is temporary.
+
+        Args:
+            commit_pending_transaction: A bool indicating whether to commit the pending changes (default=True).
+
+        Returns:
+            None.
+        """
+
+        if self._connection is not None:
+            if commit_pending_transaction and not self.temporary: self._connection.commit()
+            self._finalizer(); self._connection = None  # type: ignore
+
+        return None
+
+    def destroy(self, configuration: str) -> None:
+        """Closes the store and removes the database file at configuration."""
+
+        self.close(False)
+        if os.path.exists(configuration): os.remove(configuration)
+
+        return None
+
+    @staticmethod
+    def encodes_term(term: Union[URIRef, BNode, Literal]) -> str:
+        """Encodes an RDFLib term as the string stored in the terms table.
+
+        Args:
+            term: An RDFLib URIRef, BNode, or Literal object.
+
+        Returns:
+            A string containing the type of the term followed by its contents.
+
+        Raises:
+            TypeError: If term is not a URIRef, BNode, or Literal.
+        """
+
+        if isinstance(term, URIRef): return 'U' + str(term)
+        elif isinstance(term, BNode): return 'B' + str(term)
+        elif isinstance(term, Literal):
+            return 'L' + (term.language or '') + _sep + (term.datatype or '') + _sep + str(term)
+        else: raise TypeError('{} is not a URIRef, BNode, or Literal'.format(repr(term)))
+
+    @staticmethod
+    def decodes_term(encoded: str) -> Union[URIRef, BNode, Literal]:
+        """Decodes a string from the terms table into an RDFLib term (see encodes_term).
+
+        Args:
+            encoded: A string containing an encoded term.
+
+        Returns:
+            An RDFLib URIRef, BNode, or Literal object.
+        """
+
+        if encoded[0] == 'U': return URIRef(encoded[1:])
+        elif encoded[0] == 'B': return BNode(encoded[1:])
+        else:
+            lang, dtype, lexical = encoded[1:].split(_sep, 2)
+            return Literal(lexical, lang=lang or None, datatype=URIRef(dtype) if dtype else None)
+
+    def _caches(self, term: Union[URIRef, BNode, Literal], i: int) -> None:
+        """Adds a term and its id to the term caches, clearing the caches when they are full."""
+
+        if len(self._ids) >= self.cache_size: self._ids.clear(); self._terms.clear()
+        self._ids[term] = i; self._terms[i] = term
+
+        return None
+
+    def _gets_id(self, term: Union[URIRef, BNode, Literal], create: bool = False) -> Optional[int]:
+        """Returns the id of a term, adding the term to the terms table when create is True.
+
+        Args:
+            term: An RDFLib URIRef, BNode, or Literal object.
+            create: A bool indicating whether to add the term if it is not in the terms table (default=False).
+
+        Returns:
+            An integer id or None if the term is not in the terms table and create is False.
+        """
+
+        i = self._ids.get(term)
+        if i is None:
+            encoded = self.encodes_term(term)
+            row = self._connection.execute('SELECT id FROM terms WHERE term = ?', (encoded,)).fetchone()
+            if row is not None: i = row[0]
+            elif create: i = self._connection.execute('INSERT INTO terms (term) VALUES (?)', (encoded,)).lastrowid
+            else: return None
+            self._caches(term, i)
+
+        return i
+
+    def _gets_term(self, i: int, encoded: Optional[str] = None) -> Union[URIRef, BNode, Literal]:
+        """Returns the term with id i, decoding encoded (or the encoded term read from the terms table)."""
+
+        term = self._terms.get(i)
+        if term is None:
+            if encoded is None:
+                encoded = self._connection.execute('SELECT term FROM terms WHERE id = ?', (i,)).fetchone()[0]
+            term = self.decodes_term(encoded); self._caches(term, i)
+
+        return term
+
+    def _finds_pattern(self, triple_pattern: Tuple) -> Optional[Tuple[str, List]]:
+        """Converts a triple pattern into a SQL WHERE clause and its parameters.
+
+        Args:
+            triple_pattern: A tuple containing a subject, predicate, and object, where None matches any term.
+
+        Returns:
+            A tuple containing the WHERE clause and a list of ids or None when a term in the pattern is not in the
+            store (i.e. nothing matches the pattern).
+        """
+
+        clause, params = [], []
+        for col, term in zip(['s', 'p', 'o'], triple_pattern):
+            if term is not None:
+                i = self._gets_id(term)
+                if i is None: return None
+                clause += ['t.{} = ?'.format(col)]; params += [i]
+
+        return (' WHERE ' + ' AND '.join(clause) if len(clause) > 0 else ''), params
+
+    def add(self, triple: Tuple, context: Optional[Graph] = None, quoted: bool = False) -> None:
+        """Adds a triple to the store.
+
+        Args:
+            triple: A tuple containing an RDFLib subject, predicate, and object.
+            context: The Graph the triple is added to (ignored, the store holds a single graph).
+            quoted: A bool indicating whether the triple is quoted (not supported, default=False).
+
+        Returns:
+            None.
+        """
+
+        Store.add(self, triple, context, quoted)
+        ids = tuple(self._gets_id(x, True) for x in triple)
+        self._length += self._connection.execute('INSERT OR IGNORE INTO triples VALUES (?, ?, ?)', ids).rowcount
+
+        return None
+
+    def addN(self, quads: Iterable, chunk_size: int = 100000) -> None:
+        """Adds quads (i.e. subject, predicate, object, and context tuples) to the store in batches.
+
+        Args:
+            quads: An iterable of tuples containing an RDFLib subject, predicate, object, and context.
+            chunk_size: An integer containing the number of triples to insert at a time (default=100000).
+
+        Returns:
+            None.
+        """
+
+        gets_id, rows = self._gets_id, []
+        for s, p, o, c in quads:
+            rows.append((gets_id(s, True), gets_id(p, True), gets_id(o, True)))
+            if len(rows) >= chunk_size: self._inserts(rows); rows = []
+        if len(rows) > 0: self._inserts(rows)
+
+        return None
+
+    def _inserts(self, rows: List[Tuple[int, int, int]]) -> None:
+        """Inserts rows of integer triples into the triples table."""
+
+        self._length += self._connection.executemany('INSERT OR IGNORE INTO triples VALUES (?, ?, ?)', rows).rowcount
+
+        return None
+
+    def remove(self, triple_pattern: Tuple, context: Optional[Graph] = None) -> None:
+        """Removes the triples matching a triple pattern from the store.
+
+        Args:
+            triple_pattern: A tuple containing a subject, predicate, and object, where None matches any term.
+            context: The Graph the triples are removed from (ignored, the store holds a single graph).
+
+        Returns:
+            None.
+        """
+
+        Store.remove(self, triple_pattern, context)
+        pattern = self._finds_pattern(triple_pattern)
+        if pattern is not None:
+            where = pattern[0].replace('t.', '')
+            self._length -= self._connection.execute('DELETE FROM triples' + where, pattern[1]).rowcount
+
+        return None
+
+    def triples(self, triple_pattern: Tuple, context: Optional[Graph] = None,
+                chunk_size: int = 10000) -> Generator:
+        """Streams the triples matching a triple pattern from the store.
+
+        Args:
+            triple_pattern: A tuple containing a subject, predicate, and object, where None matches any term.
+            context: The Graph being queried (ignored, the store holds a single graph).
+            chunk_size: An integer containing the number of rows to fetch at a time (default=10000).
+
+        Returns:
+            A generator of tuples, where each tuple contains a triple and an (empty) iterator of its contexts.
+        """
+
+        pattern = self._finds_pattern(triple_pattern)
+        if pattern is None: return
+        joins = ''.join(' JOIN terms {0}t ON {0}t.id = t.{0}'.format(x) for x, y in zip('spo', triple_pattern)
+                        if y is None)
+        cols = ', '.join('t.{0}, {0}t.term'.format(x) if y is None else 't.{}, NULL'.format(x)
+                         for x, y in zip('spo', triple_pattern))
+        cur = self._connection.execute('SELECT ' + cols + ' FROM triples t' + joins + pattern[0], pattern[1])
+        gets_term = self._gets_term
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if len(rows) == 0: break
+            for row in rows:
+                triple = (triple_pattern[0] if row[1] is None else gets_term(row[0], row[1]),
+                          triple_pattern[1] if row[3] is None else gets_term(row[2], row[3]),
+                          triple_pattern[2] if row[5] is None else gets_term(row[4], row[5]))
+                yield triple, iter(())
+
+    def __len__(self, context: Optional[Graph] = None) -> int:
+
+        return self._length
+
+    def contexts(self, triple: Optional[Tuple] = None) -> Generator:
+        """Returns an empty generator, the store is not context-aware."""
+
+        return (x for x in ())
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        """Binds a prefix to a namespace, following the same rules as the RDFLib Memory store.
+
+        Args:
+            prefix: A string containing a namespace prefix.
+            namespace: An RDFLib URIRef containing a namespace.
+            override: A bool indicating whether to replace the existing bindings of prefix and namespace.
+
+        Returns:
+            None.
+        """
+
+        bound_namespace = self._namespaces.get(prefix)
+        bound_prefix = self._prefixes.get(namespace, self._prefixes.get(bound_namespace))
+        if override:
+            if bound_prefix is not None: self._namespaces.pop(bound_prefix, None)
+            if bound_namespace is not None: self._prefixes.pop(bound_namespace, None)
+            self._prefixes[namespace] = prefix; self._namespaces[prefix] = namespace
+        else:
+            self._prefixes[bound_namespace if bound_namespace is not None else namespace] = \
+                bound_prefix if bound_prefix is not None else prefix
+            self._namespaces[bound_prefix if bound_prefix is not None else prefix] = \
+                bound_namespace if bound_namespace is not None else namespace
+        self._connection.execute('DELETE FROM namespaces')
+        self._connection.executemany('INSERT INTO namespaces VALUES (?, ?)',
+                                     [(k, str(v)) for k, v in self._namespaces.items()])
+
+        return None
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+
+        return self._namespaces.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+
+        return self._prefixes.get(namespace)
+
+    def namespaces(self) -> Generator:
+
+        for prefix, namespace in list(self._namespaces.items()): yield prefix, namespace
+
+
+register('SQLite', Store, 'pkt_kg.utils.graph_store', 'SQLiteStore')
+
+
+def creates_graph(graph_store: str = 'memory', location: Optional[str] = None) -> Graph:
+    """Creates an empty RDFLib Graph using the requested graph store. Graphs using the "sqlite" store are written to a
+    temporary SQLite database (see SQLiteStore) in location, which is removed when the graph is freed.
+
+    Args:
+        graph_store: A string containing the store to use, "memory" or "sqlite" (default="memory").
+        location: An optional string containing the directory for the temporary SQLite database (default=the system
+            temporary directory).
+
+    Returns:
+        An RDFLib Graph object.
+
+    Raises:
+        ValueError: If graph_store is not "memory" or "sqlite".
+    """
+
+    if graph_store not in graph_stores: raise ValueError('graph_store not "memory" or "sqlite"')
+    elif graph_store == 'memory': return Graph()
+    else:
+        if location is not None and not os.path.exists(location): os.makedirs(location, exist_ok=True)
+        fd, filepath = tempfile.mkstemp(suffix='.db', prefix='pkt_graph_', dir=location); os.close(fd)
+
+        return Graph(store=SQLiteStore(filepath, temporary=True))
+
+
+def copies_graph_store(filepath: str) -> Graph:
+    """Opens a working copy of an existing SQLite graph database (e.g. a snapshot written by loads_graph_snapshot),
+    so that the Graph can be changed without changing the database. The copy is written next to filepath and is
+    removed when the graph is freed.
+
+    Args:
+        filepath: A string containing the path to a SQLite database written by a SQLiteStore.
+
+    Returns:
+        An RDFLib Graph object.
+    """
+
+    stem = os.path.splitext(filepath)[0]
+    fd, copy = tempfile.mkstemp(suffix='.db', prefix=os.path.basename(stem) + '_', dir=os.path.dirname(filepath))
+    os.close(fd); shutil.copyfile(filepath, copy)
+
+    return Graph(store=SQLiteStore(copy, temporary=True))
@@ -11,6 +11,7 @@ Interacts with OWL Tools API
 * gets_ontology_class_dbxrefs
 * gets_ontology_class_synonyms
 * gets_ontology_definitions
+* AnnotationIndex
 * merges_ontologies
 * ontology_file_formatter
 
@@ -18,13 +19,20 @@ Interacts with Knowledge Graphs
 * adds_edges_to_graph
 * remove_edges_from_graph
 * updates_graph_namespace
+* walks_entity_ancestors
 * gets_entity_ancestors
+* AncestorIndex
+* finds_connected_components
 * connected_components
 * removes_self_loops
 * derives_graph_statistics
+* derives_ntriples_statistics
+* rewrites_bnode_namespace
 * adds_namespace_to_bnodes
 * removes_namespace_from_bnodes
+* remaps_pkt_namespace_identifiers
 * updates_pkt_namespace_identifiers
+* finds_annotation_assertions
 * splits_knowledge_graph
 
 Writes Triple Lists
@@ -34,15 +42,25 @@ Writes Triple Lists
 
 File Type Conversion
 * convert_to_networkx
+
+Graph Snapshots
+* gets_file_hash
+* loads_graph_snapshot
+* loads_split_snapshot
 """
 
 # import needed libraries
 import glob
 import hashlib
+import heapq
 import json
 import networkx as nx  # type: ignore
+import numpy as np  # type: ignore
 import os
 import os.path
+import pickle
+import shutil
+import tempfile
 
 from collections import Counter  # type: ignore
 from more_itertools import unique_everseen  # type: ignore
@@ -51,9 +69,13 @@ from rdflib.namespace import OWL, RDF, RDFS  # type: ignore
 from rdflib.plugins.serializers.nt import _quoteLiteral  # type: ignore
 import subprocess
 
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm  # type: ignore
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
 from pkt_kg.utils import *
+from pkt_kg.utils.graph_store import copies_graph_store, creates_graph, graph_stores, SQLiteStore
+from pkt_kg.utils.ntriples import NTriplesReader, NTriplesWriter
 
 # set-up environment variables
 obo = Namespace('http://purl.obolibrary.org/obo/')
@@ -81,11 +103,73 @@ def gets_ontology_classes(graph: Graph) -> Set:
     return class_list
 
 
-def gets_ontology_definitions(graph: Graph) -> Dict:
+class AnnotationIndex(object):
+    """Indexes the annotation triples of an RDFLib Graph that are used to describe ontology entities, which are the
+    labels (rdfs:label), definitions (obo:IAO_0000115), synonyms (any predicate containing "synonym"), database
+    cross-references (any predicate containing "hasdbxref"), and exact matches (any predicate containing
+    "exactmatch"). The index is built in a single pass over the graph in which each distinct predicate is only
+    classified once, so all of the extractors (e.g. gets_ontology_class_synonyms, gets_ontology_class_dbxrefs,
+    gets_ontology_definitions, and Metadata.extract_metadata) can share one index instead of each scanning the graph.
+    The triples of each entity are kept in graph order.
+
+    Attributes:
+        labels: A dictionary keyed by entity with a list of (predicate, object) tuples stored as the value.
+        definitions: A dictionary keyed by entity with a list of (predicate, object) tuples stored as the value.
+        synonyms: A dictionary keyed by entity with a list of (predicate, object) tuples stored as the value, where
+            the predicate is the synonym type (e.g. oboInOwl:hasExactSynonym).
+        dbxrefs: A dictionary keyed by entity with a list of (predicate, object) tuples stored as the value.
+        exact_matches: A dictionary keyed by entity with a list of (predicate, object) tuples stored as the value.
+    """
+
+    def __init__(self, graph: Graph) -> None:
+
+        self.labels: Dict = dict(); self.definitions: Dict = dict(); self.synonyms: Dict = dict()
+        self.dbxrefs: Dict = dict(); self.exact_matches: Dict = dict()
+        indexes: Dict = dict()
+        for s, p, o in graph:
+            index = indexes.get(p, False)
+            if index is False: index = self._finds_index(p); indexes[p] = index
+            if index is not None: index.setdefault(s, []).append((p, o))
+
+    def _finds_index(self, predicate: URIRef) -> Optional[Dict]:
+        """Returns the dictionary that stores triples with predicate or None if the predicate is not indexed."""
+
+        pred = str(predicate).lower()
+        if predicate == RDFS.label: return self.labels
+        elif predicate == obo.IAO_0000115: return self.definitions
+        elif 'synonym' in pred: return self.synonyms
+        elif 'hasdbxref' in pred: return self.dbxrefs
+        elif 'exactmatch' in pred: return self.exact_matches
+        else: return None
+
+    @staticmethod
+    def _is_english(literal: Union[URIRef, BNode, Literal]) -> bool:
+        """Returns True if a Literal has no language tag or an English language tag."""
+
+        return '@' not in n3(literal) or '@en' in n3(literal)
+
+    def gets_labels(self, entity: Union[URIRef, BNode]) -> List:
+        """Returns a list of the English (or untagged) labels of an entity."""
+
+        return [o for p, o in self.labels.get(entity, []) if self._is_english(o)]
+
+    def gets_definitions(self, entity: Union[URIRef, BNode]) -> List:
+        """Returns a list of the English (or untagged) definitions of an entity."""
+
+        return [o for p, o in self.definitions.get(entity, []) if self._is_english(o)]
+
+    def gets_synonyms(self, entity: Union[URIRef, BNode]) -> List:
+        """Returns a list of (synonym type, synonym) tuples for an entity."""
+
+        return self.synonyms.get(entity, [])
+
+
+def gets_ontology_definitions(graph: Graph, index: Optional[AnnotationIndex] = None) -> Dict:
     """Queries a knowledge graph and returns a list of all object definitions (obo:IAO_0000115) in the graph.
 
     Args:
         graph: An rdflib Graph object.
+        index: An optional AnnotationIndex of graph. When it is not provided, the definitions are looked up directly.
 
     Returns:
         obj_defs: A dictionary where keys are object URiRefs and values are Literal object definitions. For example:
@@ -95,6 +179,7 @@ def gets_ontology_definitions(graph: Graph) -> Dict:
                      ...}
     """
 
+    if index is not None: return {k: v[-1] for k, v in ((x, index.gets_definitions(x)) for x in index.definitions) if v}
     obj_defs = {x[0]: x[2] for x in graph.triples((None, obo.IAO_0000115, None))
                 if '@' not in n3(x[2]) or '@en' in n3(x[2])}
 
@@ -134,12 +219,13 @@ def gets_object_properties(graph: Graph) -> Set:
     return object_property_list
 
 
-def gets_ontology_class_synonyms(graph: Graph) -> Tuple:
+def gets_ontology_class_synonyms(graph: Graph, index: Optional[AnnotationIndex] = None) -> Tuple:
     """Queries a knowledge graph and returns a tuple of dictionaries. The first dictionary contains all owl:Class
     objects and their synonyms in the graph. The second dictionary contains the synonyms and their OWL synonym types.
 
     Args:
         graph: An rdflib Graph object.
+        index: An optional AnnotationIndex of graph (default=None, which builds a new index).
 
     Returns:
         A tuple of dictionaries:
@@ -150,8 +236,8 @@ def gets_ontology_class_synonyms(graph: Graph) -> Tuple:
                     {'susceptibility to herpesvirus': 'hasExactSynonym', 'full upper lip': 'hasExactSynonym'}
     """
 
-    synonyms: Dict = dict()
-    class_list = [x for x in graph if 'synonym' in str(x[1]).lower() and isinstance(x[0], URIRef)]
+    synonyms: Dict = dict(); index = AnnotationIndex(graph) if index is None else index
+    class_list = [(k, p, o) for k, v in index.synonyms.items() if isinstance(k, URIRef) for p, o in v]
     for x in class_list:
         if str(x[2]).lower() in synonyms.keys(): synonyms[str(x[2]).lower()].append(str(x[0]))
         else: synonyms[str(x[2]).lower()] = [str(x[0])]
@@ -160,7 +246,7 @@ def gets_ontology_class_synonyms(graph: Graph) -> Tuple:
     return synonyms, synonym_type
 
 
-def gets_ontology_class_dbxrefs(graph: Graph) -> Tuple:
+def gets_ontology_class_dbxrefs(graph: Graph, index: Optional[AnnotationIndex] = None) -> Tuple:
     """Queries a knowledge graph and returns a dictionary containing all owl:Class objects and their database
     cross references (dbxref). Function also includes exact matches. A tuple of dictionaries: (1) contains dbxref and
     exact matches (URIs and labels); and (2) contains dbxref/exactmatch uris and a string indicating the type (i.e.
@@ -170,21 +256,22 @@ def gets_ontology_class_dbxrefs(graph: Graph) -> Tuple:
 
     Args:
         graph: An rdflib Graph object.
+        index: An optional AnnotationIndex of graph (default=None, which builds a new index).
 
     Returns:
         dbxref: A dictionary where keys are dbxref strings and values are ontology URIs.
         dbxref_type: A dict where keys are dbxref/exact uris; values are str indicating if the uri is dbxref or exact.
     """
 
-    dbx_uris: Dict = dict()
-    dbx = [x for x in graph if 'hasdbxref' in str(x[1]).lower() if isinstance(x[0], URIRef)]
+    dbx_uris: Dict = dict(); index = AnnotationIndex(graph) if index is None else index
+    dbx = [(k, p, o) for k, v in index.dbxrefs.items() if isinstance(k, URIRef) for p, o in v]
     for x in dbx:
         if str(x[2]).lower() in dbx_uris.keys(): dbx_uris[str(x[2]).lower()].append(str(x[0]))
         else: dbx_uris[str(x[2]).lower()] = [str(x[0])]
     dbx_type = {str(x[2]).lower(): 'DbXref' for x in dbx}
 
     ex_uris: Dict = dict()
-    ex = [x for x in graph if 'exactmatch' in str(x[1]).lower() if isinstance([0], URIRef)]
+    ex = [(k, p, o) for k, v in index.exact_matches.items() if isinstance(k, URIRef) for p, o in v]
     for x in ex:
         if str(x[2]).lower() in ex_uris.keys(): ex_uris[str(x[2]).lower()].append(str(x[0]))
         else: ex_uris[str(x[2]).lower()] = [str(x[0])]
@@ -223,31 +310,68 @@ def gets_ontology_statistics(file_location: str, owltools_location: str = './pkt
 
 
 def merges_ontologies(onts: List[str], loc: str, merged: str,
-                      owltools: str = os.path.abspath('./pkt_kg/libs/owltools')) -> Graph:
-    """Using the OWLTools API, each ontology listed in in the ontologies attribute is recursively merged with into a
-    master merged ontology file and saved locally to the provided file path via the merged_ontology attribute. The
-    function assumes that the file is written to the directory specified by the write_location attribute.
+                      owltools: str = os.path.abspath('./pkt_kg/libs/owltools'), cpus: int = 1) -> Graph:
+    """Using the OWLTools API, each ontology listed in in the ontologies attribute is merged into a master merged
+    ontology file and saved locally to the provided file path via the merged_ontology attribute. The function assumes
+    that the file is written to the directory specified by the write_location attribute. If a merged ontology file
+    already exists at that location it is included as one of the inputs.
+
+    Merging is scheduled so that no file is re-read more than necessary. When a single worker is available, all
+    ontologies are merged in one OWLTools invocation (the first ontology is the main ontology and all others are
+    merged into it as support ontologies). When more than one worker is available, ontologies are merged pairwise in a
+    balanced tree, where each level of the tree is run in parallel and writes intermediate files to loc. In both cases
+    the first ontology in onts remains the main ontology, so the merged file is the same up to triple ordering.
 
     Args:
         onts: A list of ontology file paths.
         loc: A string pointing to a local directory for writing data.
         merged: A string pointing to the location of the merged ontology file.
         owltools: A string pointing to the location of the owl tools library.
+        cpus: An integer specifying the number of OWLTools merges to run at the same time (default=1).
 
     Returns:
         None.
+
+    Raises:
+        CalledProcessError: If an OWLTools merge fails. Merges that have not started yet are cancelled and the
+            intermediate files are removed, so an incomplete merged ontology is never silently returned.
     """
 
     if not onts: return None
+    inputs = list(onts) + ([loc + merged] if loc + merged in glob.glob(loc + '/*.owl') else [])
+    if len(inputs) == 1: shutil.copyfile(inputs[0], loc + merged); return None  # nothing to merge
+
+    def owltools_merge(files: List[str], output: str) -> str:
+        try:
+            print('Merging Ontologies: {}'.format(', '.join([x.split('/')[-1] for x in files])))
+            subprocess.check_call([owltools] + [str(x) for x in files] + ['--merge-support-ontologies', '-o', output])
+        except subprocess.CalledProcessError as error:
+            print('Merging Ontologies Failed (exit status {}): {}'.format(error.returncode, output)); raise
+        return output
+
+    if cpus <= 1 or len(inputs) <= 2: owltools_merge(inputs, loc + merged)
     else:
-        if loc + merged in glob.glob(loc + '/*.owl'): o1, o2 = onts.pop(), loc + merged
-        else: o1, o2 = onts.pop(), onts.pop()
+        level, temp_files = 0, []
         try:
-            print('Merging Ontologies: {ont1}, {ont2}'.format(ont1=o1.split('/')[-1], ont2=o2.split('/')[-1]))
-            subprocess.check_call([owltools, str(o1), str(o2), '--merge-support-ontologies', '-o', loc + merged])
-        except subprocess.CalledProcessError as error: print(error.output)
+            with ThreadPoolExecutor(max_workers=cpus) as pool:  # threads suffice, the work happens in the owltools JVM
+                while len(inputs) > 1:
+                    pairs = [inputs[i:i + 2] for i in range(0, len(inputs), 2)]
+                    outputs = [loc + merged if len(pairs) == 1 else loc + merged[:-4] + '_{}_{}.owl'.format(level, i)
+                               for i in range(len(pairs))]
+                    futures = [pool.submit(owltools_merge, pair, out) if len(pair) > 1 else None
+                               for pair, out in zip(pairs, outputs)]
+                    temp_files += [out for f, out in zip(futures, outputs) if f is not None and out != loc + merged]
+                    try: inputs = [f.result() if f is not None else pair[0] for f, pair in zip(futures, pairs)]
+                    except subprocess.CalledProcessError:
+                        for f in futures:
+                            if f is not None: f.cancel()
+                        raise
+                    level += 1
+        finally:
+            for temp_file in temp_files:
+                if os.path.exists(temp_file): os.remove(temp_file)
 
-        return merges_ontologies(onts, loc, merged, owltools)
+    return None
 
 
 def ontology_file_formatter(loc: str, full_kg: str, owltools: str = os.path.abspath('./pkt_kg/libs/owltools')) -> None:
@@ -369,9 +493,34 @@ def finds_node_type(edge_info: Dict) -> Dict:
     return nodes
 
 
+def walks_entity_ancestors(parents: Callable, uris: List, cls_lst: List) -> List:
+    """Walks an ontology hierarchy upwards one level at a time, starting from the input uris. Each level contains the
+    sorted parents of the previous level that have not been seen yet and the walk stops once a level adds nothing new.
+    Ancestors that are not URIRef objects (e.g. BNodes) are converted to OBO URIs before they are walked. The levels
+    are returned from the most distant to the closest, each in reverse-sorted order, followed by cls_lst.
+
+    Args:
+        parents: A function that takes an RDFLib URIRef object and returns an iterable of its parent objects.
+        uris: A list of RDFLib URIRef objects to start the walk from.
+        cls_lst: A list of RDFLib URIRef objects that are treated as already visited and that end the output list.
+
+    Returns:
+        An ordered (desc; root to leaf) list of strings containing the ancestors found for the input uris.
+    """
+
+    seen, levels = set(cls_lst), []
+    while len(uris) > 0:
+        ancs = sorted(set(j for x in uris for j in parents(x)))  # sorted to be deterministic
+        uris = [x if isinstance(x, URIRef) else URIRef(obo + x) for x in ancs if x not in seen]
+        seen.update(uris); levels.append(uris)
+
+    return list(unique_everseen([str(x) for y in reversed(levels) for x in reversed(y)] + [str(x) for x in cls_lst]))
+
+
 def gets_entity_ancestors(graph: Graph, uris: List[Union[URIRef, str]], rel: Union[URIRef, str] = RDFS.subClassOf,
                           cls_lst: Optional[List] = None) -> List:
-    """A method that recursively searches an ontology hierarchy to pull all ancestor concepts for an input entity.
+    """A method that searches an ontology hierarchy level by level to pull all ancestor concepts for an input entity.
+    Callers that look up the ancestors of many entities in the same graph should use an AncestorIndex instead.
 
     Args:
         graph: An RDFLib graph object assumed to contain ontology data.
@@ -389,20 +538,143 @@ def gets_entity_ancestors(graph: Graph, uris: List[Union[URIRef, str]], rel: Uni
     prop = rel if isinstance(rel, URIRef) else URIRef(rel); cls_lst = [] if cls_lst is None else cls_lst
     cls_lst = list(unique_everseen([x if isinstance(x, URIRef) else URIRef(obo + x) for x in cls_lst]))
     uris = list(unique_everseen([x if isinstance(x, URIRef) else URIRef(obo + x) for x in uris]))
-    ancs = list(unique_everseen([j for k in [graph.objects(x, prop) for x in uris] for j in k]))
-    if len(ancs) == 0 or len(set(ancs).difference(set(cls_lst))) == 0:
-        return list(unique_everseen([str(x) for x in cls_lst]))
-    else:
-        uris = [x for x in ancs if x not in cls_lst]
-        for i in uris: cls_lst.insert(0, i)
-        return gets_entity_ancestors(graph, uris, prop, cls_lst)
+
+    return walks_entity_ancestors(lambda x: graph.objects(x, prop), uris, cls_lst)
+
+
+class AncestorIndex(object):
+    """Indexes the ancestor hierarchy of an RDFLib Graph object so that the ancestors of many entities can be looked
+    up without re-walking the graph. The parents of every entity are read in a single pass over the rel triples and
+    the ordered ancestor list of each entity is memoized the first time it is requested, so that later requests only
+    copy the stored answer. The ordering is the same as the one returned by gets_entity_ancestors.
+
+    The index does not watch the graph. Callers that add or remove rel triples after building the index must report
+    them through adds_edge and removes_edge, which drop the memoized answers of the entity and all of its descendants.
+
+    Attributes:
+        graph: The RDFLib Graph object that was indexed.
+        rel: An RDFLib URIRef object containing the hierarchy predicate (default=RDFS.subClassOf).
+        parents: A dictionary keyed by entity, with the set of the entity's parents as values.
+        children: A dictionary keyed by entity, with the set of the entity's children as values.
+    """
+
+    def __init__(self, graph: Graph, rel: Union[URIRef, str] = RDFS.subClassOf) -> None:
+
+        self.graph: Graph = graph; self.rel: URIRef = rel if isinstance(rel, URIRef) else URIRef(rel)
+        self.parents: Dict = {}; self.children: Dict = {}; self._ancestors: Dict = {}
+        for s, o in graph.subject_objects(self.rel):
+            self.parents.setdefault(s, set()).add(o); self.children.setdefault(o, set()).add(s)
+
+    def _gets_parents(self, uri: URIRef) -> Set:
+        """Returns the set of parents of an entity, which is empty when the entity has none."""
+
+        return self.parents.get(uri, set())
+
+    def gets_ancestors(self, uri: Union[URIRef, str], include_self: bool = False) -> List:
+        """Returns the ordered ancestors of an entity, computing and memoizing them on the first request.
+
+        Args:
+            uri: An RDFLib URIRef object or string containing an entity.
+            include_self: A bool indicating whether or not the entity should end the returned list (default=False).
+
+        Returns:
+            An ordered (desc; root to leaf) list of strings containing the entity's ancestors, equal to the list
+            returned by gets_entity_ancestors(graph, [uri], rel, [uri] if include_self else None).
+        """
+
+        uri = uri if isinstance(uri, URIRef) else URIRef(obo + uri); key = (uri, include_self)
+        if key not in self._ancestors:
+            ancs = walks_entity_ancestors(self._gets_parents, [uri], [uri] if include_self else [])
+            self._ancestors[key] = tuple(ancs)
+
+        return list(self._ancestors[key])
+
+    def _invalidates(self, uri: URIRef) -> None:
+        """Drops the memoized ancestors of an entity and of all of its descendants."""
+
+        if len(self._ancestors) == 0: return None
+        seen, stack = {uri}, [uri]
+        while len(stack) > 0:
+            node = stack.pop(); self._ancestors.pop((node, False), None); self._ancestors.pop((node, True), None)
+            for child in self.children.get(node, ()):
+                if child not in seen: seen.add(child); stack.append(child)
+
+        return None
+
+    def adds_edge(self, subj: URIRef, obj: URIRef) -> None:
+        """Records that the triple (subj, rel, obj) was added to the indexed graph.
+
+        Args:
+            subj: An RDFLib URIRef object containing the child entity.
+            obj: An RDFLib URIRef object containing the parent entity.
+
+        Returns:
+            None.
+        """
+
+        if obj not in self.parents.get(subj, ()):
+            self._invalidates(subj)
+            self.parents.setdefault(subj, set()).add(obj); self.children.setdefault(obj, set()).add(subj)
+
+        return None
+
+    def removes_edge(self, subj: URIRef, obj: URIRef) -> None:
+        """Records that the triple (subj, rel, obj) was removed from the indexed graph.
+
+        Args:
+            subj: An RDFLib URIRef object containing the child entity.
+            obj: An RDFLib URIRef object containing the parent entity.
+
+        Returns:
+            None.
+        """
+
+        if obj in self.parents.get(subj, ()):
+            self._invalidates(subj); self.parents[subj].discard(obj); self.children[obj].discard(subj)
+
+        return None
+
+
+def finds_connected_components(subjects: np.ndarray, objects: np.ndarray,
+                               nodes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the weakly connected components of a graph given as integer-coded subject and object arrays (e.g. the
+    columns of an IntegerTripleStore or of a CSR graph) using a vectorized union-find. Each round hooks the root of
+    the larger endpoint of every edge onto the root of the smaller endpoint and then compresses all paths by pointer
+    jumping, so the number of rounds grows with the logarithm of the component diameter rather than with the number
+    of edges. Components are numbered in the order of their smallest node id.
+
+    Args:
+        subjects: A numpy array of integer subject node ids.
+        objects: A numpy array of integer object node ids, aligned with subjects.
+        nodes: An optional integer number of nodes (default=one more than the largest node id).
+
+    Returns:
+        labels: A numpy int64 array containing the component number of each node id.
+        sizes: A numpy int64 array containing the number of nodes in each component.
+    """
+
+    subjects, objects = np.asarray(subjects, dtype=np.int64), np.asarray(objects, dtype=np.int64)
+    nodes = (int(max(subjects.max(), objects.max())) + 1 if len(subjects) > 0 else 0) if nodes is None else nodes
+    parent = np.arange(nodes, dtype=np.int64)
+    while True:
+        roots_s, roots_o = parent[subjects], parent[objects]; linked = roots_s != roots_o
+        if not linked.any(): break
+        subjects, objects, roots_s, roots_o = subjects[linked], objects[linked], roots_s[linked], roots_o[linked]
+        np.minimum.at(parent, np.maximum(roots_s, roots_o), np.minimum(roots_s, roots_o))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent): break
+            parent = grandparent
+    roots, labels = np.unique(parent, return_inverse=True)
+
+    return labels.astype(np.int64), np.bincount(labels, minlength=len(roots)).astype(np.int64)
 
 
 def connected_components(graph: Union[Graph, Set]) -> List:
     """Creates a dictionary where the keys are integers representing a component number and the values are sets
-    containing the nodes for a given component. This method works by first converting the RDFLib graph into a
-    NetworkX multi-directed graph, which is converted to a undirected graph prior to calculating the connected
-    components.
+    containing the nodes for a given component. Nodes are numbered in the order they first occur in the triples and
+    the components are found with finds_connected_components, so the components are returned in the same order as
+    NetworkX's connected_components of the undirected graph.
 
     Args:
         graph: An RDFLib Graph object.
@@ -411,10 +683,16 @@ def connected_components(graph: Union[Graph, Set]) -> List:
         components: A list of the nodes in each component detected in the graph.
     """
 
-    nx_mdg = nx.MultiDiGraph()
-    for s, p, o in tqdm(graph): nx_mdg.add_edge(s, o, **{'key': p})
+    node_ids, edges = dict(), array('q')  # type: ignore
+    for s, p, o in tqdm(graph):
+        if s not in node_ids: node_ids[s] = len(node_ids)
+        if o not in node_ids: node_ids[o] = len(node_ids)
+        edges.append(node_ids[s]); edges.append(node_ids[o])
     print('Calculating Connected Components')
-    components = list(nx.connected_components(nx_mdg.to_undirected()))
+    edge_array = np.frombuffer(edges, dtype=np.int64).reshape(-1, 2)
+    labels, sizes = finds_connected_components(edge_array[:, 0], edge_array[:, 1], len(node_ids))
+    components: List[Set] = [set() for _ in range(len(sizes))]
+    for node, label in zip(node_ids.keys(), labels.tolist()): components[label].add(node)
 
     return components
 
@@ -437,20 +715,81 @@ def removes_self_loops(graph: Graph) -> List:
     return list(self_loops)
 
 
-def derives_graph_statistics(graph: Union[Graph, Set, nx.MultiDiGraph]) -> str:
+def derives_ntriples_statistics(filepath: str, chunk_size: int = 1000000) -> str:
+    """Derives the same statistics as derives_graph_statistics for an RDFLib Graph, but from an N-Triples file in a
+    single streaming pass instead of parsing the file into a Graph. Each line is split into its serialized subject,
+    predicate, and object, which keeps the RDF type of each node (e.g. a Literal and a URIRef with the same string
+    are different nodes). Distinct triples and nodes are counted exactly with an external merge sort: the serialized
+    triples and nodes are written to sorted and deduplicated runs of at most chunk_size lines, and the distinct lines
+    are counted with a single k-way merge of the runs (the same external sort as deduplicates_file), so memory is
+    bounded by chunk_size and not by the size of the file. Predicates and typed subjects (classes, individuals, and
+    properties) are small and are kept as sets of strings. Blank lines and comments are skipped.
+
+    Args:
+        filepath: A string specifying a path to an N-Triples file.
+        chunk_size: An integer specifying the number of triples or nodes to sort in memory at a time.
+
+    Returns:
+        stats: A formatted string containing descriptive statistics.
+    """
+
+    rdf_type, types = RDF.type.n3(), {x.n3(): x for x in [OWL.Class, OWL.NamedIndividual, OWL.ObjectProperty,
+                                                        OWL.AnnotationProperty]}
+    typed: Dict = {k: set() for k in types.values()}; rels: Set = set()
+    run_dir = tempfile.mkdtemp(prefix='.pkt_sort_', dir=os.path.dirname(os.path.abspath(filepath)))
+    buffers: Dict = {'triples': [], 'nodes': []}; runs: Dict = {'triples': [], 'nodes': []}
+
+    def writes_runs() -> None:
+        for k in buffers.keys():
+            if len(buffers[k]) == 0: continue
+            runs[k] += [run_dir + '/{}_{}.txt'.format(k, len(runs[k]))]
+            with open(runs[k][-1], 'w', encoding='utf-8') as out: out.writelines(sorted(set(buffers[k])))
+            buffers[k] = []
+
+    def counts_unique_lines(files: List[str]) -> int:
+        handles = [open(x, 'r', encoding='utf-8') for x in files]; count, last = 0, None
+        try:
+            for line in heapq.merge(*handles):
+                if line != last: count += 1; last = line
+        finally:
+            for f in handles: f.close()
+        return count
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'): continue
+                s, p, o = line.split(None, 2); o = o[:-1].rstrip() if o.endswith('.') else o  # drop the closing " ."
+                buffers['triples'].append(s + ' ' + p + ' ' + o + '\n'); rels.add(p)
+                buffers['nodes'].append(s + '\n'); buffers['nodes'].append(o + '\n')
+                if p == rdf_type and o in types: typed[types[o]].add(s)
+                if len(buffers['nodes']) >= chunk_size: writes_runs()
+        writes_runs(); triples, nodes = counts_unique_lines(runs['triples']), counts_unique_lines(runs['nodes'])
+    finally: shutil.rmtree(run_dir, ignore_errors=True)
+    cls, inds, obj_prop, ant_prop = [len(typed[x]) for x in types.values()]
+    x = ' {} triples, {} nodes, {} predicates, {} classes, {} individuals, {} object props, {} annotation props'
+    stat = 'Graph Stats:' + x.format(triples, nodes, len(rels), cls, inds, obj_prop, ant_prop)
+
+    return stat
+
+
+def derives_graph_statistics(graph: Union[Graph, Set, nx.MultiDiGraph, str]) -> str:
     """Derives statistics from an input knowledge graph and prints them to the console. Note that we are not
     converting each node to a string before deriving our counts. This is purposeful as the number of unique nodes is
     altered when you it converted to a string. For example, in the HPO when honoring the RDF type of each node
     there are 406,717 unique nodes versus 406,331 unique nodes when ignoring the RDF type of each node.
 
     Args:
-        graph: An RDFLib graph object or a networkx.MultiDiGraph.
+        graph: An RDFLib graph object, a networkx.MultiDiGraph, or a string containing the path to an N-Triples file
+            (see derives_ntriples_statistics).
 
     Returns:
         stats: A formatted string containing descriptive statistics.
     """
 
-    if isinstance(graph, Graph):
+    if isinstance(graph, str): stat = derives_ntriples_statistics(graph)
+    elif isinstance(graph, Graph):
         triples = len(graph); nodes = len(set(list(graph.subjects()) + list(graph.objects())))
         rels = set(list(graph.predicates())); cls = set([x for x in graph.subjects(RDF.type, OWL.Class)])
         inds = set([x for x in graph.subjects(RDF.type, OWL.NamedIndividual)])
@@ -468,13 +807,17 @@ def derives_graph_statistics(graph: Union[Graph, Set, nx.MultiDiGraph]) -> str:
         x = ' {} triples, {} nodes, {} predicates, {} classes, {} individuals, {} object props, {} annotation props'
         stat = 'Graph Stats:' + x.format(triples, nodes, len(rels), len(cls), len(inds), len(obj_prop), len(ant_prop))
     else:
-        nx_graph_und = graph.to_undirected()
         nodes = nx.number_of_nodes(graph); edges = nx.number_of_edges(graph); self_loops = nx.number_of_selfloops(graph)
         conn = Counter([str(x[2]) for x in graph.edges(keys=True)])  # type: ignore
         ce = sorted(conn.items(), key=lambda x: x[1], reverse=1)[:6]  # type: ignore
         dens = nx.density(graph); avg_deg = float(edges) / nodes
         n_deg = sorted([(str(x[0]), x[1]) for x in graph.degree], key=lambda x: x[1], reverse=1)[:6]  # type: ignore
-        c = sorted(list(nx.connected_components(nx_graph_und)), key=len, reverse=True)
+        node_ids = {x: i for i, x in enumerate(graph.nodes)}
+        pairs = np.array([(node_ids[u], node_ids[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+        labels, sizes = finds_connected_components(pairs[:, 0], pairs[:, 1], len(node_ids))
+        c = [set() for _ in range(len(sizes))]  # type: List[Set]
+        for node, label in zip(node_ids.keys(), labels.tolist()): c[label].add(node)
+        c = sorted(c, key=len, reverse=True)
         cc = {x: str(len(c[x])) + ' nodes: ' + ' | '.join(c[x]) if len(c[x]) < 50 else len(c[x]) for x in range(len(c))}
         x = '{} nodes, {} edges, {} self-loops, 5 most most common edges: {}, average degree {}, 5 highest degree '\
             'nodes: {}, density: {}, {} component(s): {}'
@@ -484,8 +827,55 @@ def derives_graph_statistics(graph: Union[Graph, Set, nx.MultiDiGraph]) -> str:
     return stat
 
 
+def rewrites_bnode_namespace(triples: Iterable, ns: Union[str, Namespace] = pkt_bnode,
+                             remove: bool = False) -> Generator:
+    """Rewrites the subjects and objects of a stream of triples in a single pass, either adding a namespace to every
+    anonymous node (RDFLib Term type BNode) or removing it from every URIRef that starts with the namespace. The
+    transformation of each rewritten term is computed once and memoized, while all other terms (i.e. the classes,
+    instances, and literals that make up most of a graph) are passed through without being cached, so the memory
+    used by the method only grows with the number of distinct rewritten nodes and no intermediate copies of the
+    triples are created. The method can therefore be used to fill a new Graph or other store directly, or as a filter
+    over the triples of an N-Triples file (see rewrites_ntriples_bnodes).
+
+    Args:
+        triples: An iterable of tuples, where each tuple contains an RDFLib subject, predicate, and object (e.g. an
+            RDFLib Graph).
+        ns: A string or RDFLib Namespace object (default='https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+        remove: A bool indicating whether to remove the namespace from nodes (i.e. reverse the rewriting) instead
+            of adding it to BNodes (default=False).
+
+    Returns:
+        A generator of tuples, where each tuple contains the rewritten RDFLib subject, predicate, and object.
+    """
+
+    ns_uri, terms = str(ns), dict()  # type: ignore
+    if remove:
+        for s, p, o in triples:
+            if isinstance(s, URIRef) and s.startswith(ns_uri):
+                sub = terms.get(s)
+                if sub is None: sub = terms[s] = BNode(s.split('/')[-1])
+            else: sub = s
+            if isinstance(o, URIRef) and o.startswith(ns_uri):
+                obj = terms.get(o)
+                if obj is None: obj = terms[o] = BNode(o.split('/')[-1])
+            else: obj = o
+            yield sub, p, obj
+    else:
+        for s, p, o in triples:
+            if isinstance(s, BNode):
+                sub = terms.get(s)
+                if sub is None: sub = terms[s] = URIRef(ns_uri + str(s))
+            else: sub = s
+            if isinstance(o, BNode):
+                obj = terms.get(o)
+                if obj is None: obj = terms[o] = URIRef(ns_uri + str(o))
+            else: obj = o
+            yield sub, p, obj
+
+
 def adds_namespace_to_bnodes(graph: Graph, ns: Union[str, Namespace] = pkt_bnode) -> Graph:
-    """Method adds a namespace to all anonymous (RDFLib Term type BNode).
+    """Method adds a namespace to all anonymous (RDFLib Term type BNode). The triples are rewritten in a single
+    streaming pass (see rewrites_bnode_namespace) and added directly to the updated graph.
 
     Args:
         graph: An RDFLib Graph object.
@@ -496,29 +886,16 @@ def adds_namespace_to_bnodes(graph: Graph, ns: Union[str, Namespace] = pkt_bnode
     """
 
     print('Adding Namespace to BNodes')
-    # print('Processing Original Nodes')
-    all_triples = set(graph)
-    sub_only_bnodes_org = {x for x in graph if isinstance(x[0], BNode) and not isinstance(x[2], BNode)}
-    obj_only_bnodes_org = {x for x in graph if isinstance(x[2], BNode) and not isinstance(x[0], BNode)}
-    sub_and_obj_bnodes_org = {x for x in graph if isinstance(x[0], BNode) and isinstance(x[2], BNode)}
-    graph_no_bnodes = all_triples - (sub_only_bnodes_org | obj_only_bnodes_org | sub_and_obj_bnodes_org)
-    del all_triples, graph
-    # print('Converting BNodes to Namespaced-URIs')
-    ns_uri = ns if isinstance(ns, Namespace) else Namespace(ns)
-    sub_fixed = {(URIRef(ns_uri + str(x[0])), x[1], x[2]) for x in sub_only_bnodes_org}
-    obj_fixed = {(x[0], x[1], URIRef(ns_uri + str(x[2]))) for x in obj_only_bnodes_org}
-    both_fixed = {(URIRef(ns_uri + str(x[0])), x[1], URIRef(ns_uri + str(x[2]))) for x in sub_and_obj_bnodes_org}
-    del sub_only_bnodes_org, obj_only_bnodes_org, sub_and_obj_bnodes_org
-    # print('Finalizing Updated Graph')
     updated_graph = Graph()
-    for s, p, o in (graph_no_bnodes | sub_fixed | obj_fixed | both_fixed): updated_graph.add((s, p, o))
+    for triple in rewrites_bnode_namespace(graph, ns): updated_graph.add(triple)
 
     return updated_graph
 
 
 def removes_namespace_from_bnodes(graph: Graph, ns: Union[str, Namespace] = pkt_bnode, verbose: bool = True) -> Graph:
     """Methods removes namespace from nodes originally assumed to be RDFLib BNodes. This method acts to reverse the
-    pkt_kg.utils.adds_namespace_to_bnodes method.
+    pkt_kg.utils.adds_namespace_to_bnodes method. The triples are rewritten in a single streaming pass (see
+    rewrites_bnode_namespace) and added directly to the updated graph.
 
     Args:
         graph: An RDFLib Graph object.
@@ -529,120 +906,199 @@ def removes_namespace_from_bnodes(graph: Graph, ns: Union[str, Namespace] = pkt_
         updated_graph: An RDFLib Graph object with bnode namespaces removed.
     """
 
-    if verbose: print('Removing Namespace from BNodes'); print('Processing Original Nodes')
-    ns_uri = str(ns) if isinstance(ns, Namespace) else ns
-    all_triples = set(graph)
-    sub_only_bnodes_ns = {(s, p, o) for s, p, o in graph if str(s).startswith(ns_uri) and not str(o).startswith(ns_uri)}
-    obj_only_bnodes_ns = {(s, p, o) for s, p, o in graph if str(o).startswith(ns_uri) and not str(s).startswith(ns_uri)}
-    sub_and_obj_bnodes_ns = {(s, p, o) for s, p, o in graph if str(s).startswith(ns_uri) and str(o).startswith(ns_uri)}
-    graph_no_bnodes = all_triples - (sub_only_bnodes_ns | obj_only_bnodes_ns | sub_and_obj_bnodes_ns)
-    del all_triples, graph
     if verbose: print('Removing Namespace from BNodes')
-    sub_fixed = {(BNode(str(s).split('/')[-1]), p, o) for s, p, o in sub_only_bnodes_ns}
-    obj_fixed = {(s, p, BNode(str(o).split('/')[-1])) for s, p, o in obj_only_bnodes_ns}
-    both_fixed = {(BNode(str(s).split('/')[-1]), p, BNode(str(o).split('/')[-1])) for s, p, o in sub_and_obj_bnodes_ns}
-    del sub_only_bnodes_ns, obj_only_bnodes_ns, sub_and_obj_bnodes_ns
-    if verbose: print('Finalizing Updated Graph')
     updated_graph = Graph()
-    for s, p, o in (graph_no_bnodes | sub_fixed | obj_fixed | both_fixed): updated_graph.add((s, p, o))
+    for triple in rewrites_bnode_namespace(graph, ns, remove=True): updated_graph.add(triple)
 
     return updated_graph
 
 
+def remaps_pkt_namespace_identifiers(triples: np.ndarray, terms: List, term_ids: Dict, const: str) -> np.ndarray:
+    """Integer-coded version of updates_pkt_namespace_identifiers that is shared by RDFLib Graphs, sets of triples,
+    and the IntegerTripleStore. Each row of triples contains the term ids of a subject, predicate, and object. The
+    pkt-namespaced BNodes and the class of each pkt-namespaced node are found by inspecting every distinct term once
+    and every update is applied to whole columns with numpy, so the cost no longer depends on the number of graph
+    lookups per node. Terms that are needed but not yet in terms (i.e. the BNodes that pkt-namespaced BNodes are
+    mapped back to) are appended to terms and term_ids.
+
+    Assumptions: the same as updates_pkt_namespace_identifiers. In addition, a pkt-namespaced node is assumed to map
+    to an ontology class and not to another pkt-namespaced node. Punning is checked once over the updated triples,
+    rather than after each node is updated.
+
+    Args:
+        triples: A numpy array with one row per triple and columns for the subject, predicate, and object ids.
+        terms: A list of RDFLib terms, where the position of a term is its integer id.
+        term_ids: A dictionary keyed by RDFLib term with the term's integer id stored as the value.
+        const: A string containing the type of construction approach used to build the knowledge graph.
+
+    Returns:
+        A numpy array with one row per unique updated triple. The input array is returned when nothing changes.
+    """
+
+    # STEP 1: check for pkt-namespaced bnodes (original bnodes) and map them back to bnodes
+    ns_ids = [i for i in np.unique(triples[:, [0, 2]]).tolist() if str(terms[i]).startswith(pkt_bnode)]
+    if len(ns_ids) > 0:
+        bnodes = [BNode(str(terms[i]).split('/')[-1]) for i in ns_ids]
+        for x in bnodes:
+            if x not in term_ids: term_ids[x] = len(terms); terms.append(x)
+        remap = np.arange(len(terms), dtype=np.int64); remap[ns_ids] = [term_ids[x] for x in bnodes]
+        triples = np.unique(np.column_stack([remap[triples[:, 0]], triples[:, 1], remap[triples[:, 2]]]), axis=0)
+
+    # STEP 2: map pkt-namespaced nodes (pkt-added bnodes) to their ontology class
+    n, pkt_n, skip = len(terms), str(pkt) + 'N', {OWL.NamedIndividual, OWL.Class}
+    is_node, is_class = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    for i in np.unique(triples[:, [0, 2]]).tolist():
+        x = terms[i]; is_node[i] = str(x).startswith(pkt_n) and 'bnode' not in str(x)
+        is_class[i] = isinstance(x, URIRef) and x not in skip
+    pred = term_ids.get(RDF.type if const == 'instance' else RDFS.subClassOf, -1)
+    maps = triples[(triples[:, 1] == pred) & is_node[triples[:, 0]] & is_class[triples[:, 2]]]
+    if len(maps) == 0: return triples
+    remap = np.arange(n, dtype=np.int64); remap[maps[:, 0]] = maps[:, 2]
+    is_key = np.zeros(n, dtype=bool); is_key[maps[:, 0]] = True
+    touched = triples[is_key[triples[:, 0]] | is_key[triples[:, 2]]]
+    updated = np.column_stack([remap[touched[:, 0]], touched[:, 1], remap[touched[:, 2]]])
+    updated = updated[updated[:, 0] != updated[:, 2]]  # ensures we are not adding self-loops
+    triples = np.unique(np.concatenate([triples, updated]), axis=0)
+    # verify that updating nodes doesn't introduce punning (i.e. node is not NamedIndividual and Class)
+    rdf_type, individual = term_ids.get(RDF.type, -1), term_ids.get(OWL.NamedIndividual, -1)
+    is_mapped = np.zeros(n, dtype=bool); is_mapped[maps[:, 2]] = True
+    typed = triples[(triples[:, 1] == rdf_type) & is_mapped[triples[:, 0]], 0]
+    nodes, counts = np.unique(typed, return_counts=True)
+    punned = (triples[:, 1] == rdf_type) & (triples[:, 2] == individual) & np.isin(triples[:, 0], nodes[counts > 1])
+
+    return triples[~(is_key[triples[:, 0]] | is_key[triples[:, 2]] | punned)]
+
+
 def updates_pkt_namespace_identifiers(graph: Union[Graph, Set], const: str, verbose: bool = True) -> Union[Graph, Set]:
     """Iterates over all entities in a pkt knowledge graph that were constructed using the instance- and
     subclass-based construction approaches and converts pkt-namespaced BNodes back to the original ontology
     class identifier. A new edge for each triple, containing an instance of a class is updated with the original
-    ontology identifier, is added to the graph.
+    ontology identifier, is added to the graph. The triples are encoded as integers in a single pass and updated in
+    bulk by remaps_pkt_namespace_identifiers (see IntegerTripleStore.updates_pkt_namespace_identifiers for graphs
+    that are already integer-coded).
 
     Assumptions: (1) all instances/classes of a BNode identifier contain the pkt namespace and (2) all relations used
     when adding new edges to a graph are part of the OBO namespace.
 
     Args:
-        graph: An RDFLib Graph object containing pkt-namespacing.
+        graph: An RDFLib Graph object or set of RDFLib triples containing pkt-namespacing.
         const: A string containing the type of construction approach used to build the knowledge graph.
         verbose: A bool flag used to indicate whether or not to print method function (default=False).
 
     Returns:
-         graph: An RDFLib Graph object or set of RDFLib triples updated to remove bnode namespacing.
+         graph: An RDFLib Graph object or set of RDFLib triples (matching the input type) updated to remove bnode
+            namespacing. The input is returned unchanged when it contains no pkt-namespacing.
     """
 
     if verbose: print('Post-processing pkt-kg-Namespaced Anonymous Nodes')
-    if isinstance(graph, Set): graph = adds_edges_to_graph(Graph(), graph, False)
-
-    # STEP 1: check for pkt-namespaced bnodes (original bnodes) and remove them if present
-    ns_bnodes = {x for x in graph if str(x[0]).startswith(pkt_bnode) or str(x[2]).startswith(pkt_bnode)}
-    if len(ns_bnodes) > 0: graph = removes_namespace_from_bnodes(graph=graph, verbose=verbose)
-
-    # STEP 2: check for pkt-namespaced bnodes (pkt-added bnodes) and remove them if present
-    pred = RDF.type if const == 'instance' else RDFS.subClassOf
-    pkt_ns_dict = {x[0]: x[2] for x in list(graph.triples((None, pred, None))) if isinstance(x[2], URIRef)
-                   and ((str(x[0]).startswith(str(pkt) + 'N') and 'bnode' not in str(x[0]))
-                        and x[2] not in [OWL.NamedIndividual, OWL.Class])}
-    if len(pkt_ns_dict) > 0:
-        remove_edges: Set = set()  # update triples containing BNodes with original ontology class
-        for node in pkt_ns_dict.keys():
-            triples = list(graph.triples((node, None, None))) + list(graph.triples((None, None, node)))
-            for edge in triples:
-                sub = pkt_ns_dict[edge[0]] if edge[0] in pkt_ns_dict.keys() else edge[0]
-                obj = pkt_ns_dict[edge[2]] if edge[2] in pkt_ns_dict.keys() else edge[2]
-                if sub != obj: graph.add((sub, edge[1], obj))  # ensures we are not adding self-loops
-            # verify that updating node doesn't introduce punning (i.e. node is not NamedIndividual and Class)
-            node_types = list(graph.triples((pkt_ns_dict[node], RDF.type, None)))
-            if len(node_types) > 1: triples += [tuple(x) for x in node_types if x[2] == OWL.NamedIndividual]
-            remove_edges |= set(triples)
-        graph = remove_edges_from_graph(graph, list(remove_edges))
+
+    terms: List = []; term_ids: Dict = dict(); rows = array('q')
+    for triple in graph:
+        for x in triple:
+            i = term_ids.get(x)
+            if i is None: i = len(terms); terms.append(x); term_ids[x] = i
+            rows.append(i)
+    encoded = np.frombuffer(rows, dtype=np.int64).reshape(-1, 3)
+    updated = remaps_pkt_namespace_identifiers(encoded, terms, term_ids, const)
+    if updated is encoded: return graph
+    triples = ((terms[s], terms[p], terms[o]) for s, p, o in updated.tolist())
+    if isinstance(graph, Graph): graph = Graph(); graph.addN((s, p, o, graph) for s, p, o in triples)
+    else: graph = set(triples)
 
     return graph
 
 
-def splits_knowledge_graph(graph: Graph, graph_output: bool = False) -> Tuple[Graph, Union[Graph, Set]]:
+def finds_annotation_assertions(triples: np.ndarray, ids: Dict, is_uri: np.ndarray) -> np.ndarray:
+    """Classifies each integer-coded triple of a graph as a logical axiom or an annotation assertion. Instead of
+    querying the graph once per axiom and annotated entity, every rule is applied to all triples at once as a
+    vectorized lookup of the subject and object ids. This is the only implementation of the rules: it is used by
+    splits_knowledge_graph, which integer-codes the triples of an RDFLib Graph, and by
+    IntegerTripleStore.splits_knowledge_graph, which passes the rows of the store.
+
+    Source: https://www.w3.org/TR/owl2-syntax/#Annotation_Assertion
+
+    Args:
+        triples: A numpy array with one row per triple and columns for the subject, predicate, and object ids. BNodes
+            are expected to already be namespaced (see adds_namespace_to_bnodes).
+        ids: A dictionary keyed by RDFLib term with the term's integer id stored as the value. Only the terms
+            RDF.type, OWL.AnnotationProperty, OWL.Axiom, OWL.annotatedSource, OWL.annotatedProperty, and
+            OWL.annotatedTarget are looked up, and terms that do not occur in triples can be omitted.
+        is_uri: A numpy array of bools, which is True at the position of each term id that is an RDFLib URIRef.
+
+    Returns:
+        A numpy array of bools, which is True at the position of each triple that is an annotation assertion.
+    """
+
+    s, p, o = triples[:, 0], triples[:, 1], triples[:, 2]
+    rdf_type, axiom = ids.get(RDF.type, -1), ids.get(OWL.Axiom, -1)
+    target, source = ids.get(OWL.annotatedTarget, -1), ids.get(OWL.annotatedSource, -1)
+    # get information needed to find annotation assertions
+    annot_props = np.setdiff1d(s[(p == rdf_type) & (o == ids.get(OWL.AnnotationProperty, -1))], [rdf_type])
+    annotated_ids = [ids[x] for x in [OWL.annotatedSource, OWL.annotatedProperty, OWL.annotatedTarget] if x in ids]
+    all_annot_props = np.union1d(annot_props, np.array(annotated_ids, dtype=np.int64))
+    axioms = np.unique(s[(p == rdf_type) & (o == axiom)])
+    ents = np.union1d(axioms, s[is_uri[s] & np.isin(p, annot_props)])
+    has_target = np.isin(ents, s[(p == target) & is_uri[o]])
+    has_source = np.isin(ents, s[(p == source) & is_uri[o]])
+    both, neither = ents[has_target & has_source], ents[~has_target & ~has_source]
+    one = ents[has_target ^ has_source]
+    # triples are annotations if their subject or object is an entity whose rule selects them
+    in_annot, in_all = np.isin(p, annot_props), np.isin(p, all_annot_props) | (o == axiom)
+    annotated = (p == target) | (p == source)
+    annot = (np.isin(s, both) & in_annot) | (np.isin(s, one) & in_all) | \
+            (np.isin(s, neither) & in_all & ~((o == s) & annotated))
+    annot |= (np.isin(o, both) & in_annot) | (np.isin(o, one) & in_all) | (np.isin(o, neither) & in_all & ~annotated)
+
+    return annot
+
+
+def splits_knowledge_graph(graph: Union[Graph, Set], graph_output: bool = False,
+                           annotations: Optional[str] = None) -> Tuple[Graph, Union[Graph, Set, int]]:
     """Method takes an input RDFLib Graph object and splits it into two new graphs where the first graph contains
     only those triples needed to maintain a base logical subset and the second contains only annotation assertions.
-    Please note that the code below processes both entities (i.e. owl:Class and owl:ObjectProperties
+    Please note that the code below processes both entities (i.e. owl:Class and owl:ObjectProperties). BNodes are
+    namespaced (see rewrites_bnode_namespace) while the triples are read, and the triples are integer-coded and
+    classified with the vectorized rules in finds_annotation_assertions. If annotations is provided, the annotation
+    assertions are appended to that N-Triples file as they are selected, so the annotation subset is never built in
+    memory.
 
     Source: https://www.w3.org/TR/owl2-syntax/#Annotation_Assertion
 
     Args:
-        graph: An RDFLib Graph object.
+        graph: An RDFLib Graph object or a set of RDFLib triples.
         graph_output: (Bool) if True, the annotation and logic graph are returned as RDFLib Graph objects, if False,
             the logic_graph is returned as an RDFLib Graph and the annotation subset is returned as a
             set of triples (default=False).
+        annotations: An optional string containing the path to an N-Triples file to append the annotation
+            assertions to, instead of returning them (default=None).
 
     Returns:
         logic_graph: An RDFLib Graph object containing only logical axioms.
         annotation_graph: An RDFLib Graph object or a set of RDFLib triples containing non-logical annotation
-            assertions.
+            assertions or, if annotations is provided, an integer containing the number of annotation assertions
+            that were written.
     """
 
-    graph = adds_namespace_to_bnodes(graph)
+    print('Adding Namespace to BNodes')
+    all_triples = list(set(rewrites_bnode_namespace(graph)))
 
     print('Creating Logic and Annotation Subsets of Graph')
-    # get information needed to find annotation assertions
-    annot_props = set([x for x in graph.subjects(RDF.type, OWL.AnnotationProperty) if x != RDF.type])
-    core_annot_props = {OWL.annotatedSource, OWL.annotatedProperty, OWL.annotatedTarget}
-    all_annot_props = annot_props | core_annot_props
-    axioms = set(graph.subjects(RDF.type, OWL.Axiom))
-    entities = set([x[0] for x in graph if isinstance(x[0], URIRef) and (x[1] in annot_props and x[0] not in axioms)])
-    annot_triples = set()
-    for ent in tqdm(axioms | entities):
-        triples = set(graph.triples((ent, None, None))) | set(graph.triples((None, None, ent)))
-        target = [x for x in triples if (x[0] == ent and x[1] == OWL.annotatedTarget and isinstance(x[2], URIRef))]
-        source = [x for x in triples if (x[0] == ent and x[1] == OWL.annotatedSource and isinstance(x[2], URIRef))]
-        if len(target) > 0 and len(source) > 0: annot_triples |= {x for x in triples if x[1] in annot_props}
-        elif len(target) == 0 and len(source) == 0:
-            match = [x for x in triples if x[2] == ent and (x[1] == OWL.annotatedTarget or x[1] == OWL.annotatedSource)]
-            keep = [x for x in match if x not in annot_triples]
-            annot_triples |= {x for x in triples if (x[1] in all_annot_props or x[2] == OWL.Axiom) and x not in keep}
-        else: annot_triples |= {x for x in triples if x[1] in all_annot_props or x[2] == OWL.Axiom}
+    ids: Dict = dict(); rows = np.array([ids.setdefault(x, len(ids)) for y in all_triples for x in y], dtype=np.int64)
+    is_uri = np.fromiter((isinstance(x, URIRef) for x in ids.keys()), dtype=bool, count=len(ids))
+    is_annot = finds_annotation_assertions(rows.reshape(-1, 3), ids, is_uri).tolist(); del ids, rows, is_uri
+    logic_triples = {x for x, y in zip(all_triples, is_annot) if not y}; annot_count = sum(is_annot)
+    print('Annotation Assertions (n={} Triples)'.format(annot_count))
+    if annotations is not None:
+        with NTriplesWriter(annotations, 'a') as writer:
+            writer.writes_triples(x for x, y in zip(all_triples, is_annot) if y)
+        annot_triples: Union[Set, int] = annot_count
+    else: annot_triples = {x for x, y in zip(all_triples, is_annot) if y}
     # create graph subsets
-    all_triples = set(graph); logic_triples = all_triples - annot_triples
-    print('Annotation Assertions (n={} Triples)'.format(len(annot_triples)))
-    if len(logic_triples) + len(annot_triples) == len(all_triples):
+    if len(logic_triples) + annot_count == len(all_triples):
         print('Creating Logic Graph (n={} Triples)'.format(len(logic_triples)))
         logic_graph = adds_edges_to_graph(Graph(), logic_triples)
-        if graph_output:
-            print('Creating Annotation Graph (n={} Triples)'.format(len(annot_triples)))
+        if graph_output and annotations is None:
+            print('Creating Annotation Graph (n={} Triples)'.format(annot_count))
             annotation_graph = adds_edges_to_graph(Graph(), annot_triples)
         else: annotation_graph = annot_triples
         return logic_graph, annotation_graph
@@ -717,7 +1173,8 @@ def n3(node: Union[URIRef, BNode, Literal]) -> str:
     return serialized_node
 
 
-def convert_to_networkx(write_loc: str, filename: str, graph: Union[Graph, Set], stats: bool = False) -> Optional[str]:
+def convert_to_networkx(write_loc: str, filename: str, graph: Union[Graph, Set, Iterable],
+                        stats: bool = False) -> Optional[str]:
     """Converts an RDFLib.Graph object into a Networkx MultiDiGraph and pickles a copy locally. Each node is provided a
     key that is the URI identifier and each edge is given a key which is an md5 hash of the triple and a weight of
     0.0. An example of the output is shown below. The md5 hash is meant to store a unique key that represents that
@@ -736,7 +1193,7 @@ def convert_to_networkx(write_loc: str, filename: str, graph: Union[Graph, Set],
     Args:
         write_loc: A string pointing to a local directory for writing data.
         filename: A string containing the subdirectory and name of the the knowledge graph file.
-        graph: An RDFLib Graph object or set of RDFLib Graph triples.
+        graph: An RDFLib Graph object, a set of RDFLib Graph triples, or an iterable (e.g. a generator) of triples.
         stats: A bool indicating whether or not to derive network statistics after writing networkx file to disk.
 
     Returns:
@@ -758,6 +1215,7 @@ def convert_to_networkx(write_loc: str, filename: str, graph: Union[Graph, Set],
 
 def appends_to_existing_file(edges: Union[List, Set, Graph], filepath: str, sep: str = ' ') -> None:
     """Method adds data to the end of an existing file. Assumes that it is adding data to the end of a n-triples file.
+    The triples are written through an NTriplesWriter, so each term is only serialized once.
 
     Args:
         edges: A list or set of tuple, where each tuple is a triple. Or an RDFLib Graph object.
@@ -768,10 +1226,155 @@ def appends_to_existing_file(edges: Union[List, Set, Graph], filepath: str, sep:
         None.
     """
 
-    if not os.path.exists(filepath): os.system('touch {}'.format(filepath))
-    with open(filepath, 'a', newline='') as out:
-        for edge in edges:
-            out.write(n3(edge[0]) + sep + n3(edge[1]) + sep + n3(edge[2]) + ' .\n')
-    out.close()
+    with NTriplesWriter(filepath, 'a', sep) as writer: writer.writes_triples(edges)
 
     return None
+
+
+def gets_file_hash(filepath: str, chunk_size: int = 2 ** 20) -> str:
+    """Computes an md5 hash of a file's contents. The file is read in chunks so that very large files (e.g. the merged
+    ontologies) can be hashed without loading them into memory.
+
+    Args:
+        filepath: A string specifying a path to an existing file.
+        chunk_size: An integer specifying the number of bytes to read at a time (default=1MB).
+
+    Returns:
+        A string containing the hexadecimal md5 digest of the file.
+    """
+
+    md5 = hashlib.md5()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''): md5.update(chunk)
+
+    return md5.hexdigest()
+
+
+def loads_graph_snapshot(filepath: str, file_format: str = 'xml', graph_store: str = 'memory') -> Graph:
+    """Loads an RDF file into an RDFLib Graph using a binary snapshot cache. The first time a file is seen it is parsed
+    with RDFLib and the resulting Graph is pickled next to it. The snapshot filename contains an md5 hash of the
+    source file, so subsequent calls with an unchanged file load the pickled Graph, which is several times faster
+    than re-parsing RDF/XML. Snapshots belonging to older versions of the file are removed when a new one is written.
+    When graph_store is "sqlite", the snapshot is a SQLite database (see SQLiteStore) and the returned Graph is a
+    disk-backed working copy of it, so the graph is never held in memory.
+
+    Example:
+        filepath: 'resources/knowledge_graphs/PheKnowLator_MergedOntologies.owl'
+        snapshot: 'resources/knowledge_graphs/PheKnowLator_MergedOntologies_<md5>_Snapshot.pkl'
+
+    Args:
+        filepath: A string specifying a path to an existing RDF file.
+        file_format: A string containing the RDFLib parser to use when no snapshot exists (default='xml').
+        graph_store: A string containing the graph store to use, "memory" or "sqlite" (default="memory").
+
+    Returns:
+        graph: An RDFLib Graph object.
+
+    Raises:
+        OSError: If filepath points to a non-existent file.
+        TypeError: If filepath points to an empty file.
+        ValueError: If graph_store is not "memory" or "sqlite".
+    """
+
+    if graph_store not in graph_stores: raise ValueError('graph_store not "memory" or "sqlite"')
+    elif not os.path.exists(filepath): raise OSError('{} does not exist!'.format(filepath))
+    elif os.stat(filepath).st_size == 0: raise TypeError('{} is empty'.format(filepath))
+    else: stem = os.path.splitext(filepath)[0]; ext = '.pkl' if graph_store == 'memory' else '.db'
+    snapshot = stem + '_' + gets_file_hash(filepath) + '_Snapshot' + ext
+
+    if os.path.exists(snapshot):
+        print('Loading Graph Snapshot: {}'.format(snapshot.split('/')[-1]))
+        if graph_store != 'memory': graph = copies_graph_store(snapshot)
+        else:
+            with open(snapshot, 'rb') as f: graph = pickle.load(f)
+    else:
+        print('Parsing {} and Creating Graph Snapshot'.format(filepath.split('/')[-1]))
+        temp = snapshot + '.' + str(os.getpid()) + '.tmp'  # concurrent builds may create the same snapshot
+        graph = Graph() if graph_store == 'memory' else Graph(store=SQLiteStore(temp))
+        if file_format != 'nt': graph.parse(filepath, format=file_format)
+        else: graph.addN((s, p, o, graph) for s, p, o in NTriplesReader(bnode_labels=False).iterates_triples(filepath))
+        for stale in glob.glob(stem + '_*_Snapshot' + ext): os.remove(stale)
+        if graph_store != 'memory':
+            graph.commit(); graph.close(); os.replace(temp, snapshot); graph = copies_graph_store(snapshot)
+        else:
+            with open(temp, 'wb') as f: pickle.dump(graph, f, protocol=4)
+            os.replace(temp, snapshot)  # only complete snapshots are ever visible under the final name
+
+    return graph
+
+
+def loads_split_snapshot(filepath: str, graph: Optional[Graph] = None, graph_store: str = 'memory',
+                         annotations: Optional[str] = None) -> Tuple[Graph, Union[Graph, Set, int]]:
+    """Returns the logic and annotation subsets (see splits_knowledge_graph) of the RDF file at filepath using a
+    snapshot cache. The subsets only depend on the contents of the file, so they are the same for every construction
+    approach, relation type, and OWL decoding option built from the same merged ontologies. The first time a version
+    of the file is seen the graph is split, the logic subset is pickled next to the file, and the annotation subset is
+    written to an N-Triples file next to the file as it is selected, both under a name that contains an md5 hash of
+    the file; every later build (of any type) loads the snapshots instead of splitting the graph again. Snapshots
+    belonging to older versions of the file are removed when a new one is written. When graph_store is "sqlite", the
+    logic subset is written to a SQLite database (see SQLiteStore) and returned as a disk-backed working copy of the
+    database. If annotations is provided, the annotation subset is appended to that N-Triples file by copying the
+    snapshot, so the annotation subset is never held in memory.
+
+    Example:
+        filepath: 'resources/knowledge_graphs/PheKnowLator_MergedOntologies.owl'
+        snapshots: 'resources/knowledge_graphs/PheKnowLator_MergedOntologies_<md5>_Split_Logic.pkl'
+                   'resources/knowledge_graphs/PheKnowLator_MergedOntologies_<md5>_Split_Annotations.nt'
+
+    Args:
+        filepath: A string specifying a path to an existing RDF file.
+        graph: An optional RDFLib Graph object containing the parsed contents of filepath. If not provided and no
+            snapshot exists, the graph is loaded with loads_graph_snapshot.
+        graph_store: A string containing the graph store to use, "memory" or "sqlite" (default="memory").
+        annotations: An optional string containing the path to an N-Triples file to append the annotation subset
+            to, instead of returning it (default=None).
+
+    Returns:
+        logic_graph: An RDFLib Graph object containing only logical axioms.
+        annotation_triples: A set of RDFLib triples (or a disk-backed RDFLib Graph when graph_store is "sqlite")
+            containing non-logical annotation assertions or, if annotations is provided, an integer containing the
+            number of annotation assertions that were appended to the file.
+
+    Raises:
+        OSError: If filepath points to a non-existent file.
+        TypeError: If filepath points to an empty file.
+        ValueError: If graph_store is not "memory" or "sqlite".
+    """
+
+    if graph_store not in graph_stores: raise ValueError('graph_store not "memory" or "sqlite"')
+    elif not os.path.exists(filepath): raise OSError('{} does not exist!'.format(filepath))
+    elif os.stat(filepath).st_size == 0: raise TypeError('{} is empty'.format(filepath))
+    else: stem = os.path.splitext(filepath)[0]; snapshot = stem + '_' + gets_file_hash(filepath) + '_Split'
+    ext = '_Logic.pkl' if graph_store == 'memory' else '_Logic.db'; temp = '.' + str(os.getpid()) + '.tmp'
+    logic_file, annot_file = snapshot + ext, snapshot + '_Annotations.nt'  # temp files support concurrent builds
+
+    if os.path.exists(logic_file) and os.path.exists(annot_file):
+        print('Loading Logic and Annotation Subsets Snapshot: {}'.format(logic_file.split('/')[-1]))
+        if graph_store != 'memory': logic_graph = copies_graph_store(logic_file)
+        else:
+            with open(logic_file, 'rb') as f: logic_graph = pickle.load(f)
+    else:
+        graph = loads_graph_snapshot(filepath, graph_store=graph_store) if graph is None else graph
+        open(annot_file + temp, 'w').close(); logic_graph, _ = splits_knowledge_graph(graph, False, annot_file + temp)
+        stale = [stem + '_*_Split' + x for x in [ext, '_Annotations.nt', '.pkl']]  # .pkl snapshots hold both subsets
+        for x in [x for y in stale for x in glob.glob(y) if x not in [logic_file, annot_file]]: os.remove(x)
+        os.replace(annot_file + temp, annot_file)  # only complete snapshots are ever visible under the final name
+        if graph_store != 'memory':
+            g = Graph(store=SQLiteStore(logic_file + temp)); g.addN((s, p, o, g) for s, p, o in logic_graph)
+            g.commit(); g.close(); os.replace(logic_file + temp, logic_file); del logic_graph
+            logic_graph = copies_graph_store(logic_file)
+        else:
+            with open(logic_file + temp, 'wb') as f: pickle.dump(logic_graph, f, protocol=4)
+            os.replace(logic_file + temp, logic_file)
+
+    if annotations is not None:  # the snapshot is copied without being parsed
+        annotation_triples: Union[Graph, Set, int] = 0
+        with open(annot_file, 'rb') as f_in, open(annotations, 'ab') as f_out:
+            for chunk in iter(lambda: f_in.read(2 ** 20), b''):
+                f_out.write(chunk); annotation_triples += chunk.count(b'\n')
+    elif graph_store != 'memory':
+        annotation_triples = g = creates_graph(graph_store, os.path.dirname(os.path.abspath(filepath)))
+        g.addN((s, p, o, g) for s, p, o in NTriplesReader().iterates_triples(annot_file))
+    else: annotation_triples = set(NTriplesReader().iterates_triples(annot_file))
+
+    return logic_graph, annotation_triples
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+N-Triples Reader and Writer Utility Functions.
+
+Encodes RDFLib Terms
+* encodes_term
+
+Reads N-Triples Files
+* NTriplesReader
+
+Writes N-Triples Files
+* NTriplesWriter
+"""
+
+# import needed libraries
+import re
+
+from itertools import islice
+from rdflib import BNode, Literal, URIRef  # type: ignore
+from rdflib.exceptions import ParserError  # type: ignore
+from rdflib.plugins.parsers.ntriples import unquote  # type: ignore
+from rdflib.plugins.serializers.nt import _quoteLiteral  # type: ignore
+from typing import Callable, Dict, Generator, IO, Iterable, List, Optional, Tuple, Union
+
+# N-Triples grammar, using the same token patterns as RDFLib's W3CNTriplesParser
+_uriref = r'<[^:]+:[^\s"<>]*>'
+_nodeid = r'_:[A-Za-z0-9_:](?:[-A-Za-z0-9_:\.]*[-A-Za-z0-9_:])?'
+_literal = r'"[^"\\]*(?:\\.[^"\\]*)*"(?:@[a-zA-Z]+(?:-[a-zA-Z0-9]+)*|\^\^' + _uriref + r')?'
+r_triple = re.compile(r'[ \t]*(' + _uriref + '|' + _nodeid + r')[ \t]+(' + _uriref + r')[ \t]+(' + _uriref + '|' +
+                      _nodeid + '|' + _literal + r')[ \t]*\.[ \t]*(?:#.*)?')
+r_literal = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"(?:@([a-zA-Z]+(?:-[a-zA-Z0-9]+)*)|\^\^<([^:]+:[^\s"<>]*)>)?')
+
+
+def encodes_term(term: Union[URIRef, BNode, Literal]) -> str:
+    """Serializes an RDFLib term to meet the RDF 1.1 N-Triples format, escaping Literals the same way as RDFLib's
+    N-Triples serializer (see pkt_kg.utils.n3).
+
+    Args:
+        term: An RDFLib URIRef, BNode, or Literal object.
+
+    Returns:
+        A string containing the serialized term.
+    """
+
+    return _quoteLiteral(term) if isinstance(term, Literal) else term.n3()
+
+
+class NTriplesReader(object):
+    """Class reads N-Triples files line by line. Each line is split into its subject, predicate, and object tokens
+    with a single regular expression built from the token patterns of RDFLib's N-Triples parser, and each distinct
+    token is only parsed into an RDFLib term once. Repeated tokens return the same (interned) term object, and
+    readers that encode terms as integers (e.g. an IntegerTripleStore) can skip the terms entirely and receive the
+    integer id of each token. Escapes are decoded with RDFLib's own unquote, so the terms are equal to the terms
+    returned by RDFLib's parser.
+
+    Attributes:
+        bnode_labels: A bool indicating whether to keep the labels of the BNodes in a file (e.g. "_:N1" is read as
+            BNode("N1")) instead of creating a new BNode for each label, as RDFLib's parser does.
+        cache_size: An integer containing the number of parsed tokens to keep before the token cache is cleared.
+        terms: A dictionary keyed by token with the token's RDFLib term stored as the value.
+        ids: A dictionary keyed by token with the token's integer id stored as the value.
+    """
+
+    def __init__(self, bnode_labels: bool = True, cache_size: int = 2 ** 22) -> None:
+
+        self.bnode_labels: bool = bnode_labels; self.cache_size: int = cache_size
+        self.terms: Dict = dict(); self.ids: Dict = dict(); self._bnodes: Dict = dict()
+
+    @staticmethod
+    def splits_line(line: str) -> Optional[Tuple[str, str, str]]:
+        """Splits an N-Triples line into its serialized subject, predicate, and object tokens.
+
+        Args:
+            line: A string containing a line of an N-Triples file.
+
+        Returns:
+            A tuple of three strings or None when the line is empty or a comment.
+
+        Raises:
+            ParserError: If the line is not a valid N-Triples statement.
+        """
+
+        match = r_triple.fullmatch(line.rstrip('\r\n'))
+        if match is not None: return match.groups()  # type: ignore
+        elif line.strip() == '' or line.lstrip(' \t').startswith('#'): return None
+        else: raise ParserError('Invalid line: {}'.format(line.rstrip('\r\n')))
+
+    def parses_term(self, token: str) -> Union[URIRef, BNode, Literal]:
+        """Parses a serialized N-Triples token into an RDFLib term, returning the cached term for tokens that have
+        already been parsed.
+
+        Args:
+            token: A string containing a serialized URIRef (<...>), BNode (_:...), or Literal ("...").
+
+        Returns:
+            term: An RDFLib URIRef, BNode, or Literal object.
+        """
+
+        term = self.terms.get(token)
+        if term is None:
+            if token[0] == '<': term = URIRef(unquote(token[1:-1]))
+            elif token[0] == '_':
+                label = token[2:]; term = BNode(label) if self.bnode_labels else self._bnodes.get(label)
+                if term is None: term = BNode(); self._bnodes[label] = term
+            else:
+                lex, lang, dtype = r_literal.fullmatch(token).groups()  # type: ignore
+                term = Literal(unquote(lex), lang or None, URIRef(unquote(dtype)) if dtype else None)
+            if len(self.terms) >= self.cache_size: self.terms.clear()
+            self.terms[token] = term
+
+        return term
+
+    def parses_line(self, line: str) -> Optional[Tuple]:
+        """Parses an N-Triples line into a triple of RDFLib terms.
+
+        Args:
+            line: A string containing a line of an N-Triples file.
+
+        Returns:
+            A tuple containing an RDFLib subject, predicate, and object or None when the line is empty or a comment.
+        """
+
+        tokens = self.splits_line(line)
+
+        return None if tokens is None else tuple(self.parses_term(x) for x in tokens)
+
+    def iterates_triples(self, filepath: str, chunk_size: int = 100000) -> Generator:
+        """Streams the triples of an N-Triples file, reading chunk_size lines at a time.
+
+        Args:
+            filepath: A string specifying a path to an N-Triples file.
+            chunk_size: An integer containing the number of lines to read at a time (default=100000).
+
+        Returns:
+            A generator of tuples, where each tuple contains an RDFLib subject, predicate, and object.
+        """
+
+        terms, parses = self.terms, self.parses_term
+        with open(filepath, 'r', encoding='utf-8') as f:
+            while True:
+                lines = list(islice(f, chunk_size))
+                if len(lines) == 0: break
+                for line in lines:
+                    tokens = self.splits_line(line)
+                    if tokens is None: continue
+                    s, p, o = tokens
+                    yield terms.get(s) or parses(s), terms.get(p) or parses(p), terms.get(o) or parses(o)
+
+    def iterates_ids(self, filepath: str, gets_id: Callable, chunk_size: int = 100000) -> Generator:
+        """Streams the triples of an N-Triples file as integer ids. Each distinct token is parsed into an RDFLib
+        term and passed to gets_id only once and the id is reused for every later occurrence of the token.
+
+        Args:
+            filepath: A string specifying a path to an N-Triples file.
+            gets_id: A function that takes an RDFLib term and returns its integer id.
+            chunk_size: An integer containing the number of lines to read at a time (default=100000).
+
+        Returns:
+            A generator of tuples, where each tuple contains the integer ids of a subject, predicate, and object.
+        """
+
+        ids = self.ids
+        with open(filepath, 'r', encoding='utf-8') as f:
+            while True:
+                lines = list(islice(f, chunk_size))
+                if len(lines) == 0: break
+                for line in lines:
+                    tokens = self.splits_line(line)
+                    if tokens is None: continue
+                    row = []
+                    for x in tokens:
+                        i = ids.get(x)
+                        if i is None:
+                            i = gets_id(self.parses_term(x))
+                            if len(ids) >= self.cache_size: ids.clear()
+                            ids[x] = i
+                        row.append(i)
+                    yield tuple(row)
+
+
+class NTriplesWriter(object):
+    """Class writes N-Triples files through an output buffer. The serialized form of each term is cached, so terms
+    that occur in many triples (i.e. every predicate and most nodes) are only serialized once, and lines are written
+    to disk buffer_size at a time. The writer is a context manager, and the buffer is written when the writer is
+    closed. The writer can also be passed to RDFLib's RDF/XML parser in place of a Graph, so each parsed triple is
+    written as soon as it is parsed.
+
+    Example:
+        with NTriplesWriter('PheKnowLator_Full_Logic.nt', 'a') as writer: writer.writes_triples(graph)
+
+    Attributes:
+        filepath: A string specifying a path to an N-Triples file.
+        sep: A string containing the separator written between the terms of a triple (default=' ').
+        buffer_size: An integer containing the number of lines to hold in memory before writing them.
+        cache_size: An integer containing the number of serialized terms to keep before the cache is cleared.
+        encoded: A dictionary keyed by RDFLib term with the term's serialized string stored as the value.
+    """
+
+    def __init__(self, filepath: str, mode: str = 'w', sep: str = ' ', buffer_size: int = 100000,
+                 cache_size: int = 2 ** 20) -> None:
+
+        self.filepath: str = filepath; self.sep: str = sep
+        self.buffer_size: int = buffer_size; self.cache_size: int = cache_size
+        self.encoded: Dict = dict(); self._buffer: List = []
+        self._out: IO = open(filepath, mode, newline='', encoding='utf-8')
+
+    def __enter__(self) -> 'NTriplesWriter':
+
+        return self
+
+    def __exit__(self, *args) -> None:
+
+        self.closes()
+
+    def encodes_term(self, term: Union[URIRef, BNode, Literal]) -> str:
+        """Returns the serialized form of a term, serializing it on its first occurrence."""
+
+        encoded = self.encoded.get(term)
+        if encoded is None:
+            encoded = encodes_term(term)
+            if len(self.encoded) >= self.cache_size: self.encoded.clear()
+            self.encoded[term] = encoded
+
+        return encoded
+
+    def writes_triple(self, s: Union[URIRef, BNode], p: URIRef, o: Union[URIRef, BNode, Literal]) -> None:
+        """Adds a triple to the output buffer, writing the buffer when it is full.
+
+        Args:
+            s: An RDFLib URIRef or BNode object.
+            p: An RDFLib URIRef object.
+            o: An RDFLib URIRef, BNode, or Literal object.
+
+        Returns:
+            None.
+        """
+
+        encodes, sep = self.encodes_term, self.sep
+        self._buffer.append(encodes(s) + sep + encodes(p) + sep + encodes(o) + ' .\n')
+        if len(self._buffer) >= self.buffer_size: self.flushes()
+
+        return None
+
+    def writes_triples(self, triples: Iterable) -> None:
+        """Adds triples (e.g. an RDFLib Graph or a set of triples) to the output buffer.
+
+        Args:
+            triples: An iterable of tuples, where each tuple contains an RDFLib subject, predicate, and object.
+
+        Returns:
+            None.
+        """
+
+        for triple in triples: self.writes_triple(triple[0], triple[1], triple[2])
+
+        return None
+
+    def add(self, triple: Tuple) -> None:
+        """Adds a triple to the output buffer. The method name is the sink interface used by RDFLib's RDF/XML parser."""
+
+        self.writes_triple(triple[0], triple[1], triple[2])
+
+        return None
+
+    def bind(self, prefix: str, namespace: str, override: bool = True) -> None:
+        """Ignores a namespace prefix sent by RDFLib's RDF/XML parser, N-Triples does not use prefixes."""
+
+        return None
+
+    def flushes(self) -> None:
+        """Writes the lines in the output buffer to disk."""
+
+        if len(self._buffer) > 0: self._out.write(''.join(self._buffer)); self._buffer = []
+
+        return None
+
+    def closes(self) -> None:
+        """Writes the lines in the output buffer to disk and closes the file."""
+
+        if not self._out.closed: self.flushes(); self._out.close()
+
+        return None
@@ -0,0 +1,732 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Integer-Coded Triple Store Utility Functions.
+
+Converts RDF Files
+* converts_rdf_to_ntriples
+* loads_ntriples_graph
+
+Streams N-Triples Files
+* iterates_ntriples
+* rewrites_ntriples_bnodes
+
+Stores Knowledge Graphs as Integer Triples
+* IntegerTripleStore
+
+Memory-Mapped Identifier Maps
+* writes_identifier_map
+* IdentifierMap
+
+Compressed Sparse Row Graphs
+* writes_csr_graph
+* CSRGraph
+"""
+
+# import needed libraries
+import glob
+import hashlib
+import json
+import mmap
+import networkx as nx  # type: ignore
+import numpy as np  # type: ignore
+import os
+import os.path
+
+from array import array
+from rdflib import BNode, Graph, Literal, Namespace, URIRef  # type: ignore
+from rdflib.namespace import OWL, RDF  # type: ignore
+from rdflib.parser import create_input_source  # type: ignore
+from rdflib.plugins.parsers.rdfxml import RDFXMLParser  # type: ignore
+from tqdm import tqdm  # type: ignore
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
+
+from pkt_kg.utils.kg_utils import (adds_edges_to_graph, finds_annotation_assertions, finds_connected_components,
+                                    gets_file_hash, n3, pkt_bnode, remaps_pkt_namespace_identifiers,
+                                    rewrites_bnode_namespace)
+from pkt_kg.utils.ntriples import NTriplesReader, NTriplesWriter
+
+
+def converts_rdf_to_ntriples(filepath: str) -> str:
+    """Converts an RDF/XML file (e.g. the output of a reasoner) into an N-Triples file in a single streaming pass.
+    RDFLib's RDF/XML parser sends each triple directly to an NTriplesWriter, which writes it to disk as soon as it is
+    parsed, so the graph is never held in memory. As with loads_graph_snapshot, the filename of the N-Triples file
+    contains an md5 hash of the source file, so the conversion is only performed once per version of a file.
+    N-Triples files are returned unchanged.
+
+    Example:
+        filepath: 'resources/knowledge_graphs/PheKnowLator_v3.0.0_full_instance_inverseRelations_OWL.owl'
+        converted: 'resources/knowledge_graphs/PheKnowLator_v3.0.0_full_instance_inverseRelations_OWL_<md5>.nt'
+
+    Args:
+        filepath: A string specifying a path to an existing RDF/XML or N-Triples file.
+
+    Returns:
+        nt_file: A string containing the path to the N-Triples file.
+
+    Raises:
+        OSError: If filepath points to a non-existent file.
+        TypeError: If filepath points to an empty file.
+    """
+
+    if not os.path.exists(filepath): raise OSError('{} does not exist!'.format(filepath))
+    elif os.stat(filepath).st_size == 0: raise TypeError('{} is empty'.format(filepath))
+    elif filepath.endswith('.nt'): return filepath
+    else: stem = os.path.splitext(filepath)[0]; nt_file = stem + '_' + gets_file_hash(filepath) + '.nt'
+
+    if not os.path.exists(nt_file):
+        print('Converting {} to N-Triples'.format(filepath.split('/')[-1]))
+        for stale in glob.glob(stem + '_' + '[0-9a-f]' * 32 + '.nt'): os.remove(stale)
+        with NTriplesWriter(nt_file + '.tmp') as writer:
+            RDFXMLParser().parse(create_input_source(filepath, format='xml'), writer)
+        os.replace(nt_file + '.tmp', nt_file)  # only complete conversions are ever visible under the final name
+
+    return nt_file
+
+
+def loads_ntriples_graph(filepath: str, graph: Optional[Graph] = None) -> Graph:
+    """Parses an N-Triples file (e.g. a file of triples spilled to disk by a build) into an RDFLib Graph, keeping the
+    labels of the BNodes in the file.
+
+    Args:
+        filepath: A string specifying a path to an N-Triples file.
+        graph: An optional RDFLib Graph (e.g. a disk-backed Graph, see creates_graph) to add the triples to
+            (default=a new in-memory Graph).
+
+    Returns:
+        graph: An RDFLib Graph object.
+    """
+
+    graph = Graph() if graph is None else graph
+    graph.addN((s, p, o, graph) for s, p, o in NTriplesReader().iterates_triples(filepath))
+
+    return graph
+
+
+def iterates_ntriples(filepath: str, chunk_size: int = 100000) -> Generator:
+    """Streams the triples of an N-Triples file, keeping the labels of the BNodes in the file. The file is read
+    chunk_size lines at a time by an NTriplesReader, so only one chunk of lines is ever held in memory.
+
+    Args:
+        filepath: A string specifying a path to an N-Triples file.
+        chunk_size: An integer containing the number of lines to parse at a time (default=100000).
+
+    Returns:
+        A generator of tuples, where each tuple contains an RDFLib subject, predicate, and object.
+    """
+
+    yield from NTriplesReader().iterates_triples(filepath, chunk_size)
+
+
+def rewrites_ntriples_bnodes(filepath: str, output: str, ns: Union[str, Namespace] = pkt_bnode,
+                             remove: bool = False) -> str:
+    """Streams an N-Triples file through pkt_kg.utils.rewrites_bnode_namespace, writing a copy of the file in which
+    a namespace has been added to every BNode (or removed from every namespaced node when remove is True). Neither
+    file is ever loaded into memory, and each distinct term is rewritten and serialized only once.
+
+    Args:
+        filepath: A string specifying a path to an N-Triples file.
+        output: A string specifying a path to the N-Triples file to write.
+        ns: A string or RDFLib Namespace object (default='https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+        remove: A bool indicating whether to remove the namespace from nodes instead of adding it to BNodes
+            (default=False).
+
+    Returns:
+        output: A string containing the path to the rewritten N-Triples file.
+    """
+
+    print('{} Namespace {} BNodes in {}'.format('Removing' if remove else 'Adding', 'from' if remove else 'to',
+                                                filepath.split('/')[-1]))
+    with NTriplesWriter(output + '.tmp') as writer:
+        writer.writes_triples(rewrites_bnode_namespace(iterates_ntriples(filepath), ns, remove))
+    os.replace(output + '.tmp', output)
+
+    return output
+
+
+def writes_identifier_map(entity_map: Dict, filepath: str) -> str:
+    """Writes an identifier-integer map as a sorted string table that can be memory-mapped (see IdentifierMap)
+    instead of parsed. The table is made of two files:
+        - filepath + '.bin': the UTF-8 encoded identifiers, sorted and concatenated without separators.
+        - filepath + '.npy': a numpy int64 array with one row per identifier, in the same order, containing the start
+          and end offset of the identifier in the '.bin' file and its integer.
+
+    Args:
+        entity_map: A dictionary where keys are identifiers and values are integers.
+        filepath: A string containing the path of the map without a file extension.
+
+    Returns:
+        filepath: A string containing the path of the map without a file extension.
+    """
+
+    keys = sorted(k.encode('utf-8') for k in entity_map.keys())
+    index = np.zeros((len(keys), 3), dtype=np.int64)
+    if len(keys) > 0:
+        index[:, 1] = np.cumsum(np.fromiter((len(k) for k in keys), dtype=np.int64, count=len(keys)))
+        index[1:, 0] = index[:-1, 1]
+        index[:, 2] = np.fromiter((entity_map[k.decode('utf-8')] for k in keys), dtype=np.int64, count=len(keys))
+    with open(filepath + '.bin', 'wb') as out: out.write(b''.join(keys))
+    np.save(filepath + '.npy', index)
+
+    return filepath
+
+
+class IdentifierMap(object):
+    """Class provides read-only access to an identifier-integer map written by writes_identifier_map. Both files are
+    memory-mapped, so opening a map with millions of identifiers takes constant time and memory: an identifier is
+    found with a binary search over the sorted string table, and an integer with a binary search over the integers
+    (the order of the integers and the sorted integers are only computed the first time an identifier is looked up by
+    integer).
+
+    Attributes:
+        filepath: A string containing the path of the map without a file extension.
+        index: A memory-mapped numpy array with the start offset, end offset, and integer of each identifier.
+        strings: A memory-mapped bytes object containing the sorted UTF-8 encoded identifiers.
+    """
+
+    def __init__(self, filepath: str) -> None:
+
+        self.filepath: str = filepath
+        self.index: np.ndarray = np.load(filepath + '.npy', mmap_mode='r')
+        with open(filepath + '.bin', 'rb') as f:
+            self.strings: Union[mmap.mmap, bytes] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+                if os.fstat(f.fileno()).st_size > 0 else b''
+        self._int_order: Optional[np.ndarray] = None
+        self._sorted_ints: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+
+        return len(self.index)
+
+    def _gets_key(self, i: int) -> bytes:
+        """Returns the UTF-8 encoded identifier at position i of the string table."""
+
+        return self.strings[int(self.index[i, 0]):int(self.index[i, 1])]
+
+    def _finds_position(self, identifier: str) -> int:
+        """Returns the position of an identifier in the string table or -1 if the map does not contain it."""
+
+        key, lo, hi = identifier.encode('utf-8'), 0, len(self.index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._gets_key(mid) < key: lo = mid + 1
+            else: hi = mid
+
+        return lo if lo < len(self.index) and self._gets_key(lo) == key else -1
+
+    def __contains__(self, identifier: str) -> bool:
+
+        return self._finds_position(identifier) != -1
+
+    def __getitem__(self, identifier: str) -> int:
+
+        position = self._finds_position(identifier)
+        if position == -1: raise KeyError(identifier)
+
+        return int(self.index[position, 2])
+
+    def gets_identifier(self, integer: int) -> str:
+        """Returns the identifier that is mapped to an integer.
+
+        Args:
+            integer: An integer in the map.
+
+        Returns:
+            A string containing the identifier.
+
+        Raises:
+            KeyError: If the map does not contain the integer.
+        """
+
+        if self._int_order is None or self._sorted_ints is None:
+            self._int_order = np.argsort(self.index[:, 2], kind='stable')
+            self._sorted_ints = np.asarray(self.index[self._int_order, 2])
+        ints = self._sorted_ints; i = int(np.searchsorted(ints, integer))
+        if i == len(ints) or ints[i] != integer: raise KeyError(integer)
+
+        return self._gets_key(int(self._int_order[i])).decode('utf-8')
+
+    def items(self) -> Generator:
+        """Yields the identifiers and integers of the map in identifier order."""
+
+        for i in range(len(self.index)): yield self._gets_key(i).decode('utf-8'), int(self.index[i, 2])
+
+
+def _parses_terms(keys: Iterable[str]) -> List:
+    """Parses N3 identifiers (see pkt_kg.utils.n3) back into RDFLib terms, keeping the labels of BNodes."""
+
+    reader = NTriplesReader()
+
+    return [reader.parses_term(k) for k in keys]
+
+
+def writes_csr_graph(write_loc: str, filename: str, graph: Union[Graph, Set, Iterable]) -> str:
+    """Writes the graph created by pkt_kg.utils.convert_to_networkx as a compressed sparse row (CSR) adjacency
+    structure of numpy arrays, which can be memory-mapped and used directly or turned back into the NetworkX
+    MultiDiGraph on demand (see CSRGraph). Nodes are numbered in the order they first occur in the triples, predicates
+    are numbered separately, and the md5 predicate key of each edge is computed once and stored with the edge. The
+    files share the prefix write_loc + filename + '_CSRGraph':
+        - _indptr.npy: int64 array where the out-edges of node i are at positions indptr[i] to indptr[i + 1].
+        - _indices.npy: int32 array containing the object node id of each edge, sorted by subject node id.
+        - _predicates.npy: int32 array containing the predicate id of each edge.
+        - _predicate_keys.npy: array of 32-byte strings containing the md5 predicate key of each edge.
+        - _Nodes.bin/.npy and _Predicates.bin/.npy: identifier-integer maps of the node and predicate ids (see
+          writes_identifier_map).
+
+    Args:
+        write_loc: A string pointing to a local directory for writing data.
+        filename: A string containing the subdirectory and name of the the knowledge graph file.
+        graph: An RDFLib Graph object, a set of RDFLib Graph triples, or an iterable (e.g. a generator) of triples.
+
+    Returns:
+        filepath: A string containing the prefix of the written files.
+    """
+
+    print('Converting Knowledge Graph to CSR Graph')
+
+    filepath = write_loc + filename + '_CSRGraph'; nodes, preds, encoded = dict(), dict(), dict()  # type: ignore
+    rows, pred_keys = array('q'), []
+    for s, p, o in tqdm(graph):
+        for x in (s, p, o):
+            if x not in encoded: encoded[x] = n3(x)
+        if s not in nodes: nodes[s] = len(nodes)
+        if o not in nodes: nodes[o] = len(nodes)
+        if p not in preds: preds[p] = len(preds)
+        rows.append(nodes[s]); rows.append(preds[p]); rows.append(nodes[o])
+        pred_keys.append(hashlib.md5((encoded[s] + encoded[p] + encoded[o]).encode()).hexdigest())
+    if len(nodes) >= 2 ** 31: raise ValueError('The graph has too many nodes for int32 node ids')
+    triples, first = np.unique(np.frombuffer(rows, dtype=np.int64).reshape(-1, 3), axis=0, return_index=True)
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(triples[:, 0], minlength=len(nodes)))
+    np.save(filepath + '_indptr.npy', indptr); np.save(filepath + '_indices.npy', triples[:, 2].astype(np.int32))
+    np.save(filepath + '_predicates.npy', triples[:, 1].astype(np.int32))
+    np.save(filepath + '_predicate_keys.npy', np.array(pred_keys, dtype='S32')[first])
+    writes_identifier_map({encoded[k]: v for k, v in nodes.items()}, filepath + '_Nodes')
+    writes_identifier_map({encoded[k]: v for k, v in preds.items()}, filepath + '_Predicates')
+
+    return filepath
+
+
+class CSRGraph(object):
+    """Class provides read-only access to a graph written by writes_csr_graph. All arrays are memory-mapped, so a
+    graph of any size opens in constant time and memory, and the neighbors of a node are a slice of the arrays. The
+    NetworkX MultiDiGraph created by pkt_kg.utils.convert_to_networkx can be rebuilt when it is needed.
+
+    Attributes:
+        filepath: A string containing the prefix of the files (see writes_csr_graph).
+        indptr: A memory-mapped int64 array of the offsets of the out-edges of each node.
+        indices: A memory-mapped int32 array of the object node id of each edge.
+        predicates: A memory-mapped int32 array of the predicate id of each edge.
+        predicate_keys: A memory-mapped array of the md5 predicate key of each edge.
+        nodes: An IdentifierMap of the N3 identifiers and ids of the nodes.
+        relations: An IdentifierMap of the N3 identifiers and ids of the predicates.
+    """
+
+    def __init__(self, filepath: str) -> None:
+
+        self.filepath: str = filepath
+        self.indptr: np.ndarray = np.load(filepath + '_indptr.npy', mmap_mode='r')
+        self.indices: np.ndarray = np.load(filepath + '_indices.npy', mmap_mode='r')
+        self.predicates: np.ndarray = np.load(filepath + '_predicates.npy', mmap_mode='r')
+        self.predicate_keys: np.ndarray = np.load(filepath + '_predicate_keys.npy', mmap_mode='r')
+        self.nodes: IdentifierMap = IdentifierMap(filepath + '_Nodes')
+        self.relations: IdentifierMap = IdentifierMap(filepath + '_Predicates')
+
+    def number_of_nodes(self) -> int:
+
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+
+        return len(self.indices)
+
+    def gets_node_id(self, node: Union[int, str]) -> int:
+        """Returns the id of a node given as an id or as an N3 identifier (e.g. '<http://purl.obolibrary.org/obo/
+        SO_0000001>')."""
+
+        return node if isinstance(node, (int, np.integer)) else self.nodes[node]
+
+    def gets_neighbors(self, node: Union[int, str]) -> np.ndarray:
+        """Returns an array containing the ids of the objects of the out-edges of a node.
+
+        Args:
+            node: An integer node id or a string containing the N3 identifier of a node.
+
+        Returns:
+            A numpy int32 array of node ids.
+        """
+
+        i = self.gets_node_id(node)
+
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def gets_edges(self, node: Union[int, str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the out-edges of a node.
+
+        Args:
+            node: An integer node id or a string containing the N3 identifier of a node.
+
+        Returns:
+            A tuple of numpy arrays containing the object node ids, predicate ids, and md5 predicate keys of the edges.
+        """
+
+        i = self.gets_node_id(node); start, end = self.indptr[i], self.indptr[i + 1]
+
+        return self.indices[start:end], self.predicates[start:end], self.predicate_keys[start:end]
+
+    def gets_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the edges in coordinate (COO) format as arrays of subject node ids, object node ids, and predicate
+        ids."""
+
+        rows = np.repeat(np.arange(self.number_of_nodes(), dtype=np.int32), np.diff(self.indptr))
+
+        return rows, self.indices, self.predicates
+
+    def finds_connected_components(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the component number of each node id and the size of each component of the graph, treating edges
+        as undirected (see pkt_kg.utils.finds_connected_components)."""
+
+        rows, cols, _ = self.gets_coo()
+
+        return finds_connected_components(rows, cols, self.number_of_nodes())
+
+    def converts_to_networkx(self) -> nx.MultiDiGraph:
+        """Rebuilds the NetworkX MultiDiGraph created by pkt_kg.utils.convert_to_networkx. Each node is keyed by its
+        RDFLib term and has the N3 identifier as its key, and each edge is keyed by its predicate and has the md5
+        predicate key and a weight of 0.0.
+
+        Returns:
+            nx_mdg: A NetworkX MultiDiGraph.
+        """
+
+        print('Converting CSR Graph to MultiDiGraph')
+
+        node_keys = [''] * len(self.nodes); pred_keys = [''] * len(self.relations)
+        for k, v in self.nodes.items(): node_keys[v] = k
+        for k, v in self.relations.items(): pred_keys[v] = k
+        node_terms, pred_terms = _parses_terms(node_keys), _parses_terms(pred_keys)
+        nx_mdg = nx.MultiDiGraph()
+        nx_mdg.add_nodes_from((term, {'key': key}) for term, key in zip(node_terms, node_keys))
+        rows, cols, preds = self.gets_coo()
+        edges = zip(rows.tolist(), cols.tolist(), preds.tolist(), self.predicate_keys.tolist())
+        nx_mdg.add_edges_from((node_terms[s], node_terms[o], pred_terms[p],
+                               {'predicate_key': k.decode(), 'weight': 0.0}) for s, o, p, k in edges)
+
+        return nx_mdg
+
+
+class IntegerTripleStore(object):
+    """Class stores a knowledge graph as integer-coded triples. Each distinct RDFLib term is stored once in a term
+    table and each triple is stored as a row of three term ids in a numpy int64 array, which takes a fraction of the
+    memory of an RDFLib Graph (24 bytes per triple plus one copy of each term). The store can be filled by streaming
+    an N-Triples file and supports the operations needed to finish a build over very large graphs without loading
+    them into an RDFLib Graph: namespacing BNodes, splitting the logic and annotation triples, deriving graph
+    statistics, and writing N-Triples files and integer triple lists. Subsets of the store (e.g. the logic triples)
+    are numpy arrays of rows and can be passed to every method through the triples argument.
+
+    Attributes:
+        terms: A list of RDFLib terms, where the position of a term is its integer id.
+        term_ids: A dictionary keyed by RDFLib term with the term's integer id stored as the value.
+        triples: A numpy array with one row per unique triple and columns for the subject, predicate, and object ids.
+    """
+
+    def __init__(self) -> None:
+
+        self.terms: List = []
+        self.term_ids: Dict = dict()
+        self.triples: np.ndarray = np.empty((0, 3), dtype=np.int64)
+        self._buffer: array = array('q')
+
+    def __len__(self) -> int:
+
+        self._flushes_buffer()
+
+        return len(self.triples)
+
+    def gets_term_id(self, term: Union[URIRef, BNode, Literal]) -> int:
+        """Returns the integer id of a term, adding the term to the term table if it has not been seen before."""
+
+        term_id = self.term_ids.get(term)
+        if term_id is None: term_id = len(self.terms); self.terms.append(term); self.term_ids[term] = term_id
+
+        return term_id
+
+    def gets_ids(self, terms: Iterable) -> np.ndarray:
+        """Returns a numpy array containing the integer ids of the terms that are in the store."""
+
+        return np.array([self.term_ids[x] for x in terms if x in self.term_ids], dtype=np.int64)
+
+    def triple(self, s: Union[URIRef, BNode], p: URIRef, o: Union[URIRef, BNode, Literal]) -> None:
+        """Adds a triple to the store. The method name is the sink interface used by RDFLib's N-Triples parser."""
+
+        self._buffer.append(self.gets_term_id(s)); self._buffer.append(self.gets_term_id(p))
+        self._buffer.append(self.gets_term_id(o))
+
+        return None
+
+    def _flushes_buffer(self) -> None:
+        """Moves buffered triples into the triples array, removing any duplicate triples."""
+
+        if len(self._buffer) > 0:
+            new = np.frombuffer(self._buffer, dtype=np.int64).reshape(-1, 3)
+            self.triples = np.unique(np.concatenate([self.triples, new]), axis=0); self._buffer = array('q')
+
+        return None
+
+    def adds_triples(self, triples: Iterable) -> None:
+        """Adds triples of RDFLib terms (e.g. an RDFLib Graph or a set of triples) to the store.
+
+        Args:
+            triples: An iterable of tuples, where each tuple contains an RDFLib subject, predicate, and object.
+
+        Returns:
+            None.
+        """
+
+        for s, p, o in triples: self.triple(s, p, o)
+        self._flushes_buffer()
+
+        return None
+
+    def encodes_triples(self, triples: Iterable) -> np.ndarray:
+        """Encodes triples of RDFLib terms as rows of term ids without adding them to the store's triples, which lets
+        graphs derived from the store (e.g. the OWL-NETS graphs) share its term table.
+
+        Args:
+            triples: An iterable of tuples, where each tuple contains an RDFLib subject, predicate, and object.
+
+        Returns:
+            A numpy array with one row per unique triple and columns for the subject, predicate, and object ids.
+        """
+
+        rows, ids = array('q'), self.gets_term_id
+        for s, p, o in triples: rows.append(ids(s)); rows.append(ids(p)); rows.append(ids(o))
+
+        return np.unique(np.frombuffer(rows, dtype=np.int64).reshape(-1, 3), axis=0)
+
+    def loads_ntriples(self, filepath: str, bnode_labels: bool = False) -> None:
+        """Streams an N-Triples file into the store, one line at a time. Each distinct token in the file is parsed and
+        looked up in the term table only once.
+
+        Args:
+            filepath: A string specifying a path to an N-Triples file.
+            bnode_labels: A bool indicating whether to keep the labels of the BNodes in the file (e.g. when reading
+                back triples spilled to disk) instead of creating new BNodes (default=False).
+
+        Returns:
+            None.
+        """
+
+        print('Loading {} into an Integer Triple Store'.format(filepath.split('/')[-1]))
+        for row in NTriplesReader(bnode_labels).iterates_ids(filepath, self.gets_term_id): self._buffer.extend(row)
+        self._flushes_buffer()
+
+        return None
+
+    def adds_namespace_to_bnodes(self, ns: Union[str, Namespace] = pkt_bnode) -> None:
+        """Replaces each BNode in the term table with a namespaced URIRef, which is the integer-coded equivalent of
+        pkt_kg.utils.adds_namespace_to_bnodes. Only the term table is rewritten, so the cost is proportional to the
+        number of distinct terms rather than to the number of triples.
+
+        Args:
+            ns: A string or RDFLib Namespace object (default='https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+
+        Returns:
+            None.
+        """
+
+        self._flushes_buffer(); ns_uri, merged = str(ns), dict()
+        for i in [i for i, x in enumerate(self.terms) if isinstance(x, BNode)]:
+            bnode = self.terms[i]; uri = URIRef(ns_uri + str(bnode)); del self.term_ids[bnode]
+            if uri in self.term_ids: merged[i] = self.term_ids[uri]  # namespaced node already exists
+            else: self.terms[i] = uri; self.term_ids[uri] = i
+        if len(merged) > 0:
+            remap = np.arange(len(self.terms), dtype=np.int64); remap[list(merged.keys())] = list(merged.values())
+            self.triples = np.unique(remap[self.triples], axis=0)
+
+        return None
+
+    def updates_pkt_namespace_identifiers(self, const: str, triples: Optional[np.ndarray] = None) -> np.ndarray:
+        """Maps pkt-namespaced BNodes and pkt-namespaced nodes back to their original identifiers, which is the
+        integer-coded equivalent of pkt_kg.utils.updates_pkt_namespace_identifiers. The store's triples are not
+        changed, but the BNodes that are needed are added to the term table, so the returned rows can be passed to
+        every other method of the store.
+
+        Args:
+            const: A string containing the type of construction approach used to build the knowledge graph.
+            triples: An optional numpy array of rows of the store.
+
+        Returns:
+            A numpy array with one row per unique updated triple.
+        """
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+
+        return remaps_pkt_namespace_identifiers(triples, self.terms, self.term_ids, const)
+
+    def splits_knowledge_graph(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Splits the store into the triples needed to maintain a base logical subset and the triples that are
+        annotation assertions. BNodes are namespaced first and the rows of the store are then classified with
+        pkt_kg.utils.finds_annotation_assertions, which is also used by pkt_kg.utils.splits_knowledge_graph.
+
+        Source: https://www.w3.org/TR/owl2-syntax/#Annotation_Assertion
+
+        Returns:
+            logic_triples: A numpy array of the rows of the store containing logical axioms.
+            annotation_triples: A numpy array of the rows of the store containing annotation assertions.
+        """
+
+        self.adds_namespace_to_bnodes(); print('Creating Logic and Annotation Subsets of Graph')
+        is_uri = np.array([isinstance(x, URIRef) for x in self.terms], dtype=bool)
+        annot = finds_annotation_assertions(self.triples, self.term_ids, is_uri)
+        print('Annotation Assertions (n={} Triples)'.format(int(annot.sum())))
+        print('Creating Logic Graph (n={} Triples)'.format(int((~annot).sum())))
+
+        return self.triples[~annot], self.triples[annot]
+
+    def gets_predicates(self, triples: Optional[np.ndarray] = None) -> List:
+        """Returns a list of the RDFLib predicates used in the store or in triples."""
+
+        triples = self.triples if triples is None else triples
+
+        return [self.terms[x] for x in np.unique(triples[:, 1])]
+
+    def iterates_triples(self, triples: Optional[np.ndarray] = None) -> Generator:
+        """Yields the triples of the store (or the rows in triples) as tuples of RDFLib terms."""
+
+        self._flushes_buffer(); terms = self.terms
+        for s, p, o in (self.triples if triples is None else triples).tolist(): yield terms[s], terms[p], terms[o]
+
+    def gets_graph(self, triples: Optional[np.ndarray] = None, predicates: Optional[Iterable] = None,
+                   graph: Optional[Graph] = None) -> Graph:
+        """Creates an RDFLib Graph from the store (or from the rows in triples), optionally keeping only the triples
+        that use one of the given predicates (e.g. to extract node metadata from a small subgraph).
+
+        Args:
+            triples: An optional numpy array of rows of the store.
+            predicates: An optional iterable of RDFLib predicates.
+            graph: An optional RDFLib Graph (e.g. a disk-backed Graph, see creates_graph) to add the triples to
+                (default=a new in-memory Graph).
+
+        Returns:
+            An RDFLib Graph object.
+        """
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+        if predicates is not None: triples = triples[np.isin(triples[:, 1], self.gets_ids(predicates))]
+
+        return adds_edges_to_graph(Graph() if graph is None else graph, list(self.iterates_triples(triples)), False)
+
+    def derives_graph_statistics(self, triples: Optional[np.ndarray] = None) -> str:
+        """Derives the same statistics as pkt_kg.utils.derives_graph_statistics from the store (or from the rows in
+        triples).
+
+        Args:
+            triples: An optional numpy array of rows of the store.
+
+        Returns:
+            stats: A formatted string containing descriptive statistics.
+        """
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+        s, p, o = triples[:, 0], triples[:, 1], triples[:, 2]; rdf_type = self.term_ids.get(RDF.type, -1)
+        nodes, rels = len(np.union1d(s, o)), len(np.unique(p))
+        typed = [len(np.unique(s[(p == rdf_type) & (o == self.term_ids.get(x, -1))]))
+                 for x in [OWL.Class, OWL.NamedIndividual, OWL.ObjectProperty, OWL.AnnotationProperty]]
+        x = ' {} triples, {} nodes, {} predicates, {} classes, {} individuals, {} object props, {} annotation props'
+        stat = 'Graph Stats:' + x.format(len(triples), nodes, rels, typed[0], typed[1], typed[2], typed[3])
+
+        return stat
+
+    def writes_ntriples(self, filepath: str, triples: Optional[np.ndarray] = None) -> None:
+        """Appends the triples of the store (or the rows in triples) to an N-Triples file. Each term is serialized
+        once, no matter how many triples it occurs in.
+
+        Args:
+            filepath: A string specifying a path to an N-Triples file.
+            triples: An optional numpy array of rows of the store.
+
+        Returns:
+            None.
+        """
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+        encoded = {x: n3(self.terms[x]) for x in np.unique(triples).tolist()}
+        with open(filepath, 'a', newline='', encoding='utf-8') as out:
+            for s, p, o in triples.tolist(): out.write(encoded[s] + ' ' + encoded[p] + ' ' + encoded[o] + ' .\n')
+
+        return None
+
+    def gets_entity_map(self, triples: Optional[np.ndarray] = None) -> Dict:
+        """Returns a dictionary keyed by the N3 identifier of each node and relation in the store (or in the rows in
+        triples) with an integer stored as the value. Integers are assigned in term id order, starting at 1, so the
+        map can be shared by every subset of the triples it was built from."""
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+
+        return {n3(self.terms[x]): i + 1 for i, x in enumerate(np.unique(triples).tolist())}
+
+    def maps_ids_to_integers(self, write_location: str, output_ints: str, output_ints_map: str,
+                             triples: Optional[np.ndarray] = None, entity_map: Optional[Dict] = None,
+                             output_format: str = 'text', batch_size: int = 1000000) -> Dict:
+        """Writes the same integer triple list, identifier triple list, and identifier-integer map files as
+        pkt_kg.utils.maps_ids_to_integers from the store (or from the rows in triples), and/or binary versions of the
+        integer triple list and identifier-integer map. Unless entity_map is passed, integers are assigned in the order
+        that nodes and relations first occur in the triples, starting at 1. Each term is serialized once and the
+        triples are mapped to integers with vectorized lookups, then written in batches.
+
+        The binary outputs are:
+            - output_ints with a '.npy' extension: a numpy array with one row per triple and columns for the subject,
+              predicate, and object integers (int32 unless an integer does not fit, then int64).
+            - output_ints_map with '.bin' and '.npy' extensions: a sorted string table of the identifier-integer map,
+              which can be memory-mapped with pkt_kg.utils.IdentifierMap (see writes_identifier_map).
+
+        Args:
+            write_location: A string pointing to a local directory for writing data.
+            output_ints: the name and file path to write out results.
+            output_ints_map: the name and file path to write out results.
+            triples: An optional numpy array of rows of the store.
+            entity_map: An optional dictionary of identifiers and integers covering every node and relation in the
+                triples (see gets_entity_map), which is used to give nodes the same integers in several outputs.
+            output_format: A string containing the outputs to write: "text", "binary", or "both" (default="text").
+            batch_size: An integer containing the number of triples to write at a time (default=1000000).
+
+        Returns:
+            entity_map: A dictionary where keys are identifiers and values are integers.
+
+        Raises:
+            ValueError: If output_format is not "text", "binary", or "both".
+        """
+
+        if output_format not in ['text', 'binary', 'both']:
+            raise ValueError('output_format not "text", "binary", or "both"')
+        print('Mapping Node and Relation Identifiers to Integers')
+
+        self._flushes_buffer(); triples = self.triples if triples is None else triples
+        ids, first = np.unique(triples.ravel(), return_index=True); ids = ids[np.argsort(first)]
+        keys = [n3(self.terms[x]) for x in ids.tolist()]
+        if entity_map is None: entity_map = {k: i + 1 for i, k in enumerate(keys)}
+        else: entity_map = {k: entity_map[k] for k in keys}
+        # map term ids to integers with a sorted lookup table
+        order = np.argsort(ids); sorted_ids = ids[order]
+        codes = np.fromiter((entity_map[k] for k in keys), dtype=np.int64, count=len(keys))[order]
+        if output_format in ['text', 'both']:
+            int_keys, id_keys = ['%d' % x for x in codes.tolist()], [keys[x] for x in order.tolist()]
+            ints = open(write_location + output_ints, 'w', encoding='utf-8')
+            idx = open(write_location + output_ints.replace('Integers', 'Identifiers'), 'w', encoding='utf-8')
+            ints.write('subject' + '\t' + 'predicate' + '\t' + 'object' + '\n')
+            idx.write('subject' + '\t' + 'predicate' + '\t' + 'object' + '\n')
+            for i in tqdm(range(0, len(triples), batch_size)):
+                rows = np.searchsorted(sorted_ids, triples[i:i + batch_size]).tolist()
+                ints.write(''.join([int_keys[s] + '\t' + int_keys[p] + '\t' + int_keys[o] + '\n' for s, p, o in rows]))
+                idx.write(''.join([id_keys[s] + '\t' + id_keys[p] + '\t' + id_keys[o] + '\n' for s, p, o in rows]))
+            ints.close(), idx.close()
+            with open(write_location + '/' + output_ints_map, 'w') as file_name: json.dump(entity_map, file_name)
+        if output_format in ['binary', 'both']:
+            dtype = np.int32 if len(codes) == 0 or codes.max() < 2 ** 31 else np.int64
+            int_triples = codes.astype(dtype)[np.searchsorted(sorted_ids, triples)]
+            np.save(write_location + os.path.splitext(output_ints)[0] + '.npy', int_triples.reshape(-1, 3))
+            writes_identifier_map(entity_map, write_location + '/' + os.path.splitext(output_ints_map)[0])
+
+        return entity_map
@@ -96,15 +96,32 @@ class TestDataUtilsMisc(unittest.TestCase):
         shutil.copy(data_dir + '/data/test_file.nt', src_filepath)
         deduplicates_file(src_filepath)
 
-        # test method
+        # test method -- the last line is a duplicate that is missing its trailing newline
         with open(src_filepath) as f: data = f.readlines()
-        self.assertTrue(len(data) == 5)
+        self.assertTrue(len(data) == 4)
+        self.assertEqual(data, sorted(data))
 
         # clean up environment
         if os.path.exists(src_filepath): os.remove(src_filepath)
 
         return None
 
+    def test_deduplicates_file_runs(self):
+        """Tests the deduplicates_file method when the file is sorted in several runs."""
+
+        src_filepath = self.dir_loc + '/test_file_runs.nt'
+        lines = ['<https://ex.com/{}> <https://ex.com/p> <https://ex.com/o> .\n'.format(x % 50) for x in range(500)]
+        random.shuffle(lines)
+        with open(src_filepath, 'w') as f: f.writelines(lines)
+        deduplicates_file(src_filepath, run_size=1000, temp_directory=self.dir_loc)
+
+        # test method
+        with open(src_filepath) as f: data = f.readlines()
+        self.assertEqual(data, sorted(set(lines)))
+        self.assertEqual([x for x in os.listdir(self.dir_loc) if x.startswith('.pkt_sort_')], [])
+
+        return None
+
     def test_merges_files(self):
         """Tests the merges_files method when a destination location is not provided."""
 
@@ -123,6 +140,22 @@ class TestDataUtilsMisc(unittest.TestCase):
 
         return None
 
+    def test_merges_sorted_files(self):
+        """Tests the merges_sorted_files method."""
+
+        filepaths = [self.dir_loc + '/file_{}.nt'.format(i) for i in range(3)]
+        with open(filepaths[0], 'w') as f: f.write('a .\nc .\ne .\n')
+        with open(filepaths[1], 'w') as f: f.write('b .\nc .\n\nf .')
+        with open(filepaths[2], 'w') as f: f.write('')
+        merges_sorted_files(filepaths, self.dir_loc + '/merged.nt')
+
+        # test method
+        with open(self.dir_loc + '/merged.nt') as f: data = f.readlines()
+        self.assertEqual(data, ['a .\n', 'b .\n', 'c .\n', 'e .\n', 'f .\n'])
+        self.assertFalse(os.path.exists(self.dir_loc + '/merged.nt.tmp'))
+
+        return None
+
     def tests_sublist_creator_dict(self):
         """Tests the sublist_creator method when the input is a dictionary."""
 
@@ -140,6 +173,40 @@ class TestDataUtilsMisc(unittest.TestCase):
 
         return None
 
+    def tests_sublist_creator_dict_ties(self):
+        """Tests the sublist_creator method when the input is a dictionary with duplicate values."""
+
+        actors = {'gene-gene': 10, 'protein-cell': 10, 'chemical-gene': 10, 'rna-anatomy': 1}
+        lists = sublist_creator(actors, 2)
+
+        self.assertEqual(lists, [['gene-gene', 'protein-cell'], ['chemical-gene', 'rna-anatomy']])
+        self.assertEqual(sorted(x for y in lists for x in y), sorted(actors.keys()))
+
+        return None
+
+    def tests_creates_edge_batches(self):
+        """Tests the creates_edge_batches method."""
+
+        actors = {'gene-gene': 100, 'protein-cell': 20, 'chemical-gene': 10, 'rna-anatomy': 0}
+        lists = creates_edge_batches(actors, 3)
+
+        self.assertEqual(len(lists), 3)
+        # gene-gene is larger than the average load (44 edges) and is split into batches on different actors
+        self.assertEqual(lists, [[('gene-gene', 0, 34), ('chemical-gene', 0, 10)],
+                                 [('gene-gene', 34, 68), ('rna-anatomy', 0, 0)],
+                                 [('gene-gene', 68, 100), ('protein-cell', 0, 20)]])
+        for k, v in actors.items():  # each edge is assigned to exactly one batch
+            batches = sorted((x[1], x[2]) for y in lists for x in y if x[0] == k)
+            self.assertEqual(sum(x[1] - x[0] for x in batches), v); self.assertEqual(batches[0][0], 0)
+            self.assertTrue(all(batches[i][1] == batches[i + 1][0] for i in range(len(batches) - 1)))
+
+        # a single actor receives every edge type unsplit
+        self.assertEqual(creates_edge_batches(actors, 1),
+                         [[('gene-gene', 0, 100), ('protein-cell', 0, 20), ('chemical-gene', 0, 10),
+                           ('rna-anatomy', 0, 0)]])
+
+        return None
+
     def tests_sublist_creator_list(self):
         """Tests the sublist_creator method when the input is a dictionary."""
 
@@ -1,4 +1,5 @@
 import glob
+import json
 import logging
 import os.path
 import pandas
@@ -362,6 +363,25 @@ class TestCreatesEdgeList(unittest.TestCase):
                                                                  cpus=1)
         ray.shutdown()
         self.assertTrue(os.path.exists(self.dir_loc + '/Master_Edge_List_Dict.json'))
+        self.assertTrue(os.path.exists(self.dir_loc + '/Master_Edge_List_Profile.json'))
+        self.assertTrue(os.path.exists(self.dir_loc + '/pkt_metrics.prom'))
+
+        return None
+
+    def tests_constructs_edge_list_executors(self):
+        """Tests the constructs_edge_list method returns identical results with each execution backend."""
+
+        results = []; cwd = os.getcwd(); os.chdir(self.dir_loc)  # mapping files in resource_info are relative
+        for executor in ['ray', 'pool', 'serial']:
+            if executor == 'ray': ray.init(local_mode=True)
+            self.master_edge_list.runs_creates_knowledge_graph_edges(self.dir_loc + '/resource_info.txt',
+                                                                     self.edge_data_files, 2, executor)
+            if executor == 'ray': ray.shutdown()
+            with open(self.dir_loc + '/Master_Edge_List_Dict.json', 'r') as f: results += [json.load(f)]
+        os.chdir(cwd)
+        self.assertEqual(len(results[0]['gene-disease']['edge_list']), 5)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
 
         return None
 
@@ -370,5 +390,8 @@ class TestCreatesEdgeList(unittest.TestCase):
 
         shutil.copyfile(self.dir_loc + '/edge_data/Master_Edge_List_Dict.json',
                         self.dir_loc + '/Master_Edge_List_Dict.json')
+        if os.path.exists(self.dir_loc + '/Master_Edge_List_Profile.json'):
+            os.remove(self.dir_loc + '/Master_Edge_List_Profile.json')
+        if os.path.exists(self.dir_loc + '/pkt_metrics.prom'): os.remove(self.dir_loc + '/pkt_metrics.prom')
 
         return None
@@ -0,0 +1,121 @@
+import glob
+import logging
+import os.path
+import ray
+import unittest
+
+from ray.cluster_utils import Cluster  # type: ignore
+
+from pkt_kg.executors import *
+
+
+class ActorTester(object):
+    """Simple actor class used to test the execution backends."""
+
+    def __init__(self, shared: dict, offset: int) -> None:
+
+        self.shared = shared; self.offset = offset; self.results: list = []
+
+    def adds_value(self, key: str) -> None:
+
+        self.results += [self.shared[key] + self.offset]
+
+        return None
+
+    def gets_results(self) -> list:
+
+        return self.results
+
+    def gets_offset(self) -> int:
+
+        return self.offset
+
+    def gets_node(self) -> str:
+
+        return ray.get_runtime_context().get_node_id()
+
+
+class TestExecutors(unittest.TestCase):
+    """Class to test the execution backends."""
+
+    def setUp(self):
+        # initialize file location
+        current_directory = os.path.dirname(__file__)
+
+        # handle logging
+        self.logs = os.path.abspath(current_directory + '/builds/logs')
+        logging.disable(logging.CRITICAL)
+        if len(glob.glob(self.logs + '/*.log')) > 0: os.remove(glob.glob(self.logs + '/*.log')[0])
+
+        # create test data
+        self.shared = ({'a': 1, 'b': 2, 'c': 3},)
+        self.actor_args = [(0,), (10,), (100,)]
+        self.tasks = [[('adds_value', ('a',)), ('adds_value', ('b',))], [('adds_value', ('c',))], []]
+        self.expected = [[[1, 2], [13], []], [0, 10, 100]]
+
+        return None
+
+    def test_gets_executor(self):
+        """Tests the gets_executor method."""
+
+        self.assertIsInstance(gets_executor('ray', 2), RayExecutor)
+        self.assertIsInstance(gets_executor('Pool', 2), PoolExecutor)
+        self.assertIsInstance(gets_executor('serial', 2), SerialExecutor)
+        self.assertIsInstance(gets_executor(None, 2), RayExecutor)
+        self.assertEqual(gets_executor('pool', 2).cpus, 2)
+        self.assertRaises(ValueError, gets_executor, 'dask', 2)
+
+        return None
+
+    def test_runs_actors_ray(self):
+        """Tests the runs_actors method using the ray backend."""
+
+        ray.init(local_mode=True, ignore_reinit_error=True)
+        executor = gets_executor('ray', 3)
+        results = executor.runs_actors(ActorTester, self.shared, self.actor_args, self.tasks,
+                                       ['gets_results', 'gets_offset'])
+        ray.shutdown()
+        self.assertEqual(executor.gets_backend_type(), 'ray')
+        self.assertEqual(results, self.expected)
+
+        return None
+
+    def test_runs_actors_ray_cluster(self):
+        """Tests the runs_actors method using the ray backend on a local multi-node Ray cluster."""
+
+        cluster = Cluster(initialize_head=True, head_node_args={'num_cpus': 1})
+        for _ in range(2): cluster.add_node(num_cpus=1)
+        try:
+            executor = gets_executor('ray', 3, cluster.address)
+            self.assertEqual(executor.address, cluster.address)
+            results = executor.runs_actors(ActorTester, self.shared, self.actor_args, self.tasks,
+                                           ['gets_results', 'gets_offset', 'gets_node'])
+            nodes = set(x['NodeID'] for x in ray.nodes() if x['Alive']); self.assertEqual(len(nodes), 3)
+        finally: ray.shutdown(); cluster.shutdown()
+        self.assertEqual(results[0:2], self.expected)
+        self.assertTrue(set(results[2]) <= nodes)  # SPREAD is best-effort, so the actors can share a node
+
+        return None
+
+    def test_runs_actors_pool(self):
+        """Tests the runs_actors method using the process pool backend."""
+
+        executor = gets_executor('pool', 2)
+        results = executor.runs_actors(ActorTester, self.shared, self.actor_args, self.tasks,
+                                       ['gets_results', 'gets_offset'])
+        self.assertEqual(executor.gets_backend_type(), 'pool')
+        self.assertEqual(results, self.expected)
+        self.assertEqual(executor.runs_actors(ActorTester, self.shared, [], [], ['gets_results']), [[]])
+
+        return None
+
+    def test_runs_actors_serial(self):
+        """Tests the runs_actors method using the serial backend."""
+
+        executor = gets_executor('serial', 2)
+        results = executor.runs_actors(ActorTester, self.shared, self.actor_args, self.tasks,
+                                       ['gets_results', 'gets_offset'])
+        self.assertEqual(executor.gets_backend_type(), 'serial')
+        self.assertEqual(results, self.expected)
+
+        return None
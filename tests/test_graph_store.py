@@ -0,0 +1,116 @@
+import gc
+import os
+import os.path
+import pickle
+import shutil
+import unittest
+
+from rdflib import BNode, Graph, Literal, Namespace, URIRef  # type: ignore
+from rdflib.namespace import OWL, RDF, RDFS, XSD  # type: ignore
+
+from pkt_kg.utils import *
+
+# set global attributes
+obo = Namespace('http://purl.obolibrary.org/obo/')
+
+
+class TestGraphStore(unittest.TestCase):
+    """Class to test the disk-backed graph store utility methods."""
+
+    def setUp(self):
+        # initialize data location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data')
+        self.dir_loc = os.path.abspath(dir_loc)
+
+        # set-up environment - make temp directory
+        self.temp_dir = self.dir_loc + '/graph_store'
+        os.mkdir(self.temp_dir)
+
+        # create triples with each type of term
+        self.triples = [(obo.SO_0000001, RDF.type, OWL.Class), (obo.SO_0000001, RDFS.subClassOf, BNode('N1')),
+                        (BNode('N1'), OWL.onProperty, obo.RO_0002202),
+                        (obo.SO_0000001, RDFS.label, Literal('region')),
+                        (obo.SO_0000001, RDFS.label, Literal('region', lang='en')),
+                        (obo.SO_0000001, RDFS.label, Literal('region', datatype=XSD.string)),
+                        (obo.SO_0000001, RDFS.comment, Literal('a "quoted"\nregion\\')),
+                        (obo.SO_0000001, obo.IAO_0000115, Literal(5))]
+
+        return None
+
+    def test_sqlite_store(self):
+        """Tests the SQLiteStore class."""
+
+        filepath = self.temp_dir + '/graph.db'
+        graph = Graph(store=SQLiteStore(filepath)); graph.addN((s, p, o, graph) for s, p, o in self.triples)
+        graph.add(self.triples[0]); memory = Graph(); memory.addN((s, p, o, memory) for s, p, o in self.triples)
+        self.assertEqual(len(graph), len(self.triples))
+        self.assertEqual(set(graph), set(self.triples))
+
+        # test that triple patterns return the same triples as an in-memory graph
+        for s, p, o in self.triples:
+            for pattern in [(s, None, None), (None, p, None), (None, None, o), (s, p, None), (None, p, o), (s, p, o)]:
+                self.assertEqual(set(graph.triples(pattern)), set(memory.triples(pattern)))
+        self.assertEqual(list(graph.triples((obo.SO_0000002, None, None))), [])
+        self.assertIn(self.triples[4], graph); self.assertNotIn((obo.SO_0000001, RDFS.label, Literal('x')), graph)
+
+        # test removing triples
+        graph.remove((obo.SO_0000001, RDFS.label, None)); memory.remove((obo.SO_0000001, RDFS.label, None))
+        self.assertEqual(len(graph), len(self.triples) - 3); self.assertEqual(set(graph), set(memory))
+
+        # test that the triples and namespaces are kept when the database is reopened
+        graph.bind('obo', obo); graph.close(True)
+        graph = Graph(store=SQLiteStore(filepath))
+        self.assertEqual(set(graph), set(memory)); self.assertEqual(graph.store.namespace('obo'), URIRef(obo))
+        graph.close()
+
+        return None
+
+    def test_sqlite_store_pickle(self):
+        """Tests that a pickled SQLiteStore Graph is reopened from the same database."""
+
+        graph = creates_graph('sqlite', self.temp_dir); graph.addN((s, p, o, graph) for s, p, o in self.triples)
+        copy = pickle.loads(pickle.dumps(graph))
+        self.assertIsInstance(copy.store, SQLiteStore); self.assertFalse(copy.store.temporary)
+        self.assertEqual(copy.store.filepath, graph.store.filepath)
+        self.assertEqual(set(copy), set(self.triples))
+        copy.close()
+
+        return None
+
+    def test_creates_graph(self):
+        """Tests the creates_graph method."""
+
+        self.assertNotIsInstance(creates_graph().store, SQLiteStore)
+        self.assertRaises(ValueError, creates_graph, 'disk')
+
+        # test that temporary databases are removed when the graph is closed or freed
+        graph = creates_graph('sqlite', self.temp_dir); filepath = graph.store.filepath
+        self.assertTrue(os.path.exists(filepath)); graph.close(); self.assertFalse(os.path.exists(filepath))
+        graph = creates_graph('sqlite', self.temp_dir); filepath = graph.store.filepath
+        del graph; gc.collect(); self.assertFalse(os.path.exists(filepath))
+
+        return None
+
+    def test_copies_graph_store(self):
+        """Tests the copies_graph_store method."""
+
+        filepath = self.temp_dir + '/graph.db'
+        graph = Graph(store=SQLiteStore(filepath)); graph.addN((s, p, o, graph) for s, p, o in self.triples)
+        graph.commit(); graph.close()
+
+        # test that changing the copy does not change the database
+        copy = copies_graph_store(filepath); self.assertNotEqual(copy.store.filepath, filepath)
+        self.assertEqual(set(copy), set(self.triples)); copy.remove((None, RDFS.label, None))
+        graph = Graph(store=SQLiteStore(filepath)); self.assertEqual(len(graph), len(self.triples))
+        copy.close(); graph.close()
+        self.assertEqual(os.listdir(self.temp_dir), ['graph.db'])
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.temp_dir)
+
+        return None
@@ -1,8 +1,10 @@
 import glob
 import networkx as nx
+import numpy as np  # type: ignore
 import os
 import os.path
 import shutil
+import subprocess
 import unittest
 
 from mock import patch
@@ -75,6 +77,60 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    @patch('pkt_kg.utils.kg_utils.subprocess.check_call')
+    def test_merges_ontologies_single_call(self, mock_call):
+        """Tests the merges_ontologies method merges all ontologies in one call when a single worker is used."""
+
+        onts = [self.dir_loc + '/ont_{}.owl'.format(i) for i in range(5)]
+        merges_ontologies(onts, self.dir_loc, self.merged_ontology_file, self.owltools_location, 1)
+        self.assertEqual(mock_call.call_count, 1)
+        args = mock_call.call_args[0][0]
+        self.assertEqual(args[1:6], onts)
+        self.assertEqual(args[-1], self.dir_loc + self.merged_ontology_file)
+
+        return None
+
+    @patch('pkt_kg.utils.kg_utils.subprocess.check_call')
+    def test_merges_ontologies_tree(self, mock_call):
+        """Tests the merges_ontologies method merges ontologies in a balanced tree when several workers are used."""
+
+        onts = [self.dir_loc + '/ont_{}.owl'.format(i) for i in range(5)]
+        merges_ontologies(onts, self.dir_loc, self.merged_ontology_file, self.owltools_location, 4)
+        calls = [x[0][0] for x in mock_call.call_args_list]
+        self.assertEqual(len(calls), 4)  # n - 1 pairwise merges
+        self.assertTrue(all(len(x) == 6 for x in calls))
+        # the final merge writes the merged file and keeps the first ontology as the main ontology
+        final = [x for x in calls if x[-1] == self.dir_loc + self.merged_ontology_file]
+        self.assertEqual(len(final), 1)
+        self.assertEqual(final[0][1], self.dir_loc + '/PheKnowLator_MergedOntologies_1_0.owl')
+        self.assertEqual(calls[0][1:3], onts[0:2])
+        # original ontology files are never used as outputs
+        self.assertFalse(any(x[-1] in onts for x in calls))
+
+        return None
+
+    @patch('pkt_kg.utils.kg_utils.subprocess.check_call')
+    def test_merges_ontologies_failure(self, mock_call):
+        """Tests the merges_ontologies method raises an error when an OWLTools merge fails."""
+
+        onts = [self.dir_loc + '/ont_{}.owl'.format(i) for i in range(5)]
+
+        # test method -- a failed merge in a single call is raised
+        mock_call.side_effect = subprocess.CalledProcessError(1, 'owltools')
+        self.assertRaises(subprocess.CalledProcessError, merges_ontologies, onts, self.dir_loc,
+                          self.merged_ontology_file, self.owltools_location, 1)
+
+        # test method -- a failed merge in the tree is raised and the intermediate files are removed
+        def merge(args):
+            if args[-1].endswith('_0_1.owl'): raise subprocess.CalledProcessError(1, args)
+            else: open(args[-1], 'w').close()
+        mock_call.side_effect = merge
+        self.assertRaises(subprocess.CalledProcessError, merges_ontologies, onts, self.dir_loc,
+                          self.merged_ontology_file, self.owltools_location, 4)
+        self.assertEqual(glob.glob(self.dir_loc + '/PheKnowLator_MergedOntologies*.owl'), [])
+
+        return None
+
     def test_ontology_file_formatter(self):
         """Tests the ontology_file_formatter method."""
 
@@ -408,6 +464,39 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    def test_annotation_index(self):
+        """Tests the AnnotationIndex class."""
+
+        # create graph with annotations
+        oboinowl = Namespace('http://www.geneontology.org/formats/oboInOwl#')
+        skos = Namespace('http://www.w3.org/2004/02/skos/core#')
+        graph = Graph()
+        graph.add((obo.SO_0000001, RDFS.label, Literal('region'))); graph.add((obo.SO_0000001, RDFS.label,
+                                                                                Literal('région', lang='fr')))
+        graph.add((obo.SO_0000001, obo.IAO_0000115, Literal('A sequence feature.', lang='en')))
+        graph.add((obo.SO_0000001, oboinowl.hasExactSynonym, Literal('Sequence')))
+        graph.add((obo.SO_0000001, oboinowl.hasDbXref, Literal('SOFA:SOFA_0000001')))
+        graph.add((obo.SO_0000001, skos.exactMatch, obo.SOFA_0000001))
+        graph.add((BNode('N1'), oboinowl.hasRelatedSynonym, Literal('bnode synonym')))
+        index = AnnotationIndex(graph)
+
+        # test entity lookups
+        self.assertEqual(index.gets_labels(obo.SO_0000001), [Literal('region')])
+        self.assertEqual(index.gets_definitions(obo.SO_0000001), [Literal('A sequence feature.', lang='en')])
+        self.assertEqual(index.gets_synonyms(obo.SO_0000001), [(oboinowl.hasExactSynonym, Literal('Sequence'))])
+        self.assertEqual(index.gets_labels(obo.SO_0000002), [])
+
+        # test that the extractors return the same results with and without the index
+        synonyms = gets_ontology_class_synonyms(graph, index)
+        self.assertEqual(synonyms, ({'sequence': [str(obo.SO_0000001)]}, {'sequence': 'hasExactSynonym'}))
+        self.assertEqual(synonyms, gets_ontology_class_synonyms(graph))
+        dbxrefs = gets_ontology_class_dbxrefs(graph, index)
+        self.assertEqual(dbxrefs[1], {'sofa:sofa_0000001': 'DbXref', str(obo.SOFA_0000001).lower(): 'ExactMatch'})
+        self.assertEqual(dbxrefs, gets_ontology_class_dbxrefs(graph))
+        self.assertEqual(gets_ontology_definitions(graph, index), gets_ontology_definitions(graph))
+
+        return None
+
     def test_finds_entity_ancestors(self):
         """Tests the finds_class_ancestors method."""
 
@@ -456,6 +545,35 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    def test_ancestor_index(self):
+        """Tests the AncestorIndex class."""
+
+        # load ontology
+        graph = Graph().parse(self.good_ontology_file_location, format='xml')
+        index = AncestorIndex(graph)
+
+        # test that the index returns the same ordered lists as gets_entity_ancestors
+        for x in sorted(set(graph.subjects(RDFS.subClassOf, None)))[0:50]:
+            self.assertEqual(index.gets_ancestors(x), gets_entity_ancestors(graph, [x], RDFS.subClassOf))
+            self.assertEqual(index.gets_ancestors(x, True), gets_entity_ancestors(graph, [x], RDFS.subClassOf, [x]))
+        ancestors = gets_entity_ancestors(graph, [obo.SO_0000348], RDFS.subClassOf, [obo.SO_0000348])
+        self.assertEqual(index.gets_ancestors('SO_0000348', True), ancestors)
+        # test that returned lists can be changed without changing the index
+        ancestors = index.gets_ancestors(obo.SO_0000348); ancestors.append('SO_0000000')
+        self.assertNotIn('SO_0000000', index.gets_ancestors(obo.SO_0000348))
+
+        # test that adding and removing edges updates the memoized ancestors of descendants
+        graph = Graph(); graph.add((obo.SO_0000003, RDFS.subClassOf, obo.SO_0000002))
+        graph.add((obo.SO_0000002, RDFS.subClassOf, obo.SO_0000001)); index = AncestorIndex(graph)
+        self.assertEqual(index.gets_ancestors(obo.SO_0000003), [str(obo.SO_0000001), str(obo.SO_0000002)])
+        graph.add((obo.SO_0000001, RDFS.subClassOf, obo.SO_0000000)); index.adds_edge(obo.SO_0000001, obo.SO_0000000)
+        self.assertEqual(index.gets_ancestors(obo.SO_0000003), gets_entity_ancestors(graph, [obo.SO_0000003]))
+        graph.remove((obo.SO_0000002, RDFS.subClassOf, obo.SO_0000001))
+        index.removes_edge(obo.SO_0000002, obo.SO_0000001)
+        self.assertEqual(index.gets_ancestors(obo.SO_0000003), [str(obo.SO_0000002)])
+
+        return None
+
     def test_connected_components_true(self):
         """Method tests the connected_graph method when the graph is connected."""
 
@@ -490,6 +608,22 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    def test_finds_connected_components(self):
+        """Method tests the finds_connected_components method."""
+
+        # test method -- components {0, 1, 2}, {3, 4}, and an isolated node {5}
+        labels, sizes = finds_connected_components(np.array([2, 1, 4]), np.array([1, 0, 3]), 6)
+        self.assertEqual(labels.tolist(), [0, 0, 0, 1, 1, 2])
+        self.assertEqual(sizes.tolist(), [3, 2, 1])
+        # test a long path, which needs several rounds of hooking
+        labels, sizes = finds_connected_components(np.arange(999, 0, -1), np.arange(998, -1, -1))
+        self.assertEqual(sizes.tolist(), [1000]); self.assertEqual(set(labels.tolist()), {0})
+        # test an empty graph
+        labels, sizes = finds_connected_components(np.array([], dtype=int), np.array([], dtype=int))
+        self.assertEqual((len(labels), len(sizes)), (0, 0))
+
+        return None
+
     def test_removes_self_loops(self):
         """Method tests the removes_self_loops method."""
 
@@ -553,6 +687,33 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    def test_derives_graph_statistics_ntriples(self):
+        """Tests the derives_graph_statistics method for an N-Triples file."""
+
+        # create test data and write it locally
+        filepath = self.dir_loc + '/TEST_Stats.nt'
+        graph = Graph()
+        for i in range(50):
+            graph.add((URIRef(obo + 'SO_{}'.format(i)), RDF.type, OWL.Class if i % 5 else OWL.NamedIndividual))
+            graph.add((URIRef(obo + 'SO_{}'.format(i)), RDFS.label, Literal('label "{}"\nline'.format(i), lang='en')))
+            graph.add((URIRef(obo + 'SO_{}'.format(i)), RDFS.comment, Literal(str(obo + 'SO_{}'.format(i)))))
+            graph.add((BNode('N{}'.format(i % 3)), RDFS.subClassOf, URIRef(obo + 'SO_{}'.format(i // 2))))
+        graph.add((RDFS.label, RDF.type, OWL.AnnotationProperty))
+        graph.add((obo.RO_0002606, RDF.type, OWL.ObjectProperty))
+        graph.serialize(filepath, format='nt')
+        appends_to_existing_file(list(graph)[0:10], filepath)  # duplicate triples are only counted once
+
+        # test method
+        stats = derives_graph_statistics(filepath)
+        self.assertEqual(stats, derives_graph_statistics(graph))
+        self.assertEqual(derives_ntriples_statistics(filepath, chunk_size=7), stats)
+        self.assertEqual(glob.glob(self.dir_loc + '/.pkt_sort_*'), [])  # the sorted runs are removed
+
+        # clean up environment
+        if os.path.exists(filepath): os.remove(filepath)
+
+        return None
+
     def test_adds_namespace_to_bnodes(self):
         """Tests the adds_namespace_to_bnodes method"""
 
@@ -583,6 +744,28 @@ class TestKGUtils(unittest.TestCase):
 
         return None
 
+    def test_rewrites_bnode_namespace(self):
+        """Tests the rewrites_bnode_namespace method."""
+
+        # generate testing data
+        pkt_bnode = Namespace('https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+        triples = [(obo.SO_0000001, RDFS.subClassOf, BNode('N1')), (BNode('N1'), OWL.onProperty, obo.RO_0002202),
+                   (BNode('N1'), RDFS.label, Literal('region'))]
+        namespaced = [(obo.SO_0000001, RDFS.subClassOf, pkt_bnode.N1), (pkt_bnode.N1, OWL.onProperty, obo.RO_0002202),
+                      (pkt_bnode.N1, RDFS.label, Literal('region'))]
+
+        # test method
+        self.assertEqual(list(rewrites_bnode_namespace(iter(triples), pkt_bnode)), namespaced)
+        self.assertEqual(list(rewrites_bnode_namespace(namespaced, str(pkt_bnode), remove=True)), triples)
+
+        # test that rewritten nodes are shared and that literals which look like namespaced nodes are not rewritten
+        rewritten = list(rewrites_bnode_namespace(iter(triples), pkt_bnode))
+        self.assertIs(rewritten[0][2], rewritten[1][0]); self.assertIs(rewritten[0][0], triples[0][0])
+        literal = (obo.SO_0000001, RDFS.comment, Literal(str(pkt_bnode.N1)))
+        self.assertEqual(list(rewrites_bnode_namespace([literal], pkt_bnode, remove=True)), [literal])
+
+        return None
+
     def test_splits_knowledge_graph_true(self):
         """Tests the splits_knowledge_graph method when a Graph() object should be returned."""
 
@@ -609,6 +792,43 @@ class TestKGUtils(unittest.TestCase):
         self.assertIsInstance(subsets[0], Graph)
         self.assertIsInstance(subsets[1], Set)
 
+        # test method -- the annotation subset is written to a file
+        filepath = self.dir_loc + '/TEST_Annotations.nt'; open(filepath, 'w').close()
+        logic_graph, n = splits_knowledge_graph(graph, annotations=filepath)
+        self.assertEqual(n, len(subsets[1])); self.assertEqual(set(logic_graph), set(subsets[0]))
+        self.assertEqual(set(iterates_ntriples(filepath)), subsets[1]); os.remove(filepath)
+
+        return None
+
+    def test_finds_annotation_assertions(self):
+        """Tests the finds_annotation_assertions method."""
+
+        # generate testing data
+        pkt_bnode = Namespace('https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+        axiom, syn = pkt_bnode.N1, URIRef('http://www.geneontology.org/formats/oboInOwl#hasExactSynonym')
+        triples = [(obo.SO_0000001, RDF.type, OWL.Class), (obo.SO_0000001, RDFS.subClassOf, obo.SO_0000110),
+                   (obo.SO_0000001, RDFS.label, Literal('region')), (RDFS.label, RDF.type, OWL.AnnotationProperty),
+                   (obo.SO_0000001, syn, Literal('sequence')), (syn, RDF.type, OWL.AnnotationProperty),
+                   (axiom, RDF.type, OWL.Axiom), (axiom, OWL.annotatedSource, obo.SO_0000001),
+                   (axiom, OWL.annotatedProperty, RDFS.subClassOf), (axiom, OWL.annotatedTarget, obo.SO_0000110),
+                   (axiom, RDFS.label, Literal('region axiom'))]
+        terms = list(dict.fromkeys(x for triple in triples for x in triple)); ids = {x: i for i, x in enumerate(terms)}
+        rows = np.array([[ids[x] for x in triple] for triple in triples], dtype=np.int64)
+        is_uri = np.array([isinstance(x, URIRef) for x in terms], dtype=bool)
+
+        # test method
+        annotations = finds_annotation_assertions(rows, ids, is_uri).tolist()
+        self.assertEqual(annotations, [False, False, True, False, True, False, False, False, False, False, True])
+        # test that terms that are not in the triples can be omitted
+        self.assertEqual(finds_annotation_assertions(rows[0:2], ids, is_uri).tolist(), [False, False])
+        self.assertEqual(finds_annotation_assertions(np.empty((0, 3), dtype=np.int64), {}, is_uri).tolist(), [])
+        # test that the split uses the same partition
+        logic_graph, annotation_triples = splits_knowledge_graph(set(triples))
+        self.assertEqual(annotation_triples, {x for x, y in zip(triples, annotations) if y})
+        self.assertEqual(set(logic_graph), {x for x, y in zip(triples, annotations) if not y})
+        store = IntegerTripleStore(); store.adds_triples(triples); logic, annot = store.splits_knowledge_graph()
+        self.assertEqual(set(store.iterates_triples(annot)), annotation_triples)
+
         return None
 
     def test_appends_to_existing_file(self):
@@ -775,3 +995,175 @@ class TestKGUtils(unittest.TestCase):
                           RDFS.subClassOf, URIRef('http://www.ncbi.nlm.nih.gov/gene/4841'))) in result_graph)
 
         return None
+
+    def test_remaps_pkt_namespace_identifiers(self):
+        """Tests the remaps_pkt_namespace_identifiers method."""
+
+        node = URIRef('https://github.com/callahantiff/PheKnowLator/pkt/Nf1f6ce0f4e4eddb81d48e89115facef2')
+        terms = [node, RDFS.subClassOf, obo.DOID_3075, RDF.type, OWL.Class, obo.RO_0003302, obo.DOID_1080]
+        term_ids = {x: i for i, x in enumerate(terms)}
+        triples = np.array([[0, 1, 2], [0, 3, 4], [2, 3, 4], [0, 5, 6]], dtype=np.int64)
+
+        # test that pkt-namespaced nodes are mapped to their class and that self-loops are not added
+        result = remaps_pkt_namespace_identifiers(triples, terms, term_ids, 'subclass')
+        self.assertEqual(result.tolist(), [[2, 3, 4], [2, 5, 6]])
+
+        # test that the input is returned when there is nothing to update
+        self.assertIs(remaps_pkt_namespace_identifiers(triples, terms, term_ids, 'instance'), triples)
+
+        return None
+
+    def test_gets_file_hash(self):
+        """Tests the gets_file_hash method."""
+
+        # create test data and write it locally
+        filepath = self.dir_loc + '/TEST_Hash.nt'
+        graph = Graph(); graph.add((obo.SO_0000288, RDFS.subClassOf, obo.SO_0000287))
+        graph.serialize(filepath, format='nt')
+
+        # test method
+        file_hash = gets_file_hash(filepath)
+        self.assertIsInstance(file_hash, str)
+        self.assertEqual(len(file_hash), 32)
+        self.assertEqual(file_hash, gets_file_hash(filepath, chunk_size=8))
+
+        # clean up environment
+        if os.path.exists(filepath): os.remove(filepath)
+
+        return None
+
+    def test_loads_graph_snapshot(self):
+        """Tests the loads_graph_snapshot method."""
+
+        # create test data and write it locally
+        filepath = self.dir_loc + '/TEST_Snapshot.owl'
+        graph = Graph(); graph.add((obo.SO_0000288, RDFS.subClassOf, obo.SO_0000287))
+        graph.add((obo.SO_0000288, RDFS.label, Literal('Teprotide'))); graph.serialize(filepath, format='xml')
+
+        # test method -- snapshot is created on first load
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Snapshot_*_Snapshot.pkl')), 0)
+        loaded = loads_graph_snapshot(filepath)
+        snapshots = glob.glob(self.dir_loc + '/TEST_Snapshot_*_Snapshot.pkl')
+        self.assertEqual(len(snapshots), 1)
+        self.assertIn(gets_file_hash(filepath), snapshots[0])
+        self.assertEqual(set(loaded), set(graph))
+
+        # test method -- snapshot is re-used on second load
+        loaded = loads_graph_snapshot(filepath)
+        self.assertIsInstance(loaded, Graph)
+        self.assertEqual(set(loaded), set(graph))
+
+        # test method -- snapshot is replaced when the file changes
+        graph.add((obo.SO_0000287, RDFS.label, Literal('Peptide'))); graph.serialize(filepath, format='xml')
+        loaded = loads_graph_snapshot(filepath)
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Snapshot_*_Snapshot.pkl')), 1)
+        self.assertEqual(len(loaded), 3)
+
+        # test method -- an unknown graph store is not treated as sqlite
+        self.assertRaises(ValueError, loads_graph_snapshot, filepath, graph_store='sqllite')
+        self.assertEqual(glob.glob(self.dir_loc + '/TEST_Snapshot_*_Snapshot.db'), [])
+
+        # clean up environment
+        for f in glob.glob(self.dir_loc + '/TEST_Snapshot*'): os.remove(f)
+
+        return None
+
+    def test_loads_split_snapshot(self):
+        """Tests the loads_split_snapshot method."""
+
+        # create test data and write it locally
+        filepath = self.dir_loc + '/TEST_Split.owl'
+        graph = Graph(); graph.add((obo.SO_0000288, RDFS.subClassOf, obo.SO_0000287))
+        graph.add((RDFS.label, RDF.type, OWL.AnnotationProperty))
+        graph.add((obo.SO_0000288, RDFS.label, Literal('Teprotide'))); graph.serialize(filepath, format='xml')
+        logic_graph, annotation_triples = splits_knowledge_graph(graph)
+
+        # test method -- the graph is split and a snapshot is created on first load
+        logic, annotations = loads_split_snapshot(filepath, graph)
+        snapshots = glob.glob(self.dir_loc + '/TEST_Split_*_Split_Logic.pkl')
+        self.assertEqual(len(snapshots), 1)
+        self.assertIn(gets_file_hash(filepath), snapshots[0])
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Split_*_Split_Annotations.nt')), 1)
+        self.assertIsInstance(logic, Graph)
+        self.assertEqual(set(logic), set(logic_graph))
+        self.assertEqual(annotations, annotation_triples)
+
+        # test method -- the annotation subset is appended to a file without being loaded
+        with open(self.dir_loc + '/TEST_Split_Annotations.nt', 'w') as f: f.write(n3(obo.SO_0000287) + ' ' +
+                                                                                   n3(RDFS.label) + ' "Peptide" .\n')
+        with patch('pkt_kg.utils.kg_utils.NTriplesReader', side_effect=AssertionError):
+            logic, n = loads_split_snapshot(filepath, annotations=self.dir_loc + '/TEST_Split_Annotations.nt')
+        self.assertEqual(n, len(annotation_triples)); self.assertEqual(set(logic), set(logic_graph))
+        self.assertEqual(set(iterates_ntriples(self.dir_loc + '/TEST_Split_Annotations.nt')),
+                         annotation_triples | {(obo.SO_0000287, RDFS.label, Literal('Peptide'))})
+
+        # test method -- snapshot is re-used without splitting the graph again
+        with patch('pkt_kg.utils.kg_utils.splits_knowledge_graph', side_effect=AssertionError):
+            logic, annotations = loads_split_snapshot(filepath)
+        self.assertEqual(set(logic), set(logic_graph))
+        self.assertEqual(annotations, annotation_triples)
+
+        # test method -- snapshot is replaced when the file changes
+        graph.add((obo.SO_0000287, RDFS.label, Literal('Peptide'))); graph.serialize(filepath, format='xml')
+        logic, annotations = loads_split_snapshot(filepath)
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Split_*_Split_Logic.pkl')), 1)
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Split_*_Split_Annotations.nt')), 1)
+        self.assertEqual(len(annotations), 2)
+
+        # test method -- an unknown graph store is not treated as sqlite
+        self.assertRaises(ValueError, loads_split_snapshot, filepath, graph, 'Memory')
+        self.assertEqual(glob.glob(self.dir_loc + '/TEST_Split_*.db'), [])
+
+        # clean up environment
+        for f in glob.glob(self.dir_loc + '/TEST_Split*'): os.remove(f)
+
+        return None
+
+    def test_loads_snapshots_sqlite(self):
+        """Tests the loads_graph_snapshot and loads_split_snapshot methods with the sqlite graph store."""
+
+        # create test data and write it locally
+        filepath = self.dir_loc + '/TEST_Store.owl'
+        graph = Graph(); graph.add((obo.SO_0000288, RDFS.subClassOf, obo.SO_0000287))
+        graph.add((RDFS.label, RDF.type, OWL.AnnotationProperty))
+        graph.add((obo.SO_0000288, RDFS.label, Literal('Teprotide'))); graph.serialize(filepath, format='xml')
+        logic_graph, annotation_triples = splits_knowledge_graph(graph)
+
+        # test method -- the snapshot is a database and the graph is a working copy of it
+        loaded = loads_graph_snapshot(filepath, graph_store='sqlite')
+        snapshots = glob.glob(self.dir_loc + '/TEST_Store_*_Snapshot.db')
+        self.assertEqual(len(snapshots), 1)
+        self.assertIsInstance(loaded.store, SQLiteStore)
+        self.assertNotEqual(loaded.store.filepath, snapshots[0])
+        self.assertEqual(set(loaded), set(graph))
+        loaded.remove((None, RDFS.label, None))
+        loaded = loads_graph_snapshot(filepath, graph_store='sqlite')
+        self.assertEqual(set(loaded), set(graph))
+
+        # test method -- the logic subset is written to a database and the annotation subset to an n-triples file
+        logic, annotations = loads_split_snapshot(filepath, loaded, 'sqlite')
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Store_*_Split_*.db')), 2)  # 1 snapshot and 1 copy
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Store_*_Split_Annotations.nt')), 1)
+        self.assertIsInstance(annotations.store, SQLiteStore)
+        self.assertEqual(set(logic), set(logic_graph))
+        self.assertEqual(set(annotations), annotation_triples)
+        with patch('pkt_kg.utils.kg_utils.splits_knowledge_graph', side_effect=AssertionError):
+            logic, annotations = loads_split_snapshot(filepath, graph_store='sqlite')
+        self.assertEqual(set(logic), set(logic_graph))
+
+        # test that the working copies are removed when the graphs are closed
+        for x in [loaded, logic, annotations]: x.close()
+        self.assertEqual(len(glob.glob(self.dir_loc + '/TEST_Store_*.db')), 2)
+
+        # clean up environment
+        for f in glob.glob(self.dir_loc + '/TEST_Store*'): os.remove(f)
+
+        return None
+
+    def test_loads_graph_snapshot_bad_file(self):
+        """Tests the loads_graph_snapshot method when the input file is missing or empty."""
+
+        self.assertRaises(OSError, loads_graph_snapshot, self.not_real_file_name)
+        self.assertRaises(TypeError, loads_graph_snapshot, self.empty_ontology_file_location)
+
+        return None
@@ -1,7 +1,9 @@
+import copy
 import glob
 import json
 import logging
 import networkx  # type: ignore
+import numpy as np  # type: ignore
 import os
 import os.path
 import pandas
@@ -13,12 +15,15 @@ import warnings
 
 from collections import ChainMap
 from mock import patch
+from ray.cluster_utils import Cluster  # type: ignore
 from rdflib import Graph, URIRef, BNode, Namespace
 from rdflib.namespace import OWL, RDF, RDFS
 from typing import Dict, List
 
 from pkt_kg.__version__ import __version__
+from pkt_kg.executors import gets_executor
 from pkt_kg.knowledge_graph import FullBuild, PartialBuild, PostClosureBuild
+from pkt_kg.memory import MemoryBudget
 from pkt_kg.metadata import Metadata
 from pkt_kg.utils import *
 
@@ -210,6 +215,26 @@ class TestKGBuilder(unittest.TestCase):
 
         return None
 
+    def test_class_initialization_parameters_output_format(self):
+        """Tests the class initialization parameters for output_format."""
+
+        self.assertRaises(ValueError, FullBuild, 'subclass', 'yes', 'yes', 'yes', 1, self.write_location,
+                          output_format='npy')
+        self.assertEqual(FullBuild('subclass', 'yes', 'yes', 'yes', 1, self.write_location,
+                                   output_format='binary').output_format, 'binary')
+
+        return None
+
+    def test_class_initialization_parameters_graph_store(self):
+        """Tests the class initialization parameters for graph_store."""
+
+        self.assertRaises(ValueError, FullBuild, 'subclass', 'yes', 'yes', 'yes', 1, self.write_location,
+                          graph_store='disk')
+        self.assertEqual(FullBuild('subclass', 'yes', 'yes', 'yes', 1, self.write_location,
+                                   graph_store='sqlite').graph_store, 'sqlite')
+
+        return None
+
     def test_class_initialization_parameters_edge_data_missing(self):
         """Tests the class initialization parameters for edge_data when the file is missing."""
 
@@ -588,6 +613,137 @@ class TestKGBuilder(unittest.TestCase):
 
         return None
 
+    def test_runs_edge_constructors_batches(self):
+        """Tests the runs_edge_constructors method when large edge types are split across actors."""
+
+        self.kg_subclass.reverse_relation_processor()
+        self.kg_subclass.graph = Graph().parse(self.dir_loc + '/ontologies/so_with_imports.owl')
+        self.kg_subclass.obj_properties = gets_object_properties(self.kg_subclass.graph)
+        self.kg_subclass.ont_classes = gets_ontology_classes(self.kg_subclass.graph)
+        self.kg_subclass.node_dict, self.kg_subclass.node_data = None, None
+        meta = Metadata(self.kg_subclass.kg_version, self.kg_subclass.write_location, self.kg_subclass.full_kg,
+                        self.kg_subclass.node_data, self.kg_subclass.node_dict)
+        full_kg_owl = '_'.join(self.kg_subclass.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        args = {'construction': self.kg_subclass.construct_approach, 'kg_owl': full_kg_owl,
+                'rel_dict': self.kg_subclass.relations_dict, 'metadata': meta.creates_node_metadata,
+                'inverse_dict': self.kg_subclass.inverse_relations_dict, 'node_data': self.kg_subclass.node_data,
+                'ont_cls': self.kg_subclass.ont_classes, 'obj_props': self.kg_subclass.obj_properties,
+                'write_loc': self.kg_subclass.write_location}
+        self.kg_subclass.edge_dict.pop('entity_namespaces'); edge_dict = copy.deepcopy(self.kg_subclass.edge_dict)
+
+        # test method -- single actor
+        self.kg_subclass.cpus, self.kg_subclass.executor = 1, gets_executor('serial', 1)
+        g1, g2, error_dicts = self.kg_subclass.runs_edge_constructors(args)
+        graph1 = set(x for y in g1 for x in iterates_ntriples(y[0]))
+        graph2 = set(x for y in g2 for x in iterates_ntriples(y[0]))
+        self.assertEqual(len(graph1), g1[0][1]); self.assertEqual(len(graph2), g2[0][1])
+        self.assertEqual(self.kg_subclass.edge_dict, edge_dict)  # the edge lists are not consumed
+        # test method -- the edge types are split into batches across 4 actors
+        self.kg_subclass.cpus, self.kg_subclass.executor = 4, gets_executor('serial', 4)
+        g1, g2, batch_error_dicts = self.kg_subclass.runs_edge_constructors(args)
+        self.assertEqual(len(g1), 4)
+        self.assertEqual(set(x for y in g1 for x in iterates_ntriples(y[0])), graph1)
+        self.assertEqual(set(x for y in g2 for x in iterates_ntriples(y[0])), graph2)
+        self.assertEqual({k: sorted(v) for k, v in batch_error_dicts.items()},
+                         {k: sorted(v) for k, v in error_dicts.items()})
+        self.assertEqual(sorted(batch_error_dicts['gene-phenotype']), ['10', '20', '9'])
+
+        return None
+
+    def test_runs_edge_constructors_cluster(self):
+        """Tests the runs_edge_constructors method on a local multi-node Ray cluster."""
+
+        self.kg_subclass.reverse_relation_processor()
+        self.kg_subclass.graph = Graph().parse(self.dir_loc + '/ontologies/so_with_imports.owl')
+        self.kg_subclass.obj_properties = gets_object_properties(self.kg_subclass.graph)
+        self.kg_subclass.ont_classes = gets_ontology_classes(self.kg_subclass.graph)
+        self.kg_subclass.node_dict, self.kg_subclass.node_data = None, None
+        meta = Metadata(self.kg_subclass.kg_version, self.kg_subclass.write_location, self.kg_subclass.full_kg,
+                        self.kg_subclass.node_data, self.kg_subclass.node_dict)
+        full_kg_owl = '_'.join(self.kg_subclass.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        args = {'construction': self.kg_subclass.construct_approach, 'kg_owl': full_kg_owl,
+                'rel_dict': self.kg_subclass.relations_dict, 'metadata': meta.creates_node_metadata,
+                'inverse_dict': self.kg_subclass.inverse_relations_dict, 'node_data': self.kg_subclass.node_data,
+                'ont_cls': self.kg_subclass.ont_classes, 'obj_props': self.kg_subclass.obj_properties,
+                'write_loc': self.kg_subclass.write_location}
+        self.kg_subclass.edge_dict.pop('entity_namespaces')
+        self.kg_subclass.cpus, self.kg_subclass.executor = 3, gets_executor('serial', 3)
+        g1, g2, error_dicts = self.kg_subclass.runs_edge_constructors(args)
+
+        # test method -- the actors are run on a cluster with a head node and two worker nodes
+        cluster = Cluster(initialize_head=True, head_node_args={'num_cpus': 1})
+        for _ in range(2): cluster.add_node(num_cpus=1)
+        try:
+            self.kg_subclass.executor = gets_executor('ray', 3, cluster.address)
+            c1, c2, cluster_error_dicts = self.kg_subclass.runs_edge_constructors(args)
+        finally: ray.shutdown(); cluster.shutdown()
+        for c, g in [(c1, g1), (c2, g2)]:
+            self.assertEqual(set(x for y in c for x in iterates_ntriples(y[0])),
+                             set(x for y in g for x in iterates_ntriples(y[0])))
+        self.assertEqual({k: sorted(v) for k, v in cluster_error_dicts.items()},
+                         {k: sorted(v) for k, v in error_dicts.items()})
+
+        return None
+
+    def test_merges_edge_graphs(self):
+        """Tests the merges_edge_graphs method."""
+
+        graph = Graph().parse(self.dir_loc + '/ontologies/so_with_imports.owl'); triples = list(graph)
+        files = []
+        for i, subset in enumerate([triples[0:100], triples[50:150], []]):
+            with NTriplesWriter(self.write_location + '/edges_{}.nt'.format(i)) as writer: writer.writes_triples(subset)
+            files += [(self.write_location + '/edges_{}.nt'.format(i), len(subset))]
+
+        # test method -- the files are loaded into the store
+        store = self.kg_subclass.merges_edge_graphs('STEP 6', files, [set(triples[100:200])])
+        self.assertEqual(set(store.iterates_triples()), set(triples[0:200]))
+        self.assertEqual(self.kg_subclass.budget.gets_spills(), [])
+        self.assertEqual(self.kg_subclass.counts_triples(store), 200)
+        # test method -- the graphs are merged on disk and not loaded when the memory budget is exceeded
+        self.kg_subclass.budget = MemoryBudget(self.write_location, '1MB')
+        merged = self.kg_subclass.merges_edge_graphs('STEP 6', files, [set(triples[100:200])])
+        self.assertIsInstance(merged, str)
+        self.assertEqual(set(iterates_ntriples(merged)), set(triples[0:200]))
+        self.assertEqual(self.kg_subclass.counts_triples(merged), 200)
+        self.assertEqual([x['name'] for x in self.kg_subclass.budget.gets_spills()], ['Full Logic'])
+        self.kg_subclass.budget.removes_spills()
+
+        return None
+
+    def test_writes_graph_outputs(self):
+        """Tests the writes_graph_outputs method."""
+
+        graph = Graph().parse(self.dir_loc + '/ontologies/so_with_imports.owl'); subset = set(list(graph)[0:100])
+        self.kg_subclass.node_dict, self.kg_subclass.node_data = None, None
+        self.kg_subclass.cpus, self.kg_subclass.executor = 2, gets_executor('pool', 2)
+        meta = Metadata(self.kg_subclass.kg_version, self.kg_subclass.write_location, self.kg_subclass.full_kg,
+                        self.kg_subclass.node_data, self.kg_subclass.node_dict)
+        kg_owl = '_'.join(self.kg_subclass.full_kg.split('_')[0:-1]) + '_OWL.owl'
+
+        # test method -- the purified graph was not built
+        files = self.kg_subclass.writes_graph_outputs([set(graph), subset, None], meta, kg_owl)
+        self.assertEqual(files, [kg_owl[:-8] + x + '_Triples_Integers.txt' for x in ['_OWL', '_OWLNETS']])
+        maps = []
+        for f, g in zip(files, [graph, subset]):
+            with open(self.write_location + f[:-5] + '_Identifier_Map.json') as out: maps += [json.load(out)]
+            with open(self.write_location + f.replace('Integers', 'Identifiers')) as out: ids = out.readlines()[1:]
+            self.assertEqual(len(ids), len(g))
+            self.assertEqual(set(maps[-1].keys()), set(n3(x) for y in g for x in y))
+        # test that the graphs share a single identifier-integer map
+        self.assertTrue(all(maps[0][k] == v for k, v in maps[1].items()))
+        self.assertFalse(os.path.exists(self.write_location + kg_owl[:-8] + '_OWLNETS_SUBCLASS_purified_'
+                                                                           'Triples_Integers.txt'))
+
+        # test binary outputs
+        self.kg_subclass.output_format = 'binary'
+        files = self.kg_subclass.writes_graph_outputs([None, subset, None], meta, kg_owl)
+        ints = np.load(self.write_location + files[0][:-4] + '.npy')
+        id_map = IdentifierMap(self.write_location + '/' + files[0][:-5] + '_Identifier_Map')
+        self.assertEqual(ints.shape, (len(subset), 3))
+        self.assertEqual(set(tuple(id_map[n3(x)] for x in y) for y in subset), set(map(tuple, ints.tolist())))
+
+        return None
+
     def test_creates_new_edges_adding_metadata_to_kg(self):
         """Tests the creates_new_edges method and adds node metadata to the KG."""
 
@@ -782,6 +938,22 @@ class TestKGBuilder(unittest.TestCase):
 
         return None
 
+    def tests_writes_graphs(self):
+        """Tests writes_graphs and graph_file_getter methods."""
+
+        self.inner_class.graph.add((obo.SO_0000001, RDF.type, OWL.Class))
+        self.inner_class.clean_graph.add((BNode('N1'), OWL.onProperty, obo.RO_0002202))
+        self.inner_class.writes_graphs(); results = self.inner_class.graph_file_getter()
+
+        # verify results
+        self.assertEqual([x[1] for x in results], [1, 1])
+        self.assertTrue(all(x[0].startswith(self.kg_subclass.write_location + '/.pkt_spill/') for x in results))
+        self.assertEqual(set(iterates_ntriples(results[0][0])), {(obo.SO_0000001, RDF.type, OWL.Class)})
+        self.assertEqual(set(iterates_ntriples(results[1][0])), {(BNode('N1'), OWL.onProperty, obo.RO_0002202)})
+        self.assertEqual(len(self.inner_class.graph), 0); self.assertEqual(len(self.inner_class.clean_graph), 0)
+
+        return None
+
     def tearDown(self):
         warnings.simplefilter('default', ResourceWarning)
 
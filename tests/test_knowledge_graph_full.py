@@ -130,8 +130,11 @@ class TestFullBuild(unittest.TestCase):
         """Tests the construct_knowledge_graph method for a subclass-based build."""
 
         # test the build
+        merges, active = self.kg.merges_edge_graphs, []  # records the profiled steps when the graphs are merged
+        self.kg.merges_edge_graphs = lambda *args: active.append(list(self.kg.profiler.active.keys())) or merges(*args)
         self.kg.construct_knowledge_graph()
         full_kg_owl = '_'.join(self.kg.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        self.assertEqual(active, [['STEP 6: DECODE OWL SEMANTICS']])
         f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.kg.construct_approach.upper() + '_purified']
 
         # kg - owl semantics output files
@@ -314,6 +317,92 @@ class TestFullBuild(unittest.TestCase):
 
         return None
 
+    def test_construct_knowledge_graph_update(self):
+        """Tests the construct_knowledge_graph method when a previous build is updated."""
+
+        full_kg_owl = '_'.join(self.kg.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.kg.construct_approach.upper() + '_purified']
+        files = [full_kg_owl[:-4] + '_LogicOnly.nt', full_kg_owl[:-4] + '_AnnotationsOnly.nt',
+                 full_kg_owl[:-4] + '.nt', full_kg_owl[:-8] + f_prefix[1] + '.nt',
+                 full_kg_owl[:-8] + f_prefix[2] + '.nt'] + \
+                [full_kg_owl[:-8] + x + '_Triples_Identifiers.txt' for x in f_prefix] + \
+                [full_kg_owl[:-8] + x + '_NodeLabels.txt' for x in f_prefix]
+        state_file = self.write_location + self.kg.full_kg[:-4] + '_BuildState.pkl'
+
+        def reads_output(x):  # node label integers depend on the order in which graphs are merged, so are dropped
+            with open(self.write_location + x, 'r') as f: lines = f.readlines()
+            if not x.endswith('_NodeLabels.txt'): return set(lines)
+            else: return set(tuple(i.split('\t')[0:1] + i.split('\t')[2:]) for i in lines)
+
+        # test the first build, which writes the build state
+        self.kg.update = True; self.kg.construct_knowledge_graph()
+        self.assertTrue(os.path.exists(state_file))
+        # remove one edge type and change another
+        with open(self.dir_loc_resources + '/Master_Edge_List_Dict.json', 'r') as f: edge_dict = json.load(f)
+        edge_dict.pop('disease-disease'); edge_dict['gene-gene']['edge_list'] = edge_dict['gene-gene']['edge_list'][2:]
+        with open(self.dir_loc_resources + '/Master_Edge_List_Dict.json', 'w') as f: json.dump(edge_dict, f)
+
+        # test the update -- only the changed edge type is constructed
+        kg = FullBuild('subclass', 'yes', 'yes', 'yes', 1, self.write_location, update=True)
+        kg.owl_tools = self.kg.owl_tools; kg.construct_knowledge_graph()
+        self.assertEqual(list(kg.edge_records.keys()), ['gene-gene'])
+        self.assertNotIn('clean', kg.edge_records['gene-gene'])  # handed to OwlNets, not kept in the records
+        updated = [reads_output(x) for x in files]
+        # test that the update is identical to a full rebuild without update, which decodes each actor's edges
+        for x in files: os.remove(self.write_location + x)
+        kg = FullBuild('subclass', 'yes', 'yes', 'yes', 1, self.write_location, update=False)
+        kg.owl_tools = self.kg.owl_tools; kg.construct_knowledge_graph()
+        for x, y in zip(files, updated): self.assertEqual(reads_output(x), y)
+
+        return None
+
+    def test_gets_build_signature(self):
+        """Tests that the build signature changes when the node metadata changes, which forces a full rebuild."""
+
+        signature = self.kg.gets_build_signature(); self.assertEqual(signature, self.kg.gets_build_signature())
+        state_file = self.write_location + self.kg.full_kg[:-4] + '_BuildState.pkl'
+        with open(state_file, 'wb') as f: pickle.dump({'signature': signature}, f)
+        self.assertEqual(self.kg.loads_build_state(signature), {'signature': signature})
+
+        # change the label of a single node
+        with open(self.kg.node_data[0], 'rb') as f: node_data = pickle.load(f)
+        node_data['nodes']['http://www.ncbi.nlm.nih.gov/gene/1']['Label'] = 'A1BG Gene'
+        with open(self.kg.node_data[0], 'wb') as f: pickle.dump(node_data, f)
+        self.assertNotEqual(self.kg.gets_build_signature(), signature)
+        self.assertIsNone(self.kg.loads_build_state(self.kg.gets_build_signature()))
+
+        return None
+
+    def test_construct_knowledge_graph_max_memory(self):
+        """Tests the construct_knowledge_graph method when intermediates are spilled to disk."""
+
+        full_kg_owl = '_'.join(self.kg.full_kg.split('_')[0:-1]) + '_OWL.owl'
+        f_prefix = ['_OWL', '_OWLNETS', '_OWLNETS_' + self.kg.construct_approach.upper() + '_purified']
+        files = [full_kg_owl[:-4] + '_LogicOnly.nt', full_kg_owl[:-4] + '_AnnotationsOnly.nt',
+                 full_kg_owl[:-4] + '.nt', full_kg_owl[:-8] + f_prefix[1] + '.nt',
+                 full_kg_owl[:-8] + f_prefix[2] + '.nt'] + \
+                [full_kg_owl[:-8] + x + '_Triples_Identifiers.txt' for x in f_prefix]
+
+        # test the build without a memory budget
+        self.kg.construct_knowledge_graph(); self.assertEqual(self.kg.budget.gets_spills(), [])
+        expected = []
+        for x in files:
+            with open(self.write_location + x, 'r') as f: expected += [set(f.readlines())]
+            os.remove(self.write_location + x)
+
+        # test the build with a memory budget that is always exceeded
+        kg = FullBuild('subclass', 'yes', 'yes', 'yes', 2, self.write_location, 'serial', max_memory='1MB')
+        kg.owl_tools = self.kg.owl_tools; kg.construct_knowledge_graph()
+        spills = kg.budget.gets_spills()
+        self.assertEqual(sorted(set(x['name'] for x in spills)), ['Full Logic', 'OWLNETS'])
+        self.assertEqual(len(kg.graph), 0)  # the merged ontologies are freed once they are spilled
+        self.assertFalse(os.path.exists(self.write_location + '/.pkt_spill'))
+        # test that the outputs are identical to those of the build without a memory budget
+        for x, y in zip(files, expected):
+            with open(self.write_location + x, 'r') as f: self.assertEqual(set(f.readlines()), y)
+
+        return None
+
     def tearDown(self):
         warnings.simplefilter('default', ResourceWarning)
 
@@ -125,7 +125,10 @@ class TestPartialBuild(unittest.TestCase):
         """Tests the construct_knowledge_graph method."""
 
         # test out the build
+        merges, active = self.kg.merges_edge_graphs, []  # records the profiled steps when the graphs are merged
+        self.kg.merges_edge_graphs = lambda *args: active.append(list(self.kg.profiler.active.keys())) or merges(*args)
         self.kg.construct_knowledge_graph()
+        self.assertEqual(active, [['STEP 5: ADD EDGE DATA TO KNOWLEDGE GRAPH DATA']])
         full_kg_owl = '_'.join(self.kg.full_kg.split('_')[0:-1]) + '_OWL.owl'
 
         # check for output files
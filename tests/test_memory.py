@@ -0,0 +1,107 @@
+import glob
+import logging
+import os
+import shutil
+import unittest
+
+from rdflib import BNode, Graph, Literal, Namespace, URIRef  # type: ignore
+from rdflib.namespace import OWL, RDF, RDFS  # type: ignore
+
+from pkt_kg.memory import MemoryBudget
+from pkt_kg.utils import loads_ntriples_graph
+
+# set global attributes
+obo = Namespace('http://purl.obolibrary.org/obo/')
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Class to test the MemoryBudget class."""
+
+    def setUp(self):
+        # initialize file location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data/temp')
+        self.dir_loc = os.path.abspath(dir_loc)
+        os.mkdir(self.dir_loc)
+
+        # handle logging
+        self.logs = os.path.abspath(current_directory + '/builds/logs')
+        logging.disable(logging.CRITICAL)
+        if len(glob.glob(self.logs + '/*.log')) > 0: os.remove(glob.glob(self.logs + '/*.log')[0])
+
+        # create triples
+        bnode = BNode('N1')
+        self.graph = Graph()
+        self.graph.add((obo.SO_0000001, RDF.type, OWL.Class))
+        self.graph.add((obo.SO_0000001, RDFS.subClassOf, bnode))
+        self.graph.add((bnode, OWL.onProperty, obo.RO_0002202))
+        self.triples = {(obo.SO_0000001, RDFS.label, Literal('region')), (obo.SO_0000001, RDF.type, OWL.Class)}
+
+        return None
+
+    def test_parses_memory_size(self):
+        """Tests the parses_memory_size method."""
+
+        self.assertIsNone(MemoryBudget.parses_memory_size(None))
+        self.assertEqual(MemoryBudget.parses_memory_size(1024), 1024)
+        self.assertEqual(MemoryBudget.parses_memory_size('64GB'), 64 * 2 ** 30)
+        self.assertEqual(MemoryBudget.parses_memory_size('1.5g'), int(1.5 * 2 ** 30))
+        self.assertEqual(MemoryBudget.parses_memory_size('512 MB'), 512 * 2 ** 20)
+        self.assertRaises(ValueError, MemoryBudget.parses_memory_size, 'lots')
+        self.assertRaises(ValueError, MemoryBudget.parses_memory_size, '0GB')
+        self.assertRaises(ValueError, MemoryBudget, self.dir_loc, '-1G')
+
+        return None
+
+    def test_exceeds_budget(self):
+        """Tests the exceeds_budget method."""
+
+        self.assertFalse(MemoryBudget(self.dir_loc).exceeds_budget(10 ** 12))
+        budget = MemoryBudget(self.dir_loc, '1TB')
+        self.assertFalse(budget.exceeds_budget()); self.assertTrue(budget.exceeds_budget(10 ** 12))
+        self.assertTrue(MemoryBudget(self.dir_loc, '1MB').exceeds_budget())
+
+        return None
+
+    def test_spills_triples(self):
+        """Tests the spills_triples method."""
+
+        budget = MemoryBudget(self.dir_loc, '1MB')
+        filepath = budget.spills_triples('STEP 5', 'Actor Graph Results', [self.graph, self.triples])
+        self.assertTrue(filepath.startswith(self.dir_loc + '/.pkt_spill/'))
+        with open(filepath) as f: lines = f.readlines()
+        # test that the spilled file is sorted and deduplicated and that the BNode labels are kept
+        self.assertEqual(lines, sorted(set(lines))); self.assertEqual(len(lines), 4)
+        self.assertEqual(set(loads_ntriples_graph(filepath)), set(self.graph) | self.triples)
+        self.assertEqual(len(glob.glob(self.dir_loc + '/.pkt_spill/*')), 1)  # runs are removed
+        self.assertEqual(budget.gets_spills(), [{'step': 'STEP 5', 'name': 'Actor Graph Results', 'file': filepath,
+                                                 'triples': 5, 'bytes': os.stat(filepath).st_size}])
+
+        # test spilling into an existing file
+        with open(self.dir_loc + '/annotations.nt', 'w') as out:
+            out.write('<http://purl.obolibrary.org/obo/SO_0000002> <http://www.w3.org/2000/01/rdf-schema#label> '
+                      '"sequence" .\n')
+        budget.spills_triples('STEP 4', 'Annotation', [self.triples], self.dir_loc + '/annotations.nt')
+        with open(self.dir_loc + '/annotations.nt') as f: lines = f.readlines()
+        self.assertEqual(lines, sorted(lines)); self.assertEqual(len(lines), 3)
+
+        # test spilling an N-Triples file, which is copied into a run without being changed
+        filepath = budget.spills_triples('STEP 6', 'Actor Graph Results', [self.dir_loc + '/annotations.nt', self.graph])
+        annotations = set(loads_ntriples_graph(self.dir_loc + '/annotations.nt'))
+        self.assertEqual(set(loads_ntriples_graph(filepath)), set(self.graph) | annotations)
+        self.assertEqual(budget.gets_spills()[-1]['triples'], 3 + len(self.graph))
+        self.assertEqual(len(glob.glob(self.dir_loc + '/*.nt')), 1)
+        budget.logs_spills()
+
+        # test removing spilled files
+        budget.removes_spills()
+        self.assertFalse(os.path.exists(self.dir_loc + '/.pkt_spill'))
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.dir_loc)
+
+        return None
@@ -0,0 +1,86 @@
+import glob
+import logging
+import os
+import shutil
+import unittest
+
+from pkt_kg.metrics import MetricsCollector, MetricsPublisher
+
+
+class TestMetrics(unittest.TestCase):
+    """Class to test the MetricsPublisher and MetricsCollector classes."""
+
+    def setUp(self):
+        # initialize file location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data/temp')
+        self.dir_loc = os.path.abspath(dir_loc)
+        os.mkdir(self.dir_loc)
+
+        # handle logging
+        self.logs = os.path.abspath(current_directory + '/builds/logs')
+        logging.disable(logging.CRITICAL)
+        if len(glob.glob(self.logs + '/*.log')) > 0: os.remove(glob.glob(self.logs + '/*.log')[0])
+
+        return None
+
+    def test_publishes_without_collector(self):
+        """Tests that the MetricsPublisher does not write anything when a collector is not running."""
+
+        publisher = MetricsPublisher(self.dir_loc, 'EdgeConstructor', interval=0.0)
+        publisher.increments(edges_processed=2); publisher.increments(edges_processed=1, triples_emitted=4)
+        self.assertEqual(publisher.counters, {'edges_processed': 3, 'triples_emitted': 4})
+        self.assertEqual(os.listdir(self.dir_loc), [])
+
+        return None
+
+    def test_publishes_interval(self):
+        """Tests that the MetricsPublisher only publishes once per interval unless explicitly asked to."""
+
+        collector = MetricsCollector(self.dir_loc, interval=60.0); collector.starts()
+        publisher = MetricsPublisher(self.dir_loc, 'OwlNets', interval=60.0)
+        publisher.increments(entities_decoded=1); publisher.increments(entities_decoded=1)
+        self.assertEqual(collector.collects_metrics()[publisher.actor]['counters'], {'entities_decoded': 1})
+        publisher.publishes()
+        self.assertEqual(collector.collects_metrics()[publisher.actor]['counters'], {'entities_decoded': 2})
+        collector.stops()
+
+        return None
+
+    def test_collector(self):
+        """Tests the MetricsCollector starts, collects, formats, and writes actor metrics."""
+
+        collector = MetricsCollector(self.dir_loc, interval=60.0); collector.starts()
+        self.assertTrue(os.path.isdir(self.dir_loc + '/.pkt_metrics'))
+        pub1 = MetricsPublisher(self.dir_loc, 'EdgeConstructor', interval=0.0)
+        pub2 = MetricsPublisher(self.dir_loc, 'EdgeConstructor', interval=0.0)
+        pub1.increments(edges_processed=10, triples_emitted=30); pub2.increments(edges_processed=5)
+        metrics = collector.collects_metrics()
+        self.assertEqual(len(metrics), 2)
+        self.assertEqual(metrics[pub1.actor]['counters'], {'edges_processed': 10, 'triples_emitted': 30})
+        collector.stops()
+
+        # verify file output and clean-up
+        self.assertFalse(os.path.exists(self.dir_loc + '/.pkt_metrics'))
+        with open(self.dir_loc + '/pkt_metrics.prom', 'r') as f: data = f.read().splitlines()
+        self.assertIn('# TYPE pkt_edges_processed_total counter', data)
+        self.assertIn('pkt_edges_processed_total{{actor="{}",host="{}"}} 10'.format(pub1.actor, pub1.host), data)
+        self.assertIn('pkt_edges_processed_total{{actor="{}",host="{}"}} 5'.format(pub2.actor, pub2.host), data)
+        self.assertIn('pkt_triples_emitted_total{{actor="{}",host="{}"}} 30'.format(pub1.actor, pub1.host), data)
+        self.assertEqual(len([x for x in data if x.startswith('pkt_actor_last_update_timestamp_seconds')]), 2)
+
+        return None
+
+    def test_formats_metrics_empty(self):
+        """Tests the formats_metrics method when no actors have published metrics."""
+
+        self.assertEqual(MetricsCollector.formats_metrics({}), '\n')
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.dir_loc)
+
+        return None
@@ -0,0 +1,134 @@
+import os
+import os.path
+import shutil
+import unittest
+
+from rdflib import BNode, Graph, Literal, Namespace, URIRef  # type: ignore
+from rdflib.exceptions import ParserError  # type: ignore
+from rdflib.namespace import OWL, RDF, RDFS, XSD  # type: ignore
+from rdflib.parser import create_input_source  # type: ignore
+from rdflib.plugins.parsers.rdfxml import RDFXMLParser  # type: ignore
+from typing import List
+
+from pkt_kg.utils import *
+
+# set global attributes
+obo = Namespace('http://purl.obolibrary.org/obo/')
+
+
+class TestNTriples(unittest.TestCase):
+    """Class to test the N-Triples reader and writer utility methods."""
+
+    def setUp(self):
+        # initialize data location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data')
+        self.dir_loc = os.path.abspath(dir_loc)
+
+        # set-up environment - make temp directory
+        self.temp_dir = self.dir_loc + '/ntriples'
+        os.mkdir(self.temp_dir)
+
+        # create triples with literals that need escaping
+        self.triples = [(obo.SO_0000001, RDF.type, OWL.Class), (obo.SO_0000001, RDFS.subClassOf, BNode('N1')),
+                        (BNode('N1'), OWL.onProperty, obo.RO_0002202),
+                        (obo.SO_0000001, RDFS.label, Literal('region')),
+                        (obo.SO_0000001, RDFS.label, Literal('a "quoted"\nregion\\', lang='en-US')),
+                        (obo.SO_0000001, RDFS.label, Literal('región\t漢', datatype=XSD.string)),
+                        (obo.SO_0000001, RDFS.comment, Literal(''))]
+
+        return None
+
+    def test_encodes_term(self):
+        """Tests the encodes_term method."""
+
+        for s, p, o in self.triples:
+            for x in [s, p, o]: self.assertEqual(encodes_term(x), n3(x))
+        self.assertEqual(encodes_term(Literal('a "b"\n')), '"a \\"b\\"\\n"')
+
+        return None
+
+    def test_splits_line(self):
+        """Tests the splits_line method."""
+
+        line = '<http://a.org/s>\t<http://a.org/p>  "x y" . # comment\n'
+        self.assertEqual(NTriplesReader.splits_line(line), ('<http://a.org/s>', '<http://a.org/p>', '"x y"'))
+        self.assertEqual(NTriplesReader.splits_line('_:N1 <http://a.org/p> "x"@en-US.\n')[2], '"x"@en-US')
+        self.assertIsNone(NTriplesReader.splits_line('\n'))
+        self.assertIsNone(NTriplesReader.splits_line('  # comment\n'))
+        self.assertRaises(ParserError, NTriplesReader.splits_line, '<http://a.org/s> <http://a.org/p> .\n')
+        self.assertRaises(ParserError, NTriplesReader.splits_line, '"x" <http://a.org/p> <http://a.org/o> .\n')
+
+        return None
+
+    def test_parses_term(self):
+        """Tests the parses_term method."""
+
+        reader = NTriplesReader()
+        self.assertEqual(reader.parses_term('<http://a.org/s>'), URIRef('http://a.org/s'))
+        self.assertEqual(reader.parses_term('_:N1'), BNode('N1'))
+        self.assertEqual(reader.parses_term('"a \\"b\\"\\n"@en'), Literal('a "b"\n', lang='en'))
+        self.assertEqual(reader.parses_term('"\\u00e9"^^<http://www.w3.org/2001/XMLSchema#string>'),
+                         Literal('é', datatype=XSD.string))
+
+        # test that repeated tokens return the same term object
+        self.assertIs(reader.parses_term('<http://a.org/s>'), reader.parses_term('<http://a.org/s>'))
+
+        # test that BNode labels are replaced when bnode_labels is False
+        reader = NTriplesReader(bnode_labels=False)
+        self.assertNotEqual(reader.parses_term('_:N1'), BNode('N1'))
+        self.assertEqual(reader.parses_term('_:N1'), reader.parses_term('_:N1'))
+
+        return None
+
+    def test_iterates_triples(self):
+        """Tests the iterates_triples method."""
+
+        filepath = self.temp_dir + '/triples.nt'
+        with NTriplesWriter(filepath) as writer: writer.writes_triples(self.triples)
+        with open(filepath, 'a') as out: out.write('# comment\n\n')
+
+        # test that the triples match the triples parsed by RDFLib
+        triples = list(NTriplesReader().iterates_triples(filepath, chunk_size=2))
+        self.assertEqual(triples, self.triples)
+        graph = Graph().parse(filepath, format='nt'); self.assertEqual(len(graph), len(self.triples))
+        self.assertEqual({x for x in graph if BNode not in [type(x[0]), type(x[2])]},
+                         {x for x in triples if BNode not in [type(x[0]), type(x[2])]})
+
+        # test integer ids
+        terms: List = []
+        ids = list(NTriplesReader().iterates_ids(filepath, lambda x: terms.append(x) or len(terms) - 1))
+        self.assertEqual([tuple(terms[i] for i in x) for x in ids], self.triples)
+        self.assertEqual(len(terms), len(set(x for y in self.triples for x in y)))
+
+        return None
+
+    def test_ntriples_writer(self):
+        """Tests the NTriplesWriter class."""
+
+        filepath = self.temp_dir + '/triples.nt'
+        with NTriplesWriter(filepath, buffer_size=2) as writer:
+            writer.writes_triple(*self.triples[0]); writer.writes_triples(self.triples[1:])
+            self.assertEqual(len(writer.encoded), len(set(x for y in self.triples for x in y)))
+        with open(filepath) as f: lines = f.readlines()
+        self.assertEqual(lines, [' '.join(n3(x) for x in y) + ' .\n' for y in self.triples])
+
+        # test appending with a separator
+        with NTriplesWriter(filepath, 'a', sep='\t') as writer: writer.writes_triple(*self.triples[0])
+        with open(filepath) as f: lines = f.readlines()
+        self.assertEqual(len(lines), len(self.triples) + 1); self.assertEqual(lines[-1].count('\t'), 2)
+
+        # test using the writer as the sink of RDFLib's RDF/XML parser
+        graph = Graph(); graph += self.triples; graph.serialize(self.temp_dir + '/triples.owl', format='xml')
+        with NTriplesWriter(filepath) as writer:
+            RDFXMLParser().parse(create_input_source(self.temp_dir + '/triples.owl', format='xml'), writer)
+        self.assertEqual(len(Graph().parse(filepath, format='nt')), len(graph))
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.temp_dir)
+
+        return None
@@ -11,7 +11,7 @@ from rdflib.namespace import RDF, RDFS, OWL  # type: ignore
 from typing import Dict, List, Set, Tuple
 
 from pkt_kg.owlnets import OwlNets
-from pkt_kg.utils import adds_edges_to_graph
+from pkt_kg.utils import adds_edges_to_graph, AncestorIndex, gets_entity_ancestors, iterates_ntriples
 
 # set namespace
 obo = Namespace('http://purl.obolibrary.org/obo/')
@@ -615,6 +615,22 @@ class TestOwlNets(unittest.TestCase):
 
         return None
 
+    def test_gets_ancestor_index(self):
+        """Tests the gets_ancestor_index method."""
+
+        # test that the index is shared across stages that use the same graph
+        index = self.owl_nets.gets_ancestor_index(self.owl_nets.graph)
+        self.assertIsInstance(index, AncestorIndex)
+        connected_graph = self.owl_nets.makes_graph_connected(self.owl_nets.graph)
+        self.assertIs(self.owl_nets.gets_ancestor_index(connected_graph), index)
+        for x in sorted(set(connected_graph.subjects(RDFS.subClassOf, None)))[0:25]:
+            self.assertEqual(index.gets_ancestors(x), gets_entity_ancestors(connected_graph, [x], RDFS.subClassOf))
+
+        # test that a new index is built for a different graph
+        self.assertIsNot(self.owl_nets.gets_ancestor_index(Graph()), index)
+
+        return None
+
     def test_purifies_graph_build_none(self):
         """Tests the purifies_graph_build method when kg_construction is None."""
 
@@ -662,6 +678,8 @@ class TestOwlNets(unittest.TestCase):
         # test graph output
         self.assertIsInstance(graph1, Set)
         self.assertEqual(graph2, None)
+        # make sure the files written by the decoding actors are removed once they are loaded
+        self.assertFalse(os.path.exists(self.write_location + '/.pkt_spill'))
 
         # make sure files are written locally
         nx_mdg_file = 'so_with_imports_OWLNETS_NetworkxMultiDiGraph.gpickle'
@@ -727,6 +745,26 @@ class TestOwlNets(unittest.TestCase):
 
         return None
 
+    def test_runs_owlnets_decoded(self):
+        """Tests the runs_owlnets method when the decoding results of a previous run are reused."""
+
+        self.owl_nets.kg_construct_approach = None
+        graph1, graph2 = self.owl_nets.runs_owlnets(1, 'serial', dict())
+        self.assertEqual(len(self.owl_nets.decoded_graphs), 1)
+        decoded = self.owl_nets.decoded_graphs[0]; owl_nets_dict = self.owl_nets.gets_owlnets_dict()
+
+        # test method -- the graph is replaced by an empty placeholder and is not decoded again
+        owl_nets = OwlNets(kg_construct_approach=None, graph=[Graph()], write_location=self.write_location,
+                           filename=self.kg_filename)
+        res1, res2 = owl_nets.runs_owlnets(1, 'serial', {0: decoded})
+        self.assertEqual(res1, graph1); self.assertEqual(res2, None)
+        self.assertEqual(owl_nets.decoded_graphs, [decoded])
+        self.assertEqual(owl_nets.gets_owlnets_dict()['decoded_entities'].keys(),
+                         owl_nets_dict['decoded_entities'].keys())
+        self.assertEqual(owl_nets.gets_owlnets_dict()['filtered_triples'], owl_nets_dict['filtered_triples'])
+
+        return None
+
     def tests_gets_owlnets_dict(self):
         """Tests gets_owlnets_dict method."""
 
@@ -747,6 +785,21 @@ class TestOwlNets(unittest.TestCase):
 
         return None
 
+    def tests_writes_owlnets_graph(self):
+        """Tests writes_owlnets_graph method."""
+
+        triples = set(list(self.owl_nets.graph)[0:10])
+        self.owl_nets.graph = adds_edges_to_graph(Graph(), triples, False)
+
+        # test method -- the graph is written to a file and released
+        self.owl_nets.writes_owlnets_graph(); filepath, count = self.owl_nets.gets_owlnets_graph_file()
+        self.assertTrue(filepath.startswith(self.dir_loc_resources + '/knowledge_graphs/.pkt_spill/OwlNets_'))
+        self.assertEqual(count, len(triples))
+        self.assertEqual(set(iterates_ntriples(filepath)), triples)
+        self.assertEqual(len(self.owl_nets.graph), 0)
+
+        return None
+
     def tearDown(self):
         warnings.simplefilter('default', ResourceWarning)
 
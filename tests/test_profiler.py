@@ -0,0 +1,117 @@
+import glob
+import json
+import logging
+import os
+import shutil
+import unittest
+
+from pkt_kg.profiler import BuildProfiler
+
+
+class TestBuildProfiler(unittest.TestCase):
+    """Class to test the BuildProfiler class."""
+
+    def setUp(self):
+        # initialize file location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data/temp')
+        self.dir_loc = os.path.abspath(dir_loc)
+        os.mkdir(self.dir_loc)
+
+        # handle logging
+        self.logs = os.path.abspath(current_directory + '/builds/logs')
+        logging.disable(logging.CRITICAL)
+        if len(glob.glob(self.logs + '/*.log')) > 0: os.remove(glob.glob(self.logs + '/*.log')[0])
+
+        return None
+
+    def test_gets_resource_usage(self):
+        """Tests the gets_resource_usage method."""
+
+        usage = BuildProfiler.gets_resource_usage()
+        self.assertEqual(sorted(usage.keys()), ['cpu', 'peak_rss', 'rss', 'wall'])
+        self.assertTrue(usage['rss'] > 0)
+        self.assertTrue(usage['peak_rss'] >= usage['rss'])
+
+        return None
+
+    def test_stops_step(self):
+        """Tests the starts_step and stops_step methods."""
+
+        profiler = BuildProfiler()
+        profiler.starts_step('STEP 1', triples_in=10)
+        _ = sum(range(100000))
+        record = profiler.stops_step('STEP 1', 20)
+        self.assertEqual(record['name'], 'STEP 1')
+        self.assertEqual(record['category'], 'build')
+        self.assertEqual(record['triples_in'], 10)
+        self.assertEqual(record['triples_out'], 20)
+        self.assertTrue(record['wall_time'] >= 0.0)
+        self.assertTrue(record['cpu_time'] >= 0.0)
+        self.assertEqual(profiler.gets_records(), [record])
+        self.assertEqual(profiler.active, {})
+
+        # test overriding input triple count and stopping a step that was never started
+        profiler.starts_step('gene-gene', 'edge_list')
+        self.assertEqual(profiler.stops_step('gene-gene', 5, 7)['triples_in'], 7)
+        self.assertIsNone(profiler.stops_step('STEP 2'))
+        self.assertEqual(len(profiler.gets_records()), 2)
+
+        return None
+
+    def test_stops_step_peak_rss(self):
+        """Tests that the starts_step and stops_step methods record the peak resident set size of each step."""
+
+        profiler = BuildProfiler()
+        if not profiler.resettable: self.skipTest('The peak resident set size cannot be reset on this platform')
+
+        # test that a later, smaller step reports a lower peak than an earlier, larger step
+        profiler.starts_step('STEP 1'); data = bytearray(256 * 1048576); del data; large = profiler.stops_step('STEP 1')
+        profiler.starts_step('STEP 2'); data = bytearray(1048576); del data; small = profiler.stops_step('STEP 2')
+        self.assertTrue(large['peak_rss'] - large['rss_start'] >= 200 * 1048576)
+        self.assertTrue(small['peak_rss'] < large['peak_rss'] - 200 * 1048576)
+
+        # test that an outer step keeps the peak of a nested step and of a step from another profiler
+        other = BuildProfiler(); profiler.starts_step('STEP 3'); other.starts_step('gene-gene', 'edge_list')
+        data = bytearray(256 * 1048576); del data; inner = other.stops_step('gene-gene')
+        profiler.starts_step('STEP 3a'); nested = profiler.stops_step('STEP 3a'); outer = profiler.stops_step('STEP 3')
+        self.assertTrue(outer['peak_rss'] >= inner['peak_rss'])
+        self.assertTrue(nested['peak_rss'] < inner['peak_rss'] - 200 * 1048576)
+
+        return None
+
+    def test_writes_profile(self):
+        """Tests the writes_profile method."""
+
+        profiler = BuildProfiler()
+        profiler.starts_step('STEP 1'); profiler.stops_step('STEP 1')
+        profiler.writes_profile(self.dir_loc + '/Profile.json')
+        with open(self.dir_loc + '/Profile.json') as f: data = json.load(f)
+        self.assertEqual([x['name'] for x in data['steps']], ['STEP 1'])
+        self.assertFalse(os.path.exists(self.dir_loc + '/Profile_Trace.json'))
+
+        return None
+
+    def test_writes_profile_trace(self):
+        """Tests the writes_profile method when writing a Chrome trace file."""
+
+        profiler = BuildProfiler(trace=True); other = BuildProfiler()
+        profiler.starts_step('STEP 1'); profiler.stops_step('STEP 1', 3)
+        other.starts_step('gene-gene', 'edge_list'); other.stops_step('gene-gene', 2)
+        profiler.adds_records(other.gets_records())
+        profiler.writes_profile(self.dir_loc + '/Profile.json')
+        with open(self.dir_loc + '/Profile_Trace.json') as f: data = json.load(f)
+        self.assertEqual(len(data['traceEvents']), 2)
+        self.assertEqual(data['traceEvents'][0]['ph'], 'X')
+        self.assertEqual(data['traceEvents'][0]['name'], 'STEP 1')
+        self.assertEqual(data['traceEvents'][1]['cat'], 'edge_list')
+        self.assertEqual(data['traceEvents'][0]['args']['triples_out'], 3)
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.dir_loc)
+
+        return None
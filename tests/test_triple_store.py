@@ -0,0 +1,299 @@
+import glob
+import hashlib
+import json
+import numpy as np  # type: ignore
+import os
+import os.path
+import shutil
+import unittest
+
+from rdflib import BNode, Graph, Literal, Namespace, URIRef  # type: ignore
+from rdflib.namespace import OWL, RDF, RDFS  # type: ignore
+from typing import Dict
+
+from pkt_kg.utils import *
+
+# set global attributes
+obo = Namespace('http://purl.obolibrary.org/obo/')
+pkt_bnode = Namespace('https://github.com/callahantiff/PheKnowLator/pkt/bnode/')
+
+
+class TestIntegerTripleStore(unittest.TestCase):
+    """Class to test the integer-coded triple store utility methods."""
+
+    def setUp(self):
+        # initialize data location
+        current_directory = os.path.dirname(__file__)
+        dir_loc = os.path.join(current_directory, 'data')
+        self.dir_loc = os.path.abspath(dir_loc)
+
+        # set-up environment - make temp directory
+        self.temp_dir = self.dir_loc + '/triple_store'
+        os.mkdir(self.temp_dir)
+        shutil.copyfile(self.dir_loc + '/PheKnowLator_Closed.owl', self.temp_dir + '/PheKnowLator_Closed.owl')
+        self.closed_kg = self.temp_dir + '/PheKnowLator_Closed.owl'
+        self.graph = Graph().parse(self.closed_kg)
+
+        return None
+
+    def test_converts_rdf_to_ntriples(self):
+        """Tests the converts_rdf_to_ntriples method."""
+
+        # test missing and empty files
+        self.assertRaises(OSError, converts_rdf_to_ntriples, self.temp_dir + '/fake.owl')
+        open(self.temp_dir + '/empty.owl', 'w').close()
+        self.assertRaises(TypeError, converts_rdf_to_ntriples, self.temp_dir + '/empty.owl')
+
+        # test conversion
+        nt_file = converts_rdf_to_ntriples(self.closed_kg)
+        self.assertEqual(nt_file, self.temp_dir + '/PheKnowLator_Closed_' + gets_file_hash(self.closed_kg) + '.nt')
+        self.assertEqual(len(Graph().parse(nt_file, format='nt')), len(self.graph))
+        self.assertFalse(os.path.exists(nt_file + '.tmp'))
+
+        # test that the conversion is reused and that n-triples files are returned unchanged
+        modified = os.path.getmtime(nt_file)
+        self.assertEqual(converts_rdf_to_ntriples(self.closed_kg), nt_file)
+        self.assertEqual(os.path.getmtime(nt_file), modified)
+        self.assertEqual(converts_rdf_to_ntriples(nt_file), nt_file)
+
+        return None
+
+    def test_iterates_ntriples(self):
+        """Tests the iterates_ntriples method."""
+
+        nt_file = self.temp_dir + '/bnodes.nt'
+        with open(nt_file, 'w') as out:
+            out.write('<http://purl.obolibrary.org/obo/SO_0000001> <http://www.w3.org/2000/01/rdf-schema#subClassOf> '
+                      '_:N1 .\n_:N1 <http://www.w3.org/2002/07/owl#onProperty> '
+                      '<http://purl.obolibrary.org/obo/RO_0002202> .\n')
+
+        # test that the bnode labels are kept across chunks
+        triples = list(iterates_ntriples(nt_file, chunk_size=1))
+        self.assertEqual(triples, [(obo.SO_0000001, RDFS.subClassOf, BNode('N1')),
+                                   (BNode('N1'), OWL.onProperty, obo.RO_0002202)])
+        self.assertEqual(len(list(iterates_ntriples(converts_rdf_to_ntriples(self.closed_kg)))), len(self.graph))
+
+        return None
+
+    def test_rewrites_ntriples_bnodes(self):
+        """Tests the rewrites_ntriples_bnodes method."""
+
+        nt_file = self.temp_dir + '/closed.nt'; open(nt_file, 'w').close()
+        appends_to_existing_file(self.graph, nt_file)
+
+        # test adding the namespace
+        namespaced = rewrites_ntriples_bnodes(nt_file, self.temp_dir + '/closed_ns.nt')
+        self.assertEqual(namespaced, self.temp_dir + '/closed_ns.nt')
+        self.assertEqual(set(Graph().parse(namespaced, format='nt')), set(adds_namespace_to_bnodes(self.graph)))
+        self.assertFalse(os.path.exists(namespaced + '.tmp'))
+
+        # test removing the namespace
+        restored = rewrites_ntriples_bnodes(namespaced, self.temp_dir + '/closed_restored.nt', remove=True)
+        self.assertEqual(set(loads_ntriples_graph(restored)), set(self.graph))
+
+        return None
+
+    def test_loads_ntriples(self):
+        """Tests the loads_ntriples method."""
+
+        store = IntegerTripleStore(); store.loads_ntriples(converts_rdf_to_ntriples(self.closed_kg))
+
+        self.assertEqual(len(store), len(self.graph))
+        self.assertEqual(store.derives_graph_statistics(), derives_graph_statistics(self.graph))
+        self.assertEqual(set(store.gets_predicates()), set(self.graph.predicates()))
+
+        return None
+
+    def test_adds_namespace_to_bnodes(self):
+        """Tests the adds_namespace_to_bnodes method."""
+
+        bnode = BNode('N1'); namespaced = URIRef(pkt_bnode + 'N1')
+        store = IntegerTripleStore()
+        store.adds_triples([(obo.SO_0000001, RDFS.subClassOf, bnode), (bnode, OWL.onProperty, obo.RO_0002202),
+                            (obo.SO_0000001, RDFS.subClassOf, namespaced)])
+        store.adds_namespace_to_bnodes()
+
+        # the namespaced bnode already existed, so the duplicate triple is removed
+        self.assertEqual(set(store.iterates_triples()), {(obo.SO_0000001, RDFS.subClassOf, namespaced),
+                                                         (namespaced, OWL.onProperty, obo.RO_0002202)})
+        self.assertNotIn(bnode, store.term_ids)
+
+        return None
+
+    def test_updates_pkt_namespace_identifiers(self):
+        """Tests the updates_pkt_namespace_identifiers method."""
+
+        node = URIRef('https://github.com/callahantiff/PheKnowLator/pkt/Nc07cdd6d483027110022e6e4364a83f1')
+        gene = URIRef('https://www.ncbi.nlm.nih.gov/gene/55847'); namespaced = URIRef(pkt_bnode + 'N1')
+        edges = {(node, RDF.type, obo.CHEBI_2504), (node, RDF.type, OWL.NamedIndividual),
+                 (obo.CHEBI_2504, RDF.type, OWL.Class), (gene, RDF.type, OWL.NamedIndividual),
+                 (node, obo.RO_0002434, gene), (gene, RDFS.subClassOf, namespaced),
+                 (namespaced, OWL.onProperty, obo.RO_0002202)}
+        store = IntegerTripleStore(); store.adds_triples(edges)
+        triples = store.updates_pkt_namespace_identifiers('instance')
+
+        # test that the rows match the triples updated from the set of RDFLib triples
+        self.assertEqual(set(store.iterates_triples(triples)), updates_pkt_namespace_identifiers(edges, 'instance'))
+        self.assertIn((obo.CHEBI_2504, obo.RO_0002434, gene), set(store.iterates_triples(triples)))
+        self.assertIn((gene, RDFS.subClassOf, BNode('N1')), set(store.iterates_triples(triples)))
+        self.assertEqual(len(store), len(edges))  # the store's own triples are unchanged
+
+        return None
+
+    def test_splits_knowledge_graph(self):
+        """Tests the splits_knowledge_graph method."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+        logic, annotations = store.splits_knowledge_graph()
+        logic_graph, annotation_triples = splits_knowledge_graph(self.graph)
+
+        # test that the partition is identical to the one created from the RDFLib Graph
+        self.assertEqual(set(store.iterates_triples(logic)), set(logic_graph))
+        self.assertEqual(set(store.iterates_triples(annotations)), annotation_triples)
+        self.assertEqual(len(logic) + len(annotations), len(store))
+        self.assertEqual(store.derives_graph_statistics(logic), derives_graph_statistics(logic_graph))
+
+        return None
+
+    def test_gets_graph(self):
+        """Tests the gets_graph method."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+
+        self.assertEqual(set(store.gets_graph()), set(self.graph))
+        labels = store.gets_graph(predicates=[RDFS.label])
+        self.assertEqual(set(labels), set(self.graph.triples((None, RDFS.label, None))))
+
+        return None
+
+    def test_writes_ntriples(self):
+        """Tests the writes_ntriples method."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+        store.writes_ntriples(self.temp_dir + '/closed.nt')
+
+        self.assertEqual(len(Graph().parse(self.temp_dir + '/closed.nt', format='nt')), len(self.graph))
+
+        return None
+
+    def test_maps_ids_to_integers(self):
+        """Tests the maps_ids_to_integers method."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+        mapped_dict = store.maps_ids_to_integers(self.temp_dir, '/closed_Triples_Integers.txt',
+                                                 '/closed_Triples_Integer_Identifier_Map.json')
+
+        # check that a dictionary is returned and that files were created
+        self.assertIsInstance(mapped_dict, Dict)
+        self.assertEqual(sorted(mapped_dict.values()), list(range(1, len(mapped_dict) + 1)))
+        with open(self.temp_dir + '/closed_Triples_Integer_Identifier_Map.json') as f:
+            self.assertEqual(json.load(f), mapped_dict)
+        with open(self.temp_dir + '/closed_Triples_Integers.txt') as f: ints = f.readlines()
+        with open(self.temp_dir + '/closed_Triples_Identifiers.txt') as f: ids = f.readlines()
+        self.assertEqual(len(ints), len(self.graph) + 1); self.assertEqual(len(ids), len(self.graph) + 1)
+        # check that the integer and identifier triple lists agree
+        for x, y in zip(ints[1:], ids[1:]):
+            self.assertEqual([int(i) for i in x.strip().split('\t')], [mapped_dict[i] for i in y.strip().split('\t')])
+
+        return None
+
+    def test_maps_ids_to_integers_entity_map(self):
+        """Tests the maps_ids_to_integers method when a shared entity map is passed."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+        subset = store.encodes_triples(list(self.graph)[0:100] + [(obo.SO_0000001, RDFS.label, Literal('new'))])
+        self.assertEqual(len(store), len(self.graph))  # encoded triples are not added to the store
+        entity_map = store.gets_entity_map(np.concatenate([store.triples, subset]))
+        self.assertEqual(sorted(entity_map.values()), list(range(1, len(entity_map) + 1)))
+        mapped_dict = store.maps_ids_to_integers(self.temp_dir, '/subset_Triples_Integers.txt',
+                                                 '/subset_Triples_Integer_Identifier_Map.json', subset, entity_map)
+
+        # check that the subset uses the integers of the shared map
+        self.assertEqual(set(mapped_dict.keys()), set(n3(x) for y in store.iterates_triples(subset) for x in y))
+        self.assertTrue(all(entity_map[k] == v for k, v in mapped_dict.items()))
+        with open(self.temp_dir + '/subset_Triples_Integers.txt') as f: ints = f.readlines()
+        self.assertEqual(len(ints), 102)
+
+        return None
+
+    def test_maps_ids_to_integers_binary(self):
+        """Tests the maps_ids_to_integers method when binary outputs are written."""
+
+        store = IntegerTripleStore(); store.adds_triples(self.graph)
+        self.assertRaises(ValueError, store.maps_ids_to_integers, self.temp_dir, '/closed_Triples_Integers.txt',
+                          '/closed_Triples_Integer_Identifier_Map.json', output_format='parquet')
+        mapped_dict = store.maps_ids_to_integers(self.temp_dir, '/closed_Triples_Integers.txt',
+                                                 '/closed_Triples_Integer_Identifier_Map.json', output_format='both')
+
+        # check that the binary triples are the same as the text triples
+        ints = np.load(self.temp_dir + '/closed_Triples_Integers.npy')
+        self.assertEqual(ints.dtype, np.int32)
+        with open(self.temp_dir + '/closed_Triples_Integers.txt') as f:
+            self.assertEqual(ints.tolist(), [[int(i) for i in x.strip().split('\t')] for x in f.readlines()[1:]])
+        # check the memory-mapped identifier-integer map
+        id_map = IdentifierMap(self.temp_dir + '/closed_Triples_Integer_Identifier_Map')
+        self.assertEqual(len(id_map), len(mapped_dict)); self.assertEqual(dict(id_map.items()), mapped_dict)
+        self.assertTrue(all(id_map[k] == v and id_map.gets_identifier(v) == k for k, v in mapped_dict.items()))
+        self.assertNotIn('<http://purl.obolibrary.org/obo/fake>', id_map)
+        self.assertRaises(KeyError, id_map.gets_identifier, len(mapped_dict) + 1)
+        self.assertEqual(id_map._sorted_ints.tolist(), sorted(mapped_dict.values()))
+
+        # check that only binary outputs are written
+        store.maps_ids_to_integers(self.temp_dir, '/subset_Triples_Integers.txt', '/subset_Triples_Integer_'
+                                   'Identifier_Map.json', store.triples[0:10], output_format='binary')
+        self.assertEqual(np.load(self.temp_dir + '/subset_Triples_Integers.npy').shape, (10, 3))
+        self.assertFalse(os.path.exists(self.temp_dir + '/subset_Triples_Integers.txt'))
+        self.assertEqual(len(IdentifierMap(self.temp_dir + '/subset_Triples_Integer_Identifier_Map')),
+                         len(np.unique(store.triples[0:10])))
+
+        return None
+
+    def test_writes_identifier_map_empty(self):
+        """Tests the writes_identifier_map method with an empty map."""
+
+        id_map = IdentifierMap(writes_identifier_map({}, self.temp_dir + '/empty_map'))
+        self.assertEqual(len(id_map), 0); self.assertNotIn('<http://purl.obolibrary.org/obo/fake>', id_map)
+
+        return None
+
+    def test_writes_csr_graph(self):
+        """Tests the writes_csr_graph method and the CSRGraph class."""
+
+        triples = set(self.graph) | {(BNode('N1'), RDFS.label, Literal('region', lang='en'))}
+        filepath = writes_csr_graph(self.temp_dir, '/closed', list(triples) + list(triples)[0:10])
+        self.assertEqual(filepath, self.temp_dir + '/closed_CSRGraph')
+        csr = CSRGraph(filepath)
+
+        # test the arrays
+        self.assertEqual(csr.number_of_edges(), len(triples))  # duplicate triples are removed
+        self.assertEqual(csr.number_of_nodes(), len(set(x[0] for x in triples) | set(x[2] for x in triples)))
+        self.assertEqual((csr.indices.dtype, csr.predicates.dtype), (np.int32, np.int32))
+        rows, cols, preds = csr.gets_coo()
+        self.assertEqual(list(rows), sorted(rows))
+        # test neighbors and edges
+        neighbors, predicates, keys = csr.gets_edges(n3(obo.SO_0000001))
+        self.assertEqual(list(neighbors), list(csr.gets_neighbors(csr.nodes[n3(obo.SO_0000001)])))
+        expected = {(n3(o), n3(p)) for s, p, o in triples if s == obo.SO_0000001}
+        self.assertEqual({(csr.nodes.gets_identifier(o), csr.relations.gets_identifier(p))
+                          for o, p in zip(neighbors.tolist(), predicates.tolist())}, expected)
+        key = hashlib.md5('{}{}{}'.format(n3(obo.SO_0000001), csr.relations.gets_identifier(int(predicates[0])),
+                                          csr.nodes.gets_identifier(int(neighbors[0]))).encode()).hexdigest()
+        self.assertEqual(keys[0].decode(), key)
+
+        # test rebuilding the networkx graph
+        nx_mdg = csr.converts_to_networkx()
+        labels, sizes = csr.finds_connected_components()
+        self.assertEqual(len(labels), csr.number_of_nodes())
+        self.assertEqual(sorted(sizes.tolist()), sorted(len(x) for x in connected_components(triples)))
+        self.assertEqual(set(nx_mdg.edges(keys=True)), {(s, o, p) for s, p, o in triples})
+        self.assertEqual(nx_mdg.nodes[BNode('N1')], {'key': '_:N1'})
+        self.assertEqual(nx_mdg.get_edge_data(BNode('N1'), Literal('region', lang='en'), RDFS.label)['weight'], 0.0)
+
+        return None
+
+    def tearDown(self):
+
+        # remove temp directory
+        shutil.rmtree(self.temp_dir)
+
+        return None